@@ -0,0 +1,65 @@
+"""Compare store write throughput across JsonlWriter durability modes.
+
+    python benchmarks/bench_durability.py --signals 200000 --batch 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from metaspn_io.io_utils import json_line  # noqa: E402
+from metaspn_io.writer import DURABILITY_MODES, JsonlWriter  # noqa: E402
+
+
+def _signal(idx: int) -> dict[str, object]:
+    return {
+        "schema_version": "0.1",
+        "signal_id": f"s_{idx:024x}",
+        "timestamp": f"2026-02-{1 + idx % 7:02d}T10:00:00Z",
+        "source": "solana",
+        "payload_type": "TokenTradeSeen",
+        "payload": {"chain": "solana", "token_mint": "So111", "wallet": f"w{idx % 500}", "side": "buy", "amount": idx},
+    }
+
+
+def run(mode: str, lines: list[tuple[str, str]], batch: int, root: Path) -> tuple[float, int]:
+    started = time.perf_counter()
+    with JsonlWriter(durability=mode, commit_lines=batch, interval=0.05) as writer:
+        for day, line in lines:
+            writer.write(root / mode / f"{day}.jsonl", line)
+    return time.perf_counter() - started, writer.fsyncs
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--signals", type=int, default=100_000)
+    parser.add_argument("--batch", type=int, default=1_000, help="Lines per group commit")
+    args = parser.parse_args()
+
+    lines = []
+    for idx in range(args.signals):
+        signal = _signal(idx)
+        lines.append((str(signal["timestamp"])[:10], json_line(signal)))
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for mode in DURABILITY_MODES:
+            elapsed, fsyncs = run(mode, lines, args.batch, Path(tmpdir))
+            results[mode] = {
+                "seconds": round(elapsed, 4),
+                "signals_per_s": round(args.signals / elapsed),
+                "fsyncs": fsyncs,
+            }
+    print(json.dumps({"signals": args.signals, "batch": args.batch, "modes": results}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
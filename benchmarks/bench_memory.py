@@ -0,0 +1,74 @@
+"""Compare memory held by buffered Solana trade signals with and without interning.
+
+    python benchmarks/bench_memory.py --records 200000 --wallets 5000 --mints 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from metaspn_io.adapters.base import IngestContext  # noqa: E402
+from metaspn_io.adapters.solana_rpc_jsonl import SolanaRpcAdapter  # noqa: E402
+from metaspn_io.interning import Interner  # noqa: E402
+
+
+def _write_trades(path: Path, records: int, wallets: int, mints: int) -> None:
+    with path.open("w", encoding="utf-8") as f:
+        for idx in range(records):
+            record = {
+                "type": "trade",
+                "chain": "solana",
+                "token_mint": f"Mint{idx % mints:040d}",
+                "wallet": f"Wallet{(idx * 7919) % wallets:038d}",
+                "side": "buy" if idx % 3 else "sell",
+                "amount": idx % 1000 + 0.5,
+                "price_usd": 1.25,
+                "timestamp": f"2026-02-06T{idx // 3600 % 24:02d}:{idx // 60 % 60:02d}:{idx % 60:02d}Z",
+            }
+            f.write(json.dumps(record) + "\n")
+
+
+def run(source: Path, enabled: bool) -> dict[str, float]:
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    context = IngestContext(interner=Interner(enabled=enabled))
+    signals = list(SolanaRpcAdapter().iter_signals(source, context=context))
+    elapsed = time.perf_counter() - started
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del signals
+    return {
+        "seconds": round(elapsed, 3),
+        "retained_mib": round(retained / 2**20, 1),
+        "peak_mib": round(peak / 2**20, 1),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--wallets", type=int, default=5_000)
+    parser.add_argument("--mints", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        source = Path(tmpdir) / "trades.jsonl"
+        _write_trades(source, args.records, args.wallets, args.mints)
+        results = {"plain": run(source, enabled=False), "interned": run(source, enabled=True)}
+    saved = 1 - results["interned"]["retained_mib"] / results["plain"]["retained_mib"]
+    print(json.dumps({**vars(args), "modes": results, "retained_saved": round(saved, 3)}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,81 @@
+"""Compare serial and pipelined ingest of an unsorted trade file to --out.
+
+    python benchmarks/bench_pipeline.py --records 300000
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import random
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from metaspn_io.adapters import default_registry  # noqa: E402
+from metaspn_io.ingest import SinkOptions, run_ingest  # noqa: E402
+
+
+def _write_source(path: Path, records: int) -> None:
+    order = list(range(records))
+    random.Random(7).shuffle(order)
+    with path.open("w", encoding="utf-8") as f:
+        for idx in order:
+            record = {
+                "type": "trade",
+                "chain": "solana",
+                "token_mint": f"Mint{idx % 50:040d}",
+                "wallet": f"w{idx % 5000}",
+                "side": "buy",
+                "amount": idx,
+                "price_usd": 1.25,
+                "timestamp": f"2026-02-06T{idx // 3600 % 24:02d}:{idx // 60 % 60:02d}:{idx % 60:02d}Z",
+            }
+            f.write(json.dumps(record) + "\n")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=200_000)
+    parser.add_argument("--durability", default="run")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        source = root / "trades.jsonl"
+        _write_source(source, args.records)
+        outputs = {}
+        for label, pipelined in (("serial", False), ("pipelined", True)):
+            out = root / f"{label}.jsonl"
+            report = io.StringIO()
+            started = time.perf_counter()
+            with redirect_stdout(report):
+                run_ingest(
+                    registry=default_registry(),
+                    adapter_name="solana_rpc_v1",
+                    source=source,
+                    out=out,
+                    error_log_path=root / "errors.jsonl",
+                    sinks=SinkOptions(durability=args.durability),
+                    stats=True,
+                    pipeline=pipelined,
+                )
+            elapsed = time.perf_counter() - started
+            outputs[label] = out.read_bytes()
+            results[label] = {"seconds": round(elapsed, 2), "records_per_s": round(args.records / elapsed)}
+            if pipelined:
+                results[label]["queues"] = [line for line in report.getvalue().splitlines() if "wait_s" in line]
+        results["identical"] = outputs["serial"] == outputs["pipelined"]
+
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,69 @@
+"""Compare the bulk SQLite sink against row-by-row inserts on a trade workload.
+
+    python benchmarks/bench_sqlite.py --signals 500000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from metaspn_io.sqlite_sink import _SCHEMA, _UPSERT, _row, write_sqlite  # noqa: E402
+
+
+def _signal(idx: int) -> dict[str, object]:
+    mint = f"Mint{idx % 50:040d}"
+    return {
+        "schema_version": "0.1",
+        "signal_id": f"s_{idx:024x}",
+        "timestamp": f"2026-02-{1 + idx % 7:02d}T{idx // 3600 % 24:02d}:{idx // 60 % 60:02d}:{idx % 60:02d}Z",
+        "source": "solana",
+        "payload_type": "TokenTradeSeen",
+        "payload": {"chain": "solana", "token_mint": mint, "wallet": f"w{idx % 5000}", "side": "buy", "amount": idx},
+        "entity_refs": [{"kind": "platform_identifier", "platform": "solana", "identifier": mint}],
+        "trace": {"adapter_name": "solana_rpc_v1", "adapter_version": "0.1", "input_line_number": idx},
+    }
+
+
+def row_by_row(path: Path, signals: list[dict[str, object]]) -> None:
+    conn = sqlite3.connect(path)
+    conn.execute(_SCHEMA)
+    for signal in signals:
+        conn.execute(_UPSERT, _row(signal))
+        conn.commit()
+    conn.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--signals", type=int, default=200_000)
+    parser.add_argument("--row-by-row", type=int, default=5_000, help="Signals for the row-by-row baseline")
+    args = parser.parse_args()
+
+    signals = [_signal(idx) for idx in range(args.signals)]
+    results = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        started = time.perf_counter()
+        row_by_row(root / "rows.db", signals[: args.row_by_row])
+        elapsed = time.perf_counter() - started
+        results["row_by_row"] = {"signals": args.row_by_row, "signals_per_s": round(args.row_by_row / elapsed)}
+
+        for label in ("bulk_load", "bulk_upsert"):
+            started = time.perf_counter()
+            write_sqlite(root / "bulk.db", signals)
+            elapsed = time.perf_counter() - started
+            results[label] = {"signals": args.signals, "signals_per_s": round(args.signals / elapsed)}
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
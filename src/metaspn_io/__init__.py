@@ -1,5 +1,16 @@
 """metaspn-io package."""
 
+from typing import Any
+
 from .ids import stable_signal_id
 
-__all__ = ["stable_signal_id"]
+__all__ = ["SignalBatch", "iter_signal_batches", "stable_signal_id"]
+
+
+def __getattr__(name: str) -> Any:
+    # The batch API pulls in the adapter base; keep it off `import metaspn_io.cli`.
+    if name in ("SignalBatch", "iter_signal_batches"):
+        from . import batches
+
+        return getattr(batches, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,23 +1,43 @@
-from metaspn_io.adapters.outcomes_jsonl import OutcomesJsonlAdapter
-from metaspn_io.adapters.pumpfun_jsonl import PumpfunAdapter
-from metaspn_io.adapters.registry import AdapterRegistry
-from metaspn_io.adapters.season1_onchain_jsonl import Season1OnchainJsonlAdapter
-from metaspn_io.adapters.social_jsonl import SocialJsonlAdapter
-from metaspn_io.adapters.solana_rpc_jsonl import SolanaRpcAdapter
-
-
-def default_registry() -> AdapterRegistry:
-    registry = AdapterRegistry()
-    registry.register(SocialJsonlAdapter())
-    registry.register(OutcomesJsonlAdapter())
-    registry.register(SolanaRpcAdapter())
-    registry.register(PumpfunAdapter())
-    registry.register(Season1OnchainJsonlAdapter())
+from __future__ import annotations
+
+from typing import Any
+
+from metaspn_io.adapters.registry import ENTRY_POINT_GROUP, AdapterRegistry
+
+# Adapter modules are only imported when an adapter is first requested, so
+# `metaspn --help` and single-adapter runs do not pay for every adapter.
+BUILTIN_ADAPTERS: dict[str, str] = {
+    "social_jsonl_v1": "metaspn_io.adapters.social_jsonl:SocialJsonlAdapter",
+    "outcomes_jsonl_v1": "metaspn_io.adapters.outcomes_jsonl:OutcomesJsonlAdapter",
+    "solana_rpc_v1": "metaspn_io.adapters.solana_rpc_jsonl:SolanaRpcAdapter",
+    "pumpfun_v1": "metaspn_io.adapters.pumpfun_jsonl:PumpfunAdapter",
+    "season1_onchain_jsonl_v1": "metaspn_io.adapters.season1_onchain_jsonl:Season1OnchainJsonlAdapter",
+}
+
+_ADAPTER_CLASSES: dict[str, str] = {
+    target.partition(":")[2]: target.partition(":")[0] for target in BUILTIN_ADAPTERS.values()
+}
+
+
+def default_registry(discover: bool = True) -> AdapterRegistry:
+    registry = AdapterRegistry(entry_point_group=ENTRY_POINT_GROUP if discover else None)
+    for name, target in BUILTIN_ADAPTERS.items():
+        registry.register_lazy(name, target)
     return registry
 
 
+def __getattr__(name: str) -> Any:
+    module_name = _ADAPTER_CLASSES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    return getattr(importlib.import_module(module_name), name)
+
+
 __all__ = [
     "AdapterRegistry",
+    "BUILTIN_ADAPTERS",
     "SocialJsonlAdapter",
     "OutcomesJsonlAdapter",
     "SolanaRpcAdapter",
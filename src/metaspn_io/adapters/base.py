@@ -1,11 +1,36 @@
 from __future__ import annotations
 
-from collections.abc import Iterator
-from dataclasses import dataclass
+import heapq
+import inspect
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime
 from pathlib import Path
-from typing import Protocol
+from typing import IO, TYPE_CHECKING, Any, ClassVar, Protocol
 
-from metaspn_io.models import SignalEnvelope
+from metaspn_io.interning import Interner
+from metaspn_io.io_utils import (
+    ParseIssue,
+    RawPrefilter,
+    RawRecord,
+    iter_jsonl_lines,
+    iter_jsonl_paths,
+    iter_jsonl_records,
+    is_time_sorted,
+)
+from metaspn_io.issues import IssueSink
+from metaspn_io.timeutils import in_range
+
+if TYPE_CHECKING:
+    from metaspn_io.models import SignalEnvelope
+    from metaspn_io.predicates import Predicate
+
+
+# Rows held back by `iter_stream_signals` to restore (ts, key) order on streams.
+DEFAULT_REORDER_WINDOW = 10_000
+# Input files a heap merge may hold open at once; past that the run is sorted instead.
+MAX_MERGE_FILES = 64
 
 
 @dataclass(frozen=True)
@@ -13,11 +38,363 @@ class AdapterOptions:
     since: object | None = None
     until: object | None = None
     lenient: bool = False
+    # Drop lines whose raw timestamp is certainly outside since/until before decoding.
+    prefilter: bool = False
+    # Allowlist of lower-cased input `type` values; other records are skipped.
+    types: frozenset[str] | None = None
+    # Compiled `--where` predicate, evaluated on raw records before `_parse_record`.
+    where: Predicate | None = None
+
+
+@dataclass
+class IngestContext:
+    """Per-call state for one adapter run.
+
+    Adapters keep no state of their own, so a single adapter instance can serve
+    concurrent calls as long as each call gets its own context.
+    """
+
+    issues: IssueSink = field(default_factory=IssueSink)
+    counters: dict[str, int] = field(default_factory=dict)
+    interner: Interner = field(default_factory=Interner)
+    # "merge" when time-sorted files were streamed through a heap merge, "sort"
+    # when rows were (or, once a merge needed too many open files, the rest
+    # were) buffered and sorted; empty until an adapter has run.
+    sort_path: str = ""
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+
+def raw_prefilter(options: AdapterOptions, context: IngestContext) -> RawPrefilter | None:
+    window = options.prefilter and (options.since is not None or options.until is not None)
+    if not window and options.types is None:
+        return None
+    return RawPrefilter(
+        since=options.since if window else None,  # type: ignore[arg-type]
+        until=options.until if window else None,  # type: ignore[arg-type]
+        types=options.types,
+        counters=context.counters,
+    )
 
 
 class Adapter(Protocol):
     name: str
     version: str
 
-    def iter_signals(self, source_path: Path, options: AdapterOptions | None = None) -> Iterator[SignalEnvelope]:
+    def iter_signals(
+        self,
+        source_path: Path,
+        options: AdapterOptions | None = None,
+        context: IngestContext | None = None,
+    ) -> Iterator[SignalEnvelope]:
+        ...
+
+
+@dataclass
+class JsonlAdapter(ABC):
+    """Shared read/parse/sort loop for adapters over JSONL records.
+
+    Subclasses implement ``_parse_record`` returning ``(signal, ts, key)`` and should
+    route repetitive strings and ``EntityRef`` values through ``intern``; signals are
+    emitted sorted by ``(ts, key)``. Issues and counters go to the per-call context.
+    Subclasses written before ``intern`` existed, taking only four arguments, are
+    still called without it.
+    """
+
+    name: str = ""
+    version: str = ""
+
+    # Top-level record field ``_parse_record`` takes ``ts`` from, which lets
+    # ``iter_signals`` check files for time order; ``None`` always sorts.
+    time_field: ClassVar[str | None] = None
+    _takes_intern = True
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        params = inspect.signature(cls._parse_record).parameters.values()
+        cls._takes_intern = any(
+            p.name == "intern" or p.kind in (p.VAR_POSITIONAL, p.VAR_KEYWORD) for p in params
+        ) or sum(p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD) for p in params) > 5
+
+    def iter_signals(
+        self,
+        source_path: Path,
+        options: AdapterOptions | None = None,
+        context: IngestContext | None = None,
+    ) -> Iterator[SignalEnvelope]:
+        """Yield signals in ``(ts, key)`` order.
+
+        Each file is first checked for time order with a raw scan of
+        ``time_field``. When all are sorted they are streamed through a heap
+        merge (see ``_iter_merged``); otherwise every row is buffered and sorted.
+        """
+        opts = options or AdapterOptions()
+        ctx = context if context is not None else IngestContext()
+        paths = list(iter_jsonl_paths(source_path))
+        prefilter = raw_prefilter(opts, ctx)
+        if self.time_field is not None and all(is_time_sorted(path, self.time_field) for path in paths):
+            return self._iter_merged(paths, prefilter, opts, ctx)
+        return self.iter_record_signals(iter_jsonl_records(source_path, prefilter), opts, ctx)
+
+    def iter_record_signals(
+        self,
+        records: Iterable[RawRecord | ParseIssue],
+        options: AdapterOptions | None = None,
+        context: IngestContext | None = None,
+    ) -> Iterator[SignalEnvelope]:
+        opts = options or AdapterOptions()
+        ctx = context if context is not None else IngestContext()
+        ctx.sort_path = "sort"
+        rows = list(self._iter_rows(records, opts, ctx))
+        rows.sort(key=lambda item: (item[0], item[1]))
+        for _, _, signal in rows:
+            ctx.count("emitted")
+            yield signal
+
+    def iter_stream_signals(
+        self,
+        lines: Iterable[str],
+        input_file: str = "<stdin>",
+        options: AdapterOptions | None = None,
+        context: IngestContext | None = None,
+        window: int = DEFAULT_REORDER_WINDOW,
+    ) -> Iterator[SignalEnvelope]:
+        """Yield signals from a stream of JSONL lines as they become final.
+
+        Up to ``window`` rows are held in a heap and released smallest first, so
+        input that is at most ``window`` rows out of ``(ts, key)`` order comes out
+        sorted. A row arriving later than that is still emitted, out of order, and
+        counted as ``reorder_late``.
+        """
+        opts = options or AdapterOptions()
+        ctx = context if context is not None else IngestContext()
+        ctx.sort_path = "window"
+        records = iter_jsonl_lines(lines, input_file, prefilter=raw_prefilter(opts, ctx))
+        heap: list[tuple[datetime, str, int, SignalEnvelope]] = []
+        last: tuple[datetime, str] | None = None
+
+        def release() -> SignalEnvelope:
+            nonlocal last
+            ts, key, _, signal = heapq.heappop(heap)
+            if last is not None and (ts, key) < last:
+                ctx.count("reorder_late")
+            else:
+                last = (ts, key)
+            ctx.count("emitted")
+            return signal
+
+        for seq, (ts, key, signal) in enumerate(self._iter_rows(records, opts, ctx)):
+            heapq.heappush(heap, (ts, key, seq, signal))
+            if len(heap) > window:
+                yield release()
+        while heap:
+            yield release()
+
+    def _iter_merged(
+        self,
+        paths: list[Path],
+        prefilter: RawPrefilter | None,
+        opts: AdapterOptions,
+        ctx: IngestContext,
+    ) -> Iterator[SignalEnvelope]:
+        """Heap merge of time-sorted input files.
+
+        Each file feeds the heap one run of equal timestamps at a time, so keys
+        within a run come out sorted, and a file is only opened once the merge
+        reaches its first row. Every row released is no later than any row still
+        to come, so a merge that would need more than ``MAX_MERGE_FILES`` open
+        files can buffer and sort the rest without breaking order. A file that
+        goes back in time after all (it changed since ``is_time_sorted`` read it)
+        does the same; rows it places before ones already emitted are counted as
+        ``reorder_late``.
+        """
+        ctx.sort_path = "merge"
+        sources = [_MergeSource(idx, path, self, prefilter, opts, ctx) for idx, path in enumerate(paths)]
+        heap: list[_MergeRow] = []
+        last: tuple[datetime, str] | None = None
+        try:
+            # Keyed on timestamp alone: the rest of a file's first run may sort before its first row.
+            waiting = [(source.head[0], idx) for idx, source in enumerate(sources) if source.peek()]
+            heapq.heapify(waiting)
+            opened: set[int] = set()
+
+            def fill(idx: int) -> None:
+                source = sources[idx]
+                source.push_run(heap)
+                if source.head is None:
+                    source.close()
+                    opened.discard(idx)
+
+            try:
+                while True:
+                    while waiting and (not heap or waiting[0][0] <= heap[0][0]):
+                        if len(opened) >= MAX_MERGE_FILES:
+                            raise _Unmergeable
+                        idx = heapq.heappop(waiting)[1]
+                        sources[idx].open()
+                        opened.add(idx)
+                        fill(idx)
+                    if not heap:
+                        break
+                    row = heapq.heappop(heap)
+                    last = (row[0], row[1])
+                    ctx.count("emitted")
+                    yield row[4]
+                    idx = row[2]
+                    sources[idx].pending -= 1
+                    if not sources[idx].pending:
+                        fill(idx)
+            except _Unmergeable:
+                ctx.sort_path = "sort"
+                for source in sources:
+                    heap.extend(source.drain())
+                heap.sort(key=lambda item: item[:4])
+                for ts, key, _, _, signal in heap:
+                    if last is not None and (ts, key) < last:
+                        ctx.count("reorder_late")
+                    ctx.count("emitted")
+                    yield signal
+        finally:
+            for source in sources:
+                source.close()
+
+    def _iter_rows(
+        self,
+        records: Iterable[RawRecord | ParseIssue],
+        opts: AdapterOptions,
+        ctx: IngestContext,
+    ) -> Iterator[tuple[datetime, str, SignalEnvelope]]:
+        for row in records:
+            if isinstance(row, ParseIssue):
+                ctx.issues.append(row)
+                continue
+            ctx.count("records")
+            if opts.where is not None and not opts.where(row.data):
+                ctx.count("filtered_where")
+                continue
+            try:
+                args = (row.data, row.input_file, row.input_line_number, opts)
+                if self._takes_intern:
+                    signal, ts, key = self._parse_record(*args, ctx.interner)
+                else:
+                    signal, ts, key = self._parse_record(*args)
+            except ValueError as exc:
+                ctx.issues.append(ParseIssue(str(exc), row.input_file, row.input_line_number, repr(row.data)))
+                continue
+            if not in_range(ts, opts.since, opts.until):
+                ctx.count("out_of_range")
+                continue
+            yield ts, key, signal
+
+    @abstractmethod
+    def _parse_record(
+        self,
+        data: dict[str, Any],
+        input_file: str,
+        line_number: int,
+        options: AdapterOptions,
+        intern: Interner | None = None,
+    ) -> tuple[SignalEnvelope, datetime, str]:
         ...
+
+
+_Row = tuple[datetime, str, "SignalEnvelope"]
+# (ts, key, file index, row number in file, signal): ties keep input order, like the sort path.
+_MergeRow = tuple[datetime, str, int, int, "SignalEnvelope"]
+
+
+class _Unmergeable(Exception):
+    """Raised when a heap merge cannot continue in order."""
+
+
+class _MergeSource:
+    """One input file of a heap merge, holding a handle only while it is being read.
+
+    ``peek`` reads up to the first row and closes the file again, remembering the
+    position, so ``open`` later resumes exactly there: no line is read twice.
+    """
+
+    def __init__(
+        self,
+        idx: int,
+        path: Path,
+        adapter: JsonlAdapter,
+        prefilter: RawPrefilter | None,
+        opts: AdapterOptions,
+        ctx: IngestContext,
+    ) -> None:
+        self.idx = idx
+        self.path = path
+        self.adapter = adapter
+        self.prefilter = prefilter
+        self.opts = opts
+        self.ctx = ctx
+        # Next row not yet in the merge heap, and how many rows of the current run are.
+        self.head: _Row | None = None
+        self.pending = 0
+        self._seq = 0
+        self._handle: IO[str] | None = None
+        self._rows: Iterator[_Row] = iter(())
+        self._position = 0
+        self._line = 0
+
+    def _lines(self, handle: IO[str]) -> Iterator[str]:
+        # readline rather than iteration keeps ``tell`` available on a text file.
+        for line in iter(handle.readline, ""):
+            self._line += 1
+            yield line
+
+    def open(self) -> None:
+        self._handle = self.path.open("r", encoding="utf-8")
+        self._handle.seek(self._position)
+        records = iter_jsonl_lines(
+            self._lines(self._handle), str(self.path), prefilter=self.prefilter, first_line=self._line + 1
+        )
+        self._rows = self.adapter._iter_rows(records, self.opts, self.ctx)
+
+    def peek(self) -> bool:
+        """Read up to the first row and close; ``False`` when the file has none."""
+        self.open()
+        assert self._handle is not None
+        self.head = next(self._rows, None)
+        self._position = self._handle.tell()
+        self.close()
+        return self.head is not None
+
+    def _row(self, row: _Row) -> _MergeRow:
+        self._seq += 1
+        return (row[0], row[1], self.idx, self._seq, row[2])
+
+    def push_run(self, heap: list[_MergeRow]) -> None:
+        """Move the run of rows sharing the head's timestamp onto ``heap``.
+
+        Raises ``_Unmergeable`` on a row earlier than the run, leaving it as the head.
+        """
+        if self.head is None:
+            return
+        run_ts = self.head[0]
+        while self.head is not None and self.head[0] == run_ts:
+            heapq.heappush(heap, self._row(self.head))
+            self.pending += 1
+            self.head = next(self._rows, None)
+        if self.head is not None and self.head[0] < run_ts:
+            raise _Unmergeable
+
+    def drain(self) -> list[_MergeRow]:
+        """Every row not yet in the merge heap, reading the rest of the file."""
+        if self.head is None:
+            self.close()
+            return []
+        if self._handle is None:
+            self.open()
+        rows = [self._row(self.head), *map(self._row, self._rows)]
+        self.head = None
+        self.close()
+        return rows
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+        self._rows = iter(())
@@ -4,8 +4,9 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
-from metaspn_io.adapters.base import AdapterOptions
+from metaspn_io.adapters.base import AdapterOptions, IngestContext
 from metaspn_io.adapters.solana_rpc_jsonl import SolanaRpcAdapter
+from metaspn_io.interning import Interner
 
 
 @dataclass
@@ -13,8 +14,13 @@ class PumpfunAdapter(SolanaRpcAdapter):
     name: str = "pumpfun_v1"
     version: str = "0.1-exp"
 
-    def iter_signals(self, source_path: Path, options: AdapterOptions | None = None):
-        for signal in super().iter_signals(source_path, options=options):
+    def iter_signals(
+        self,
+        source_path: Path,
+        options: AdapterOptions | None = None,
+        context: IngestContext | None = None,
+    ):
+        for signal in super().iter_signals(source_path, options=options, context=context):
             yield signal
 
     def _parse_record(
@@ -23,7 +29,8 @@ class PumpfunAdapter(SolanaRpcAdapter):
         input_file: str,
         line_number: int,
         options: AdapterOptions,
+        intern: Interner | None = None,
     ):
         payload = dict(data)
         payload.setdefault("chain", "pumpfun")
-        return super()._parse_record(payload, input_file, line_number, options)
+        return super()._parse_record(payload, input_file, line_number, options, intern)
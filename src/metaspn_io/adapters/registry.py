@@ -1,23 +1,81 @@
 from __future__ import annotations
 
+import importlib
+import threading
 from dataclasses import dataclass, field
 
 from metaspn_io.adapters.base import Adapter
 
+ENTRY_POINT_GROUP = "metaspn_io.adapters"
+
+
+def load_adapter(target: str) -> Adapter:
+    """Import an adapter from a ``module:attr`` path, instantiating it if it is a class."""
+    module_name, _, attr = target.partition(":")
+    if not attr:
+        raise ValueError(f"adapter target must look like 'module:attr', got '{target}'")
+    obj = importlib.import_module(module_name)
+    for part in attr.split("."):
+        obj = getattr(obj, part)
+    if isinstance(obj, type):
+        obj = obj()
+    return obj
+
 
 @dataclass
 class AdapterRegistry:
     _adapters: dict[str, Adapter] = field(default_factory=dict)
+    _lazy: dict[str, str] = field(default_factory=dict)
+    entry_point_group: str | None = None
+    _discovered: bool = False
+    _lock: threading.RLock = field(default_factory=threading.RLock, repr=False, compare=False)
 
     def register(self, adapter: Adapter) -> None:
-        self._adapters[adapter.name] = adapter
+        with self._lock:
+            self._adapters[adapter.name] = adapter
+            self._lazy.pop(adapter.name, None)
+
+    def register_lazy(self, name: str, target: str) -> None:
+        """Declare an adapter by import path; it is imported on first ``get()``."""
+        with self._lock:
+            if name not in self._adapters:
+                self._lazy[name] = target
+
+    def discover(self) -> None:
+        """Declare third-party adapters published under ``entry_point_group``.
+
+        Entry points never shadow adapters that are already declared.
+        """
+        with self._lock:
+            if self._discovered or self.entry_point_group is None:
+                return
+            self._discovered = True
+            from importlib.metadata import entry_points
+
+            for ep in entry_points(group=self.entry_point_group):
+                if ep.name not in self._adapters and ep.name not in self._lazy:
+                    self._lazy[ep.name] = ep.value
 
     def get(self, name: str) -> Adapter:
-        try:
-            return self._adapters[name]
-        except KeyError as exc:
-            known = ", ".join(sorted(self._adapters))
-            raise KeyError(f"Unknown adapter '{name}'. Known adapters: {known}") from exc
+        adapter = self._adapters.get(name)
+        if adapter is not None:
+            return adapter
+        with self._lock:
+            adapter = self._adapters.get(name)
+            if adapter is not None:
+                return adapter
+            if name not in self._lazy:
+                self.discover()
+            target = self._lazy.get(name)
+            if target is None:
+                known = ", ".join(self.names())
+                raise KeyError(f"Unknown adapter '{name}'. Known adapters: {known}")
+            adapter = load_adapter(target)
+            self._adapters[name] = adapter
+            self._lazy.pop(name, None)
+            return adapter
 
     def names(self) -> list[str]:
-        return sorted(self._adapters)
+        self.discover()
+        with self._lock:
+            return sorted({*self._adapters, *self._lazy})
@@ -2,15 +2,13 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
-from pathlib import Path
 from typing import Any
 
-from metaspn_io.adapters.base import AdapterOptions
+from metaspn_io.adapters.base import AdapterOptions, JsonlAdapter
 from metaspn_io.ids import stable_signal_id
-from metaspn_io.io_utils import ParseIssue, iter_jsonl_records
+from metaspn_io.interning import NO_INTERNING, Interner
 from metaspn_io.models import (
     SCHEMA_VERSION,
-    EntityRef,
     SeasonEnded,
     SeasonGameCreated,
     SeasonInitialized,
@@ -22,38 +20,14 @@ from metaspn_io.models import (
     payload_type_name,
     utc_iso,
 )
-from metaspn_io.timeutils import TimestampError, in_range, parse_timestamp
+from metaspn_io.timeutils import TimestampError, parse_timestamp
 
 
 @dataclass
-class Season1OnchainJsonlAdapter:
+class Season1OnchainJsonlAdapter(JsonlAdapter):
     name: str = "season1_onchain_jsonl_v1"
     version: str = "0.1"
-
-    def __init__(self) -> None:
-        self.issues: list[ParseIssue] = []
-
-    def iter_signals(self, source_path: Path, options: AdapterOptions | None = None):
-        opts = options or AdapterOptions()
-        rows: list[tuple[datetime, str, SignalEnvelope]] = []
-        self.issues = []
-
-        for row in iter_jsonl_records(source_path):
-            if isinstance(row, ParseIssue):
-                self.issues.append(row)
-                continue
-            try:
-                signal, ts, key = self._parse_record(row.data, row.input_file, row.input_line_number, opts)
-            except ValueError as exc:
-                self.issues.append(ParseIssue(str(exc), row.input_file, row.input_line_number, repr(row.data)))
-                continue
-            if not in_range(ts, opts.since, opts.until):
-                continue
-            rows.append((ts, key, signal))
-
-        rows.sort(key=lambda item: (item[0], item[1]))
-        for _, _, signal in rows:
-            yield signal
+    time_field = "timestamp"
 
     def _parse_record(
         self,
@@ -61,12 +35,15 @@ class Season1OnchainJsonlAdapter:
         input_file: str,
         line_number: int,
         options: AdapterOptions,
+        intern: Interner | None = None,
     ) -> tuple[SignalEnvelope, datetime, str]:
+        if intern is None:
+            intern = NO_INTERNING
         event_type = str(data.get("type", "")).strip().lower()
-        chain = str(data.get("chain", "solana")).strip().lower() or "solana"
-        season_id = str(data.get("season_id", "")).strip()
-        game_id = str(data.get("game_id", "")).strip()
-        wallet = str(data.get("wallet", "")).strip()
+        chain = intern(str(data.get("chain", "solana")).strip().lower() or "solana")
+        season_id = intern(str(data.get("season_id", "")).strip())
+        game_id = intern(str(data.get("game_id", "")).strip())
+        wallet = intern(str(data.get("wallet", "")).strip())
 
         missing: list[str] = []
         for field, value in (("type", event_type), ("season_id", season_id)):
@@ -84,22 +61,23 @@ class Season1OnchainJsonlAdapter:
             ts, original_tz = parse_timestamp("1970-01-01T00:00:00Z")
 
         payload, key, identifier = self._map_payload(chain, event_type, season_id, game_id, wallet, data, options)
+        stamp = utc_iso(ts)
         signal = SignalEnvelope(
             schema_version=SCHEMA_VERSION,
             signal_id=stable_signal_id(chain, ts, key),
-            timestamp=utc_iso(ts),
+            timestamp=stamp,
             source=chain,
             payload_type=payload_type_name(payload),
             payload=payload,
-            entity_refs=[EntityRef(kind="platform_identifier", platform=chain, identifier=identifier)],
+            entity_refs=[intern.entity_ref("platform_identifier", chain, identifier)],
             trace=TraceContext(
-                ingested_at=utc_iso(ts),
+                ingested_at=stamp,
                 input_file=input_file,
                 input_line_number=line_number,
                 adapter_name=self.name,
                 adapter_version=self.version,
                 raw_id=None if data.get("raw_id") is None else str(data.get("raw_id")),
-                original_timezone=original_tz,
+                original_timezone=intern.optional(original_tz),
             ),
         )
         return signal, ts, key
@@ -2,15 +2,13 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from pathlib import Path
 from typing import Any
 
-from metaspn_io.adapters.base import AdapterOptions
+from metaspn_io.adapters.base import AdapterOptions, JsonlAdapter
 from metaspn_io.ids import stable_signal_id
-from metaspn_io.io_utils import ParseIssue, iter_jsonl_records
+from metaspn_io.interning import NO_INTERNING, Interner
 from metaspn_io.models import (
     SCHEMA_VERSION,
-    EntityRef,
     ProfileSnapshotSeen,
     SignalEnvelope,
     SocialPostSeen,
@@ -18,40 +16,14 @@ from metaspn_io.models import (
     payload_type_name,
     utc_iso,
 )
-from metaspn_io.timeutils import TimestampError, in_range, parse_timestamp
+from metaspn_io.timeutils import TimestampError, parse_timestamp
 
 
 @dataclass
-class SocialJsonlAdapter:
+class SocialJsonlAdapter(JsonlAdapter):
     name: str = "social_jsonl_v1"
     version: str = "0.1"
-
-    def __init__(self) -> None:
-        self.issues: list[ParseIssue] = []
-
-    def iter_signals(self, source_path: Path, options: AdapterOptions | None = None):
-        opts = options or AdapterOptions()
-        rows: list[tuple[datetime, str, SignalEnvelope]] = []
-        self.issues = []
-
-        for row in iter_jsonl_records(source_path):
-            if isinstance(row, ParseIssue):
-                self.issues.append(row)
-                continue
-            try:
-                signal, ts, key = self._parse_record(row.data, row.input_file, row.input_line_number, opts)
-            except ValueError as exc:
-                self.issues.append(
-                    ParseIssue(str(exc), row.input_file, row.input_line_number, repr(row.data))
-                )
-                continue
-            if not in_range(ts, opts.since, opts.until):
-                continue
-            rows.append((ts, key, signal))
-
-        rows.sort(key=lambda item: (item[0], item[1]))
-        for _, _, signal in rows:
-            yield signal
+    time_field = "timestamp"
 
     def _parse_record(
         self,
@@ -59,10 +31,13 @@ class SocialJsonlAdapter:
         input_file: str,
         line_number: int,
         options: AdapterOptions,
+        intern: Interner | None = None,
     ) -> tuple[SignalEnvelope, datetime, str]:
-        platform = str(data.get("platform", "")).strip().lower()
+        if intern is None:
+            intern = NO_INTERNING
+        platform = intern(str(data.get("platform", "")).strip().lower())
         typ = str(data.get("type", "")).strip().lower()
-        author = str(data.get("author_handle", "")).strip()
+        author = intern(str(data.get("author_handle", "")).strip())
         url = str(data.get("url", "")).strip()
         text = data.get("text")
         raw_ts = data.get("timestamp")
@@ -119,30 +94,25 @@ class SocialJsonlAdapter:
             stable_key = f"{platform}|fallback|{url}"
 
         signal_id = stable_signal_id(platform, ts, stable_key)
+        stamp = utc_iso(ts)
         trace = TraceContext(
-            ingested_at=utc_iso(ts),
+            ingested_at=stamp,
             input_file=input_file,
             input_line_number=line_number,
             adapter_name=self.name,
             adapter_version=self.version,
             raw_id=None if data.get("raw_id") is None else str(data.get("raw_id")),
-            original_timezone=original_tz,
+            original_timezone=intern.optional(original_tz),
         )
 
         signal = SignalEnvelope(
             schema_version=SCHEMA_VERSION,
             signal_id=signal_id,
-            timestamp=utc_iso(ts),
+            timestamp=stamp,
             source=platform,
             payload_type=payload_type_name(payload),
             payload=payload,
-            entity_refs=[
-                EntityRef(
-                    kind="platform_identifier",
-                    platform=platform,
-                    identifier=author or "unknown",
-                )
-            ],
+            entity_refs=[intern.entity_ref("platform_identifier", platform, author or "unknown")],
             trace=trace,
         )
         return signal, ts, stable_key
@@ -2,12 +2,11 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
-from pathlib import Path
 from typing import Any
 
-from metaspn_io.adapters.base import AdapterOptions
+from metaspn_io.adapters.base import AdapterOptions, JsonlAdapter
 from metaspn_io.ids import stable_signal_id
-from metaspn_io.io_utils import ParseIssue, iter_jsonl_records
+from metaspn_io.interning import NO_INTERNING, Interner
 from metaspn_io.models import (
     HolderChangeSeen,
     LiquidityEventSeen,
@@ -18,44 +17,19 @@ from metaspn_io.models import (
     SupplyChangeSeen,
     TokenMetadataUpdated,
     TokenTradeSeen,
-    EntityRef,
     SignalEnvelope,
     TraceContext,
     payload_type_name,
     utc_iso,
 )
-from metaspn_io.timeutils import TimestampError, in_range, parse_timestamp
+from metaspn_io.timeutils import TimestampError, parse_timestamp
 
 
 @dataclass
-class SolanaRpcAdapter:
+class SolanaRpcAdapter(JsonlAdapter):
     name: str = "solana_rpc_v1"
     version: str = "0.1"
-
-    def __init__(self) -> None:
-        self.issues: list[ParseIssue] = []
-
-    def iter_signals(self, source_path: Path, options: AdapterOptions | None = None):
-        opts = options or AdapterOptions()
-        rows: list[tuple[datetime, str, SignalEnvelope]] = []
-        self.issues = []
-
-        for row in iter_jsonl_records(source_path):
-            if isinstance(row, ParseIssue):
-                self.issues.append(row)
-                continue
-            try:
-                signal, ts, key = self._parse_record(row.data, row.input_file, row.input_line_number, opts)
-            except ValueError as exc:
-                self.issues.append(ParseIssue(str(exc), row.input_file, row.input_line_number, repr(row.data)))
-                continue
-            if not in_range(ts, opts.since, opts.until):
-                continue
-            rows.append((ts, key, signal))
-
-        rows.sort(key=lambda item: (item[0], item[1]))
-        for _, _, signal in rows:
-            yield signal
+    time_field = "timestamp"
 
     def _parse_record(
         self,
@@ -63,11 +37,14 @@ class SolanaRpcAdapter:
         input_file: str,
         line_number: int,
         options: AdapterOptions,
+        intern: Interner | None = None,
     ) -> tuple[SignalEnvelope, datetime, str]:
+        if intern is None:
+            intern = NO_INTERNING
         event_type = str(data.get("type", "")).strip().lower()
-        chain = str(data.get("chain", "solana")).strip().lower() or "solana"
-        token_mint = str(data.get("token_mint", "")).strip()
-        wallet = str(data.get("wallet", "")).strip()
+        chain = intern(str(data.get("chain", "solana")).strip().lower() or "solana")
+        token_mint = intern(str(data.get("token_mint", "")).strip())
+        wallet = intern(str(data.get("wallet", "")).strip())
 
         if not token_mint and not options.lenient:
             raise ValueError("missing required field: token_mint")
@@ -80,24 +57,25 @@ class SolanaRpcAdapter:
                 raise ValueError(str(exc)) from exc
             ts, original_tz = parse_timestamp("1970-01-01T00:00:00Z")
 
-        payload, key = self._map_payload(chain, event_type, token_mint, wallet, data, options)
+        payload, key = self._map_payload(chain, event_type, token_mint, wallet, data, options, intern)
+        stamp = utc_iso(ts)
 
         signal = SignalEnvelope(
             schema_version=SCHEMA_VERSION,
             signal_id=stable_signal_id(chain, ts, key),
-            timestamp=utc_iso(ts),
+            timestamp=stamp,
             source=chain,
             payload_type=payload_type_name(payload),
             payload=payload,
-            entity_refs=[EntityRef(kind="platform_identifier", platform=chain, identifier=token_mint or "unknown")],
+            entity_refs=[intern.entity_ref("platform_identifier", chain, token_mint or "unknown")],
             trace=TraceContext(
-                ingested_at=utc_iso(ts),
+                ingested_at=stamp,
                 input_file=input_file,
                 input_line_number=line_number,
                 adapter_name=self.name,
                 adapter_version=self.version,
                 raw_id=None if data.get("raw_id") is None else str(data.get("raw_id")),
-                original_timezone=original_tz,
+                original_timezone=intern.optional(original_tz),
             ),
         )
         return signal, ts, key
@@ -110,13 +88,14 @@ class SolanaRpcAdapter:
         wallet: str,
         data: dict[str, Any],
         options: AdapterOptions,
+        intern: Interner,
     ) -> tuple[Any, str]:
         if event_type == "trade":
             payload = TokenTradeSeen(
                 chain=chain,
                 token_mint=token_mint or "unknown",
                 wallet=wallet or "unknown",
-                side=str(data.get("side", "unknown")),
+                side=intern(str(data.get("side", "unknown"))),
                 amount=float(data.get("amount", 0.0)),
                 price_usd=None if data.get("price_usd") is None else float(data.get("price_usd")),
             )
@@ -141,8 +120,8 @@ class SolanaRpcAdapter:
             payload = LiquidityEventSeen(
                 chain=chain,
                 token_mint=token_mint or "unknown",
-                pool=str(data.get("pool", "unknown")),
-                action=str(data.get("action", "unknown")),
+                pool=intern(str(data.get("pool", "unknown"))),
+                action=intern(str(data.get("action", "unknown"))),
                 amount=float(data.get("amount", 0.0)),
             )
             key = f"liquidity_event|{payload.token_mint}|{payload.pool}|{payload.action}|{payload.amount:.8f}"
@@ -159,7 +138,7 @@ class SolanaRpcAdapter:
                 chain=chain,
                 token_mint=token_mint or "unknown",
                 wallet=wallet or "unknown",
-                program=str(data.get("program", "unknown")),
+                program=intern(str(data.get("program", "unknown"))),
                 amount=float(data.get("amount", 0.0)),
             )
             key = f"reward_update|{payload.token_mint}|{payload.wallet}|{payload.program}|{payload.amount:.8f}"
@@ -182,10 +161,10 @@ class SolanaRpcAdapter:
             payload = RewardPoolFundingSeen(
                 chain=chain,
                 token_mint=token_mint or "$METATOWEL",
-                pool=str(data.get("pool", "unknown")),
+                pool=intern(str(data.get("pool", "unknown"))),
                 funder=wallet or "unknown",
                 amount=float(data.get("amount", 0.0)),
-                currency=str(data.get("currency", "USDC")),
+                currency=intern(str(data.get("currency", "USDC"))),
             )
             key = (
                 "reward_pool_funding|"
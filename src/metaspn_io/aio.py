@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import os
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from concurrent.futures import Executor
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Any
+
+from metaspn_io.adapters.base import Adapter, AdapterOptions, IngestContext
+from metaspn_io.adapters.registry import AdapterRegistry
+from metaspn_io.batches import DEFAULT_BATCH_SIZE, SignalBatch, iter_signal_batches
+from metaspn_io.ingest import IngestResult, _adapter_options, _resolve_output_path
+from metaspn_io.io_utils import json_line
+from metaspn_io.issues import DEFAULT_SAMPLE_SIZE, IssueSink
+from metaspn_io.predicates import Predicate
+from metaspn_io.store import StoreLayout, append_store, open_layout, store_lock
+from metaspn_io.writer import JsonlWriter, _fsync_dir
+
+DEFAULT_ASYNC_QUEUE = 4
+_POLL = 0.1
+
+
+class _End:
+    pass
+
+
+_END = _End()
+
+
+async def aiter_signal_batches(
+    adapter: Adapter,
+    source: Path,
+    options: AdapterOptions | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    format: str = "dicts",
+    context: IngestContext | None = None,
+    queue_size: int = DEFAULT_ASYNC_QUEUE,
+    executor: Executor | None = None,
+) -> AsyncIterator[SignalBatch]:
+    """``iter_signal_batches`` run on a worker thread, delivered to the event loop.
+
+    Reading, parsing and sorting happen in ``executor`` (the loop's default pool
+    when ``None``); at most ``queue_size`` batches wait for the consumer, so a
+    slow consumer holds the worker back. Leaving the ``async for`` early or
+    cancelling the consuming task stops the worker at its next batch boundary;
+    closing the iterator awaits that, so no worker outlives it, while the loop
+    keeps running other tasks.
+    """
+    loop = asyncio.get_running_loop()
+    # The bound lives on the worker's side: it takes a slot per item, the consumer
+    # frees one per item taken, and items are handed over with put_nowait.
+    batches: asyncio.Queue[Any] = asyncio.Queue()
+    slots = threading.Semaphore(queue_size)
+    stop = threading.Event()
+
+    def deliver(item: Any) -> bool:
+        while not slots.acquire(timeout=_POLL):
+            if stop.is_set() or loop.is_closed():
+                return False
+        try:
+            loop.call_soon_threadsafe(batches.put_nowait, item)
+        except RuntimeError:  # the loop is closed; nobody is left to consume
+            return False
+        return True
+
+    def produce() -> None:
+        try:
+            for batch in iter_signal_batches(adapter, source, options, batch_size, format, context):
+                if stop.is_set() or not deliver(batch):
+                    return
+            deliver(_END)
+        except BaseException as exc:
+            if not stop.is_set():
+                deliver(exc)
+
+    worker = loop.run_in_executor(executor, produce)
+    try:
+        while True:
+            item = await batches.get()
+            slots.release()
+            if item is _END:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+        await worker
+    finally:
+        stop.set()
+        if not worker.done():
+            await asyncio.wait({worker})
+
+
+async def aiter_signals(
+    adapter: Adapter,
+    source: Path,
+    options: AdapterOptions | None = None,
+    context: IngestContext | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    executor: Executor | None = None,
+) -> AsyncIterator[dict[str, Any]]:
+    """Canonical signal dicts of ``adapter`` over ``source``, parsed off the event loop."""
+    async for batch in aiter_signal_batches(
+        adapter, source, options, batch_size=batch_size, context=context, executor=executor
+    ):
+        for signal in batch.records:
+            yield signal
+
+
+class _AsyncSink(ABC):
+    """Base for sinks that do their file I/O on one private worker thread, in call order."""
+
+    def __init__(self) -> None:
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="metaspn-sink")
+
+    async def _call(self, fn: Any, *args: Any) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def write(self, signals: list[dict[str, Any]]) -> None:
+        await self._call(self._write, signals)
+
+    async def aclose(self, abort: bool = False) -> None:
+        try:
+            await self._call(self._close, abort)
+        finally:
+            self._executor.shutdown(wait=False)
+
+    async def __aenter__(self) -> _AsyncSink:
+        return self
+
+    async def __aexit__(self, exc_type: object, *exc: object) -> None:
+        await self.aclose(abort=exc_type is not None)
+
+    @abstractmethod
+    def _write(self, signals: list[dict[str, Any]]) -> None: ...
+
+    @abstractmethod
+    def _close(self, abort: bool) -> None: ...
+
+
+class AsyncStoreSink(_AsyncSink):
+    """Append signals to a store, committing every ``write`` before it returns.
+
+    Each batch goes through ``JsonlWriter.commit``, so signals a caller has seen
+    ``write`` return for are on disk under the ``durability`` policy even if the
+    task is cancelled afterwards. The store lock is shared from construction
+    until ``aclose``, so compaction cannot run underneath the sink.
+    """
+
+    def __init__(self, store: Path, durability: str = "batch", partition_by: tuple[str, ...] | None = None) -> None:
+        self.store = store
+        self._store_lock = ExitStack()
+        self._store_lock.enter_context(store_lock(store))
+        try:
+            self.layout: StoreLayout = open_layout(store, partition_by)
+        except BaseException:
+            self._store_lock.close()
+            raise
+        super().__init__()
+        self._writer = JsonlWriter(durability=durability)
+
+    def _write(self, signals: list[dict[str, Any]]) -> None:
+        append_store(self.store, signals, self._writer, layout=self.layout)
+        self._writer.commit()
+
+    def _close(self, abort: bool) -> None:
+        try:
+            self._writer.close()
+        finally:
+            self._store_lock.close()
+
+
+class AsyncJsonlSink(_AsyncSink):
+    """Write one JSONL file through a temp file, renamed into place on a clean close.
+
+    An aborted close (an exception or cancellation inside ``async with``) removes
+    the temp file and leaves any previous ``path`` untouched, like ``--out``.
+    """
+
+    def __init__(self, path: Path, durability: str = "run") -> None:
+        super().__init__()
+        self.path = path
+        self.durability = durability
+        self._tmp = path.with_name(f".{path.name}.tmp")
+        self._handle: Any = None
+
+    def _write(self, signals: list[dict[str, Any]]) -> None:
+        if self._handle is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._handle = self._tmp.open("wb")
+        self._handle.write("".join(json_line(signal) for signal in signals).encode("utf-8"))
+
+    def _close(self, abort: bool) -> None:
+        if self._handle is None:
+            if abort:
+                return
+            self._write([])
+        try:
+            self._handle.flush()
+            if not abort and self.durability != "none":
+                os.fsync(self._handle.fileno())
+        finally:
+            self._handle.close()
+        if abort:
+            self._tmp.unlink(missing_ok=True)
+            return
+        os.replace(self._tmp, self.path)
+        if self.durability != "none":
+            _fsync_dir(self.path.parent)
+
+
+async def run_ingest_async(
+    registry: AdapterRegistry,
+    adapter_name: str,
+    source: Path,
+    out: Path | None = None,
+    store: Path | None = None,
+    day: str | None = None,
+    since: str | None = None,
+    until: str | None = None,
+    lenient: bool = False,
+    error_log_path: Path | None = None,
+    issue_sample_size: int | None = DEFAULT_SAMPLE_SIZE,
+    durability: str = "run",
+    partition_by: tuple[str, ...] | None = None,
+    prefilter: bool = False,
+    types: list[str] | None = None,
+    where: str | Predicate | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    executor: Executor | None = None,
+) -> IngestResult:
+    """``run_ingest`` for event loops: parse in ``executor``, write through async sinks.
+
+    Batches are written to ``out`` and ``store`` as they arrive, so memory stays at
+    a few batches. On cancellation ``out`` is left as it was, while store batches
+    already written stay committed; re-ingesting them later is safe because
+    ``signal_id`` is stable and compaction dedups.
+    """
+    adapter = registry.get(adapter_name)
+    options = _adapter_options(day, since, until, lenient, prefilter, types, where)
+    resolved_out = _resolve_output_path(out, day)
+    error_log = error_log_path or Path("workspace/logs/ingest_errors.jsonl")
+    issues = IssueSink(path=error_log, sample_size=issue_sample_size)
+    context = IngestContext(issues=issues)
+
+    sinks: list[_AsyncSink] = []
+    emitted = 0
+    try:
+        # Built inside the try, so a sink that fails to open aborts the ones before it.
+        if resolved_out is not None:
+            sinks.append(AsyncJsonlSink(resolved_out, durability=durability))
+        if store is not None:
+            sinks.append(AsyncStoreSink(store, durability=durability, partition_by=partition_by))
+        with issues:
+            async for batch in aiter_signal_batches(
+                adapter, source, options, batch_size=batch_size, context=context, executor=executor
+            ):
+                emitted += batch.size
+                for sink in sinks:
+                    await sink.write(batch.records)
+    except BaseException:
+        for sink in sinks:
+            await asyncio.shield(sink.aclose(abort=True))
+        raise
+    for sink in sinks:
+        await sink.aclose()
+
+    return IngestResult(
+        emitted=emitted,
+        errors=issues.count,
+        output=resolved_out,
+        error_log=error_log if issues.count else None,
+    )
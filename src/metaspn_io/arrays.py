@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+# Column layout per payload type: (name, kind) where kind is "time" (datetime64[s]),
+# "code" (int32 index into a shared per-field dictionary) or "float" (float64, NaN
+# for missing values).
+ARRAY_COLUMNS: dict[str, tuple[tuple[str, str], ...]] = {
+    "TokenTradeSeen": (
+        ("timestamp", "time"),
+        ("chain", "code"),
+        ("token_mint", "code"),
+        ("wallet", "code"),
+        ("side", "code"),
+        ("amount", "float"),
+        ("price_usd", "float"),
+    ),
+    "HolderChangeSeen": (
+        ("timestamp", "time"),
+        ("chain", "code"),
+        ("token_mint", "code"),
+        ("wallet", "code"),
+        ("delta", "float"),
+    ),
+    "LiquidityEventSeen": (
+        ("timestamp", "time"),
+        ("chain", "code"),
+        ("token_mint", "code"),
+        ("pool", "code"),
+        ("action", "code"),
+        ("amount", "float"),
+    ),
+}
+DEFAULT_CHUNK_ROWS = 65_536
+_DTYPES = {"time": "datetime64[s]", "code": "int32", "float": "float64"}
+
+
+def _numpy() -> Any:
+    try:
+        import numpy
+    except ImportError as exc:
+        raise ImportError("array export requires numpy; install metaspn-io[numpy]") from exc
+    return numpy
+
+
+@dataclass
+class TokenArrays:
+    """Structured arrays per payload type plus the string dictionaries behind code columns.
+
+    ``dictionaries[field][code]`` is the original string for a code column value;
+    codes are shared across payload types, so a mint has the same code everywhere.
+    """
+
+    arrays: dict[str, Any] = field(default_factory=dict)
+    dictionaries: dict[str, list[str]] = field(default_factory=dict)
+
+    def save_npz(self, path: Path) -> None:
+        """Write one ``.npz`` with an entry per payload type and ``dict.<field>`` per dictionary."""
+        np = _numpy()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entries = dict(self.arrays)
+        for name, values in self.dictionaries.items():
+            entries[f"dict.{name}"] = np.array(values, dtype=str)
+        with path.open("wb") as f:
+            np.savez(f, **entries)
+
+
+class TokenArrayBuilder:
+    """Build ``TokenArrays`` from canonical signal dicts in bounded chunks.
+
+    Rows are staged as Python values for at most ``chunk_rows`` signals per payload
+    type before being packed into a structured array, so peak memory is the packed
+    arrays plus one chunk. Signals of other payload types are ignored.
+    """
+
+    def __init__(self, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> None:
+        self.np = _numpy()
+        self.chunk_rows = chunk_rows
+        self._codes: dict[str, dict[str, int]] = {}
+        self._staged: dict[str, list[dict[str, Any]]] = {}
+        self._chunks: dict[str, list[Any]] = {}
+
+    def dtype(self, payload_type: str) -> Any:
+        return self.np.dtype([(name, _DTYPES[kind]) for name, kind in ARRAY_COLUMNS[payload_type]])
+
+    def add(self, signal: dict[str, Any]) -> None:
+        payload_type = str(signal.get("payload_type"))
+        if payload_type not in ARRAY_COLUMNS:
+            return
+        staged = self._staged.setdefault(payload_type, [])
+        staged.append({**signal["payload"], "timestamp": str(signal["timestamp"])})
+        if len(staged) >= self.chunk_rows:
+            self._pack(payload_type)
+
+    def extend(self, signals: Iterable[dict[str, Any]]) -> TokenArrayBuilder:
+        for signal in signals:
+            self.add(signal)
+        return self
+
+    def _code(self, name: str, value: Any) -> int:
+        codes = self._codes.setdefault(name, {})
+        key = "" if value is None else str(value)
+        code = codes.get(key)
+        if code is None:
+            code = codes[key] = len(codes)
+        return code
+
+    def _pack(self, payload_type: str) -> None:
+        rows = self._staged.pop(payload_type, [])
+        if not rows:
+            return
+        np = self.np
+        chunk = np.empty(len(rows), dtype=self.dtype(payload_type))
+        for name, kind in ARRAY_COLUMNS[payload_type]:
+            if kind == "time":
+                # Envelope timestamps are UTC `YYYY-MM-DDTHH:MM:SSZ`; numpy wants them naive.
+                chunk[name] = np.array([row[name].rstrip("Z") for row in rows], dtype="datetime64[s]")
+            elif kind == "code":
+                chunk[name] = np.fromiter((self._code(name, row.get(name)) for row in rows), "int32", len(rows))
+            else:
+                values = (np.nan if row.get(name) is None else float(row[name]) for row in rows)
+                chunk[name] = np.fromiter(values, "float64", len(rows))
+        self._chunks.setdefault(payload_type, []).append(chunk)
+
+    def finish(self) -> TokenArrays:
+        np = self.np
+        for payload_type in list(self._staged):
+            self._pack(payload_type)
+        arrays = {}
+        for payload_type in ARRAY_COLUMNS:
+            chunks = self._chunks.pop(payload_type, [])
+            if len(chunks) == 1:
+                arrays[payload_type] = chunks[0]
+            else:
+                arrays[payload_type] = np.concatenate(chunks) if chunks else np.empty(0, self.dtype(payload_type))
+        dictionaries = {name: list(codes) for name, codes in self._codes.items()}
+        return TokenArrays(arrays=arrays, dictionaries=dictionaries)
+
+
+def build_token_arrays(signals: Iterable[dict[str, Any]], chunk_rows: int = DEFAULT_CHUNK_ROWS) -> TokenArrays:
+    return TokenArrayBuilder(chunk_rows=chunk_rows).extend(signals).finish()
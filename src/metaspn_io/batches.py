@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import Any
+
+from metaspn_io.adapters.base import Adapter, AdapterOptions, IngestContext
+from metaspn_io.io_utils import ParseIssue, json_line
+from metaspn_io.issues import IssueSink
+
+BATCH_FORMATS = ("dicts", "bytes", "columns")
+DEFAULT_BATCH_SIZE = 1024
+SIGNAL_COLUMNS = (
+    "schema_version",
+    "signal_id",
+    "timestamp",
+    "source",
+    "payload_type",
+    "payload",
+    "entity_refs",
+    "trace",
+)
+
+
+@dataclass
+class SignalBatch:
+    """Up to ``batch_size`` signals in one of the ``BATCH_FORMATS``.
+
+    ``records`` is a list of canonical dicts (``dicts``), a list of serialized JSONL
+    lines (``bytes``) or a dict of equal-length lists keyed by ``SIGNAL_COLUMNS``
+    (``columns``). ``issues`` holds the parse issues raised since the previous batch.
+    """
+
+    records: Any
+    size: int
+    issues: list[ParseIssue] = field(default_factory=list)
+
+
+def _pack(rows: list[dict[str, Any]], format: str) -> Any:
+    if format == "bytes":
+        return [json_line(row).encode("utf-8") for row in rows]
+    if format == "columns":
+        return {name: [row[name] for row in rows] for name in SIGNAL_COLUMNS}
+    return rows
+
+
+def iter_signal_batches(
+    adapter: Adapter,
+    source: Path,
+    options: AdapterOptions | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    format: str = "dicts",
+    context: IngestContext | None = None,
+) -> Iterator[SignalBatch]:
+    """Run ``adapter`` over ``source`` and yield its signals in batches.
+
+    Without a ``context`` the issues of each batch are complete and are not kept
+    after the batch is yielded. With a caller-provided context, batches carry the
+    issues its sink keeps as samples, while counts on the sink stay exact.
+    Issues raised after the last signal are delivered in a final empty batch.
+    ``format`` and ``batch_size`` are checked when called, not on first ``next``.
+    """
+    if format not in BATCH_FORMATS:
+        raise ValueError(f"format must be one of {', '.join(BATCH_FORMATS)}; got '{format}'")
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be positive; got {batch_size}")
+    return _iter_batches(adapter, source, options, batch_size, format, context)
+
+
+def _iter_batches(
+    adapter: Adapter,
+    source: Path,
+    options: AdapterOptions | None,
+    batch_size: int,
+    format: str,
+    context: IngestContext | None,
+) -> Iterator[SignalBatch]:
+    owned = context is None
+    ctx = context if context is not None else IngestContext(issues=IssueSink(sample_size=None))
+    seen = len(ctx.issues.samples)
+
+    def take_issues() -> list[ParseIssue]:
+        nonlocal seen
+        issues = ctx.issues.samples[seen:]
+        if owned:
+            ctx.issues.samples.clear()
+        seen = len(ctx.issues.samples)
+        return issues
+
+    # The adapter's sorted row stream is sliced a batch at a time, so the only
+    # per-signal work left here is the dict conversion itself.
+    signals = adapter.iter_signals(source, options=options, context=ctx)
+    while True:
+        rows = [signal.to_dict() for signal in islice(signals, batch_size)]
+        if len(rows) < batch_size:
+            break
+        yield SignalBatch(records=_pack(rows, format), size=len(rows), issues=take_issues())
+    issues = take_issues()
+    if rows or issues:
+        yield SignalBatch(records=_pack(rows, format), size=len(rows), issues=issues)
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import hashlib
+import heapq
+import json
+import os
+import shutil
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any
+
+from metaspn_io.adapters.base import AdapterOptions, IngestContext, JsonlAdapter, raw_prefilter
+from metaspn_io.io_utils import ParseIssue, iter_jsonl_paths, iter_jsonl_records
+from metaspn_io.issues import IssueSink
+from metaspn_io.writer import replace_jsonl
+
+CACHE_FORMAT = 2
+DEFAULT_CACHE_BYTES = 1 << 30
+_CHUNK = 1 << 20
+
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(_CHUNK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _stamp(value: object | None) -> str | None:
+    return value.isoformat() if isinstance(value, datetime) else None if value is None else str(value)
+
+
+def options_fingerprint(options: AdapterOptions) -> str:
+    """Stable digest of every option that can change an adapter's output."""
+    state = {
+        "since": _stamp(options.since),
+        "until": _stamp(options.until),
+        "lenient": options.lenient,
+        "prefilter": options.prefilter,
+        "types": None if options.types is None else sorted(options.types),
+        "where": None if options.where is None else options.where.fingerprint,
+    }
+    return hashlib.sha256(json.dumps(state, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _sort_stamp(ts: datetime) -> str:
+    # Fixed-width UTC text sorts like the datetime, so cached and fresh rows merge.
+    return ts.strftime("%Y-%m-%dT%H:%M:%S.%f")
+
+
+class SignalCache:
+    """Content-addressed cache of each source file's normalized, sorted signals.
+
+    Entries live in ``<root>/<adapter>/<version>/<key>.jsonl`` where ``key`` hashes
+    the file's resolved path and contents and the adapter options; the path is
+    part of the key because signals carry it in ``trace.input_file``. An entry
+    stores the file's counters, issue counts per class and the issues sampled at
+    the caller's sample size in a header line, followed by ``[ts, key, signal]``
+    rows in output order. Using an adapter removes entries written by its other versions. Hits
+    refresh the entry's mtime, and the least recently used entries are evicted
+    once the cache exceeds ``max_bytes``.
+    """
+
+    def __init__(self, root: Path, max_bytes: int = DEFAULT_CACHE_BYTES) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+
+    def _version_dir(self, adapter: JsonlAdapter) -> Path:
+        adapter_dir = self.root / adapter.name
+        version_dir = adapter_dir / adapter.version
+        if adapter_dir.is_dir():
+            for stale in adapter_dir.iterdir():
+                if stale.is_dir() and stale.name != adapter.version:
+                    shutil.rmtree(stale, ignore_errors=True)
+        return version_dir
+
+    def _build(
+        self, adapter: JsonlAdapter, path: Path, options: AdapterOptions, entry: Path, sample_size: int | None
+    ) -> None:
+        ctx = IngestContext(issues=IssueSink(sample_size=sample_size))
+        records = iter_jsonl_records(path, prefilter=raw_prefilter(options, ctx))
+        rows = sorted(adapter._iter_rows(records, options, ctx), key=lambda item: (item[0], item[1]))
+        header = {
+            "format": CACHE_FORMAT,
+            "counters": ctx.counters,
+            "issue_counts": ctx.issues.by_message,
+            "issues": [issue.to_dict() for issue in ctx.issues.samples],
+            "sample_size": sample_size,
+        }
+        lines = [json.dumps(header, separators=(",", ":"), sort_keys=True) + "\n"]
+        lines += (
+            json.dumps([_sort_stamp(ts), key, signal.to_dict()], separators=(",", ":"), sort_keys=True) + "\n"
+            for ts, key, signal in rows
+        )
+        replace_jsonl(entry, lines, durability="none")
+
+    def _open(self, entry: Path, sample_size: int | None) -> tuple[IO[str], dict[str, Any]] | None:
+        """The entry's handle and header, or ``None`` if it is missing or sampled fewer issues than needed."""
+        try:
+            f = entry.open("r", encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        header = json.loads(f.readline())
+        stored = header["sample_size"]
+        if stored is not None and (sample_size is None or stored < sample_size):
+            f.close()
+            return None
+        return f, header
+
+    def _read_rows(self, f: IO[str]) -> Iterator[tuple[str, str, dict[str, Any]]]:
+        for line in f:
+            stamp, key, signal = json.loads(line)
+            yield stamp, key, signal
+
+    def iter_signals(
+        self,
+        adapter: JsonlAdapter,
+        source: Path,
+        options: AdapterOptions | None = None,
+        context: IngestContext | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Yield canonical signal dicts for ``source``, reusing cached files.
+
+        Output matches ``adapter.iter_signals``; each file's issues and counters are
+        replayed into ``context`` whether the file was a hit or a miss.
+        """
+        opts = options or AdapterOptions()
+        ctx = context if context is not None else IngestContext()
+        ctx.sort_path = "merge"
+        version_dir = self._version_dir(adapter)
+        fingerprint = options_fingerprint(opts)
+        sample_size = ctx.issues.sample_size
+        handles = []
+        try:
+            for path in iter_jsonl_paths(source):
+                identity = f"{CACHE_FORMAT}:{path.resolve()}:{_file_digest(path)}:{fingerprint}"
+                key = hashlib.sha256(identity.encode("utf-8")).hexdigest()
+                entry = version_dir / key[:2] / f"{key}.jsonl"
+                opened = self._open(entry, sample_size)
+                if opened is not None:
+                    ctx.count("cache_hits")
+                    os.utime(entry)
+                else:
+                    ctx.count("cache_misses")
+                    self._build(adapter, path, opts, entry, sample_size)
+                    opened = self._open(entry, sample_size)
+                    assert opened is not None
+                f, header = opened
+                handles.append(f)
+                for name, value in header["counters"].items():
+                    ctx.count(name, value)
+                samples = [ParseIssue(**issue) for issue in header["issues"]]
+                ctx.issues.replay(str(path), samples, header["issue_counts"])
+
+            streams = [self._read_rows(f) for f in handles]
+            for _, _, signal in heapq.merge(*streams, key=lambda item: (item[0], item[1])):
+                ctx.count("emitted")
+                yield signal
+        finally:
+            for f in handles:
+                f.close()
+        self.evict()
+
+    def evict(self) -> int:
+        """Drop least recently used entries until the cache fits ``max_bytes``; returns the count."""
+        entries = []
+        total = 0
+        for entry in self.root.glob("*/*/*/*.jsonl"):
+            stat = entry.stat()
+            entries.append((stat.st_mtime_ns, stat.st_size, entry))
+            total += stat.st_size
+        removed = 0
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
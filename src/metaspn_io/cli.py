@@ -1,10 +1,52 @@
 from __future__ import annotations
 
 import argparse
+import os
+import sys
 from pathlib import Path
 
 from metaspn_io.adapters import default_registry
-from metaspn_io.ingest import run_ingest
+from metaspn_io.adapters.base import DEFAULT_REORDER_WINDOW
+from metaspn_io.estimate import DEFAULT_SAMPLE_RATE
+from metaspn_io.issues import DEFAULT_SAMPLE_SIZE
+from metaspn_io.memprof import MEMORY_PROFILE_MODES
+from metaspn_io.pipeline import DEFAULT_PIPELINE_QUEUE
+from metaspn_io.shards import SHARD_KEYS
+from metaspn_io.sketches import DEFAULT_TOP_K
+from metaspn_io.writer import DURABILITY_MODES
+
+
+def _csv(value: str) -> list[str]:
+    return [part.strip() for part in value.split(",") if part.strip()]
+
+
+def _predicate(value: str):
+    from metaspn_io.predicates import PredicateError, compile_predicate
+
+    try:
+        return compile_predicate(value)
+    except PredicateError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from exc
+
+
+def _tee(value: str):
+    from metaspn_io.tee import parse_tee
+
+    try:
+        return parse_tee(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from exc
+
+
+def _partition_fields(value: str) -> tuple[str, ...]:
+    from metaspn_io.store import StoreLayout
+
+    fields = tuple(_csv(value))
+    try:
+        StoreLayout(partition_by=fields)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from exc
+    return fields
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -16,46 +58,372 @@ def build_parser() -> argparse.ArgumentParser:
 
     ingest = io_sub.add_parser("ingest", help="Ingest and normalize raw source data")
     ingest.add_argument("--adapter", required=True)
-    ingest.add_argument("--source", required=True)
-    ingest.add_argument("--out")
+    ingest.add_argument("--source", required=True, help="File, directory, or - for JSONL on stdin")
+    ingest.add_argument("--out", help="Output JSONL file, or - to stream signals to stdout")
     ingest.add_argument("--store")
     ingest.add_argument("--date", help="UTC date window to ingest (YYYY-MM-DD)")
     ingest.add_argument("--since")
     ingest.add_argument("--until")
     ingest.add_argument("--dry-run", action="store_true")
+    ingest.add_argument("--error-log", help="Parse issue log (default: workspace/logs/ingest_errors.jsonl)")
     ingest.add_argument("--stats", action="store_true")
     ingest.add_argument("--lenient", action="store_true")
+    ingest.add_argument(
+        "--issue-sample-size",
+        type=int,
+        default=DEFAULT_SAMPLE_SIZE,
+        help="Raw lines kept in the error log per issue message class (default: %(default)s)",
+    )
+    ingest.add_argument("--durability", choices=DURABILITY_MODES, default="run", help="fsync policy for writes")
+    ingest.add_argument(
+        "--partition-by",
+        type=_partition_fields,
+        help="Store partition fields, e.g. source,payload_type,date,hour (default: recorded layout or date)",
+    )
+    ingest.add_argument(
+        "--prefilter",
+        action="store_true",
+        help="Drop lines whose raw timestamp is certainly outside the time window before decoding",
+    )
+    ingest.add_argument("--types", type=_csv, help="Comma-separated allowlist of input record types")
+    ingest.add_argument(
+        "--where",
+        type=_predicate,
+        help='Raw-record filter, e.g. "token_mint in @mints.txt and amount > 100"',
+    )
+    ingest.add_argument(
+        "--tee",
+        action="append",
+        type=_tee,
+        help="Extra filtered output, e.g. payload_type=TokenTradeSeen:trades.jsonl (repeatable)",
+    )
+    ingest.add_argument("--sqlite-out", help="Upsert signals into this SQLite database (table: signals)")
+    ingest.add_argument(
+        "--npz",
+        help="Also write token trade, holder and liquidity events as NumPy structured arrays (needs numpy)",
+    )
+    ingest.add_argument("--holders", help="Holder-balance state directory to update with the emitted signals")
+    ingest.add_argument("--season-state", help="Season 1 aggregate state directory to update with the emitted signals")
+    ingest.add_argument("--cache", help="Directory caching each source file's normalized signals by content hash")
+    ingest.add_argument("--cache-max-bytes", type=int, help="Evict least recently used cache entries beyond this size")
+    ingest.add_argument(
+        "--reorder-window",
+        type=int,
+        default=DEFAULT_REORDER_WINDOW,
+        help="Rows buffered to restore time order when reading stdin (default: %(default)s)",
+    )
+    ingest.add_argument(
+        "--memory-profile",
+        nargs="?",
+        const="rss",
+        choices=MEMORY_PROFILE_MODES,
+        help="Report RSS per ingest stage; 'tracemalloc' adds traced bytes and top allocation sites",
+    )
+    ingest.add_argument(
+        "--estimate",
+        action="store_true",
+        help="Extrapolate counts and error rate from sampled byte ranges instead of ingesting",
+    )
+    ingest.add_argument(
+        "--sample-rate",
+        type=float,
+        help=f"Fraction of each file read by --estimate (default: {DEFAULT_SAMPLE_RATE}; implies --estimate)",
+    )
+    ingest.add_argument("--sketch-out", help="Save mergeable distinct-count and heavy-hitter sketches as JSON")
+    ingest.add_argument(
+        "--top-k",
+        type=int,
+        default=DEFAULT_TOP_K,
+        help="Most active wallets and token mints reported by --stats (default: %(default)s)",
+    )
+    ingest.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Overlap adapter parsing with serialization and writing on threads joined by bounded queues "
+        "(reading and parsing share one stage)",
+    )
+    ingest.add_argument(
+        "--pipeline-queue",
+        type=int,
+        default=DEFAULT_PIPELINE_QUEUE,
+        help="Batches buffered between pipeline stages (default: %(default)s)",
+    )
+    ingest.add_argument("--shards", type=int, help="Split --out into N files by stable hash of --shard-key")
+    ingest.add_argument("--shard-key", choices=SHARD_KEYS, default="entity")
+
+    serve = io_sub.add_parser("serve", help="Run a long-lived ingest daemon on a Unix socket")
+    serve.add_argument("--socket", required=True, help="Unix domain socket path to listen on")
+    serve.add_argument("--store", required=True)
+    serve.add_argument("--error-log", default="workspace/logs/ingest_errors.jsonl")
+    serve.add_argument("--queue-size", type=int, default=64, help="Batches buffered before clients are held back")
+    serve.add_argument("--durability", choices=DURABILITY_MODES, default="batch", help="fsync policy for store writes")
+    serve.add_argument("--partition-by", type=_partition_fields)
+
+    compact = io_sub.add_parser("compact", help="Sort, dedup and atomically rewrite store partitions")
+    compact.add_argument("--store", required=True)
+    compact.add_argument("--workers", type=int, default=1)
+    compact.add_argument("--force", action="store_true", help="Recompact partitions unchanged since the last run")
+    compact.add_argument("--stats", action="store_true")
+
+    holders = io_sub.add_parser("holders", help="Materialize and query holder balances")
+    holders.add_argument("--state", required=True, help="Holder-balance state directory")
+    holders.add_argument("--update", help="Signal JSONL file or directory to apply before querying")
+    holders.add_argument("--token-mint")
+    holders.add_argument("--wallet")
+    holders.add_argument("--at", help="UTC day (YYYY-MM-DD, end of day) or timestamp to query")
+
+    seasons = io_sub.add_parser("season1", help="Maintain and export Season 1 stake, distribution and claim totals")
+    seasons.add_argument("--state", required=True, help="Season 1 aggregate state directory")
+    seasons.add_argument("--update", help="Signal JSONL file or directory to apply")
+    seasons.add_argument("--export", help="Write all totals as JSONL to this path")
+    seasons.add_argument("--season-id")
+    seasons.add_argument("--game-id")
+    seasons.add_argument("--account", help="Wallet, or reward pool for distributions")
+
+    sketches = io_sub.add_parser("sketches", help="Merge and report sketches saved by --sketch-out")
+    sketches.add_argument("inputs", nargs="+", help="Sketch JSON files from sharded or parallel runs")
+    sketches.add_argument("--out", help="Write the merged sketch to this path")
 
     return parser
 
 
-def main(argv: list[str] | None = None) -> int:
-    parser = build_parser()
-    args = parser.parse_args(argv)
+def _sketches(args: argparse.Namespace) -> int:
+    from metaspn_io.sketches import SignalSketches
 
-    if args.command != "io" or args.io_command != "ingest":
-        parser.print_help()
-        return 2
+    merged = SignalSketches.load(Path(args.inputs[0]))
+    for path in args.inputs[1:]:
+        merged.merge(SignalSketches.load(Path(path)))
+    if args.out:
+        merged.save(Path(args.out))
+    print(f"signals={merged.signals}")
+    for line in merged.report_lines():
+        print(line)
+    return 0
 
-    if not args.out and not args.store and not args.dry_run:
-        parser.error("at least one of --out, --store, or --dry-run is required")
 
-    registry = default_registry()
-    run_ingest(
-        registry=registry,
+def _estimate(parser: argparse.ArgumentParser, args: argparse.Namespace) -> int:
+    from metaspn_io.ingest import run_estimate
+
+    rate = DEFAULT_SAMPLE_RATE if args.sample_rate is None else args.sample_rate
+    if not 0 < rate <= 1:
+        parser.error("--sample-rate must be in (0, 1]")
+    if args.source == "-":
+        parser.error("--estimate needs source files and cannot be used with --source -")
+    writes = {
+        "--out": args.out,
+        "--store": args.store,
+        "--sqlite-out": args.sqlite_out,
+        "--tee": args.tee,
+        "--npz": args.npz,
+        "--holders": args.holders,
+        "--season-state": args.season_state,
+        "--sketch-out": args.sketch_out,
+        "--shards": args.shards,
+        "--cache": args.cache,
+    }
+    given = [flag for flag, value in writes.items() if value]
+    if given:
+        parser.error(f"--estimate only reports and cannot be combined with {', '.join(given)}")
+    run_estimate(
+        registry=default_registry(),
         adapter_name=args.adapter,
         source=Path(args.source),
-        out=Path(args.out) if args.out else None,
-        store=Path(args.store) if args.store else None,
         day=args.date,
         since=args.since,
         until=args.until,
-        dry_run=args.dry_run,
-        stats=args.stats,
         lenient=args.lenient,
+        prefilter=args.prefilter,
+        types=args.types,
+        where=args.where,
+        sample_rate=rate,
     )
     return 0
 
 
+def _season1(args: argparse.Namespace) -> int:
+    from metaspn_io.io_utils import json_line
+    from metaspn_io.seasons import SeasonAggregates
+    from metaspn_io.writer import replace_jsonl
+
+    aggregates = SeasonAggregates.load(Path(args.state))
+    if args.update:
+        result = aggregates.update_from(Path(args.update))
+        aggregates.save()
+        print(f"applied={result.applied}")
+        print(f"duplicates={result.duplicates}")
+    if args.export:
+        replace_jsonl(Path(args.export), (json_line(row) for row in aggregates.export()))
+    if args.season_id:
+        if args.game_id and args.account:
+            totals = aggregates.get(args.season_id, args.game_id, args.account)
+        elif args.game_id:
+            totals = aggregates.game(args.season_id, args.game_id)
+        elif args.account:
+            totals = aggregates.wallet(args.season_id, args.account)
+        else:
+            totals = None
+        if totals is not None:
+            for name, value in totals.to_dict().items():
+                print(f"{name}={value}")
+    return 0
+
+
+def _holders(args: argparse.Namespace) -> int:
+    from metaspn_io.holders import HolderState, format_amount
+
+    state = HolderState(Path(args.state))
+    if args.update:
+        result = state.update_from(Path(args.update))
+        print(f"applied={result.applied}")
+        print(f"duplicates={result.duplicates}")
+        print(f"days_rebuilt={result.days_rebuilt}")
+    if args.at:
+        holdings = state.at(args.at)
+        for (mint, wallet), balance in sorted(holdings.balances.items()):
+            if args.token_mint not in (None, mint) or args.wallet not in (None, wallet):
+                continue
+            print(f"balance.{mint}.{wallet}={format_amount(balance)}")
+        for mint, supply in sorted(holdings.supply.items()):
+            if args.token_mint in (None, mint):
+                print(f"supply.{mint}={format_amount(supply)}")
+    return 0
+
+
+def _compact(args: argparse.Namespace) -> int:
+    from metaspn_io.compact import compact_store
+    from metaspn_io.store import StoreLockedError
+
+    try:
+        results = compact_store(Path(args.store), workers=args.workers, force=args.force)
+    except StoreLockedError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    if args.stats:
+        print(f"store={args.store}")
+        print(f"partitions={len(results)}")
+        print(f"skipped={sum(result.skipped for result in results)}")
+        for result in results:
+            if result.skipped:
+                continue
+            print(
+                f"partition.{result.partition.relative_to(Path(args.store) / 'signals').as_posix()}="
+                f"in:{result.lines_in},out:{result.lines_out},"
+                f"duplicates:{result.duplicates},invalid:{result.invalid}"
+            )
+    return 0
+
+
+def _serve(args: argparse.Namespace) -> int:
+    import signal
+
+    from metaspn_io.server import IngestServer
+
+    server = IngestServer(
+        socket_path=Path(args.socket),
+        registry=default_registry(),
+        store=Path(args.store),
+        error_log=Path(args.error_log) if args.error_log else None,
+        queue_size=args.queue_size,
+        durability=args.durability,
+        partition_by=args.partition_by,
+    )
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.command == "io" and args.io_command == "serve":
+        return _serve(args)
+    if args.command == "io" and args.io_command == "compact":
+        return _compact(args)
+    if args.command == "io" and args.io_command == "holders":
+        return _holders(args)
+    if args.command == "io" and args.io_command == "season1":
+        return _season1(args)
+    if args.command == "io" and args.io_command == "sketches":
+        return _sketches(args)
+    if args.command != "io" or args.io_command != "ingest":
+        parser.print_help()
+        return 2
+
+    if args.estimate or args.sample_rate is not None:
+        return _estimate(parser, args)
+
+    outputs = (args.out, args.store, args.sqlite_out, args.tee, args.npz, args.holders, args.season_state)
+    if not any(outputs) and not args.sketch_out and not args.dry_run:
+        parser.error(
+            "at least one of --out, --store, --sqlite-out, --tee, --npz, --holders, --season-state, "
+            "--sketch-out, or --dry-run is required"
+        )
+    if args.shards is not None and (args.shards < 1 or not args.out):
+        parser.error("--shards requires --out and a positive shard count")
+    if args.out == "-" and (any(outputs[1:]) or args.shards):
+        parser.error("--out - streams to stdout and cannot be combined with other outputs")
+    if args.source == "-" and args.cache:
+        parser.error("--cache needs source files and cannot be used with --source -")
+    if args.pipeline_queue < 1:
+        parser.error("--pipeline-queue must be positive")
+    if args.top_k < 1:
+        parser.error("--top-k must be positive")
+    if args.reorder_window < 0:
+        parser.error("--reorder-window must not be negative")
+
+    from metaspn_io.ingest import SinkOptions, run_ingest
+
+    registry = default_registry()
+    try:
+        run_ingest(
+            registry=registry,
+            adapter_name=args.adapter,
+            source=Path(args.source),
+            out=Path(args.out) if args.out else None,
+            store=Path(args.store) if args.store else None,
+            day=args.date,
+            since=args.since,
+            until=args.until,
+            dry_run=args.dry_run,
+            error_log_path=Path(args.error_log) if args.error_log else None,
+            stats=args.stats,
+            lenient=args.lenient,
+            issue_sample_size=args.issue_sample_size,
+            sinks=SinkOptions(
+                durability=args.durability,
+                partition_by=args.partition_by,
+                shards=args.shards,
+                shard_key=args.shard_key,
+                tees=args.tee,
+                npz=Path(args.npz) if args.npz else None,
+                holders=Path(args.holders) if args.holders else None,
+                season_state=Path(args.season_state) if args.season_state else None,
+                sqlite_out=Path(args.sqlite_out) if args.sqlite_out else None,
+                sketch_out=Path(args.sketch_out) if args.sketch_out else None,
+            ),
+            prefilter=args.prefilter,
+            types=args.types,
+            where=args.where,
+            cache=Path(args.cache) if args.cache else None,
+            cache_max_bytes=args.cache_max_bytes,
+            reorder_window=args.reorder_window,
+            memory_profile=args.memory_profile,
+            top_k=args.top_k,
+            pipeline=args.pipeline,
+            pipeline_queue=args.pipeline_queue,
+        )
+    except BrokenPipeError:
+        # The reader went away (e.g. `| head`); silence the flush at interpreter exit.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    return 0
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
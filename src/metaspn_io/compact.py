@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import heapq
+import json
+import os
+import tempfile
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from metaspn_io.store import iter_partitions, store_lock
+
+COMPACTION_MANIFEST = ".compaction.json"
+DEFAULT_CHUNK_LINES = 200_000
+
+
+@dataclass(frozen=True)
+class CompactionResult:
+    partition: Path
+    skipped: bool
+    lines_in: int = 0
+    lines_out: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+
+
+# (timestamp, signal_id, position in the partition, line): the position keeps
+# duplicates in arrival order, so dedup keeps the first copy and never compares lines.
+_Keyed = tuple[str, str, int, str]
+
+
+def _sort_key(line: str, seq: int) -> _Keyed:
+    record = json.loads(line)
+    return str(record["timestamp"]), str(record["signal_id"]), seq, line
+
+
+def _write_run(directory: Path, keyed: list[_Keyed]) -> Path:
+    keyed.sort()
+    fd, name = tempfile.mkstemp(prefix=".compact-", suffix=".run", dir=directory)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.writelines(f"{seq} {line}" for _, _, seq, line in keyed)
+    return Path(name)
+
+
+def _read_run(path: Path) -> Iterator[_Keyed]:
+    with path.open("r", encoding="utf-8") as f:
+        for entry in f:
+            seq, _, line = entry.partition(" ")
+            yield _sort_key(line, int(seq))
+
+
+def compact_partition(path: Path, chunk_lines: int = DEFAULT_CHUNK_LINES) -> CompactionResult:
+    """Sort a partition on ``(timestamp, signal_id)``, drop duplicate IDs and rewrite it atomically.
+
+    Of several lines with the same signal ID, the first one in the partition is kept.
+
+    Lines are sorted in chunks of ``chunk_lines`` that spill to temporary runs next to
+    the partition, then merged, so memory stays bounded for large partitions.
+    Lines that are not valid signal JSON are dropped and counted as ``invalid``.
+    """
+    lines_in = invalid = duplicates = lines_out = 0
+    runs: list[Path] = []
+    chunk: list[_Keyed] = []
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                lines_in += 1
+                if not line.endswith("\n"):
+                    line += "\n"
+                try:
+                    chunk.append(_sort_key(line, lines_in))
+                except (ValueError, KeyError, TypeError):
+                    invalid += 1
+                    continue
+                if len(chunk) >= chunk_lines:
+                    runs.append(_write_run(path.parent, chunk))
+                    chunk = []
+
+        fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+        tmp = Path(tmp_name)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as out:
+                chunk.sort()
+                sources = [_read_run(run) for run in runs]
+                previous_id: str | None = None
+                try:
+                    for _, signal_id, _, line in heapq.merge(iter(chunk), *sources):
+                        if signal_id == previous_id:
+                            duplicates += 1
+                            continue
+                        previous_id = signal_id
+                        out.write(line)
+                        lines_out += 1
+                finally:
+                    for source in sources:
+                        source.close()
+                out.flush()
+                os.fsync(out.fileno())
+            os.replace(tmp, path)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+    finally:
+        for run in runs:
+            run.unlink(missing_ok=True)
+
+    return CompactionResult(
+        partition=path,
+        skipped=False,
+        lines_in=lines_in,
+        lines_out=lines_out,
+        duplicates=duplicates,
+        invalid=invalid,
+    )
+
+
+def _fingerprint(path: Path) -> dict[str, int]:
+    stat = path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _load_manifest(path: Path) -> dict[str, dict[str, int]]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def compact_store(
+    store: Path,
+    workers: int = 1,
+    force: bool = False,
+    chunk_lines: int = DEFAULT_CHUNK_LINES,
+) -> list[CompactionResult]:
+    """Compact every partition of the store, whatever its layout.
+
+    Partitions whose size and mtime match the manifest written by the previous
+    compaction are skipped unless ``force`` is set. With ``workers > 1`` partitions
+    are compacted in parallel worker processes.
+
+    The store lock is taken exclusively for the whole run; ``StoreLockedError`` is
+    raised at once if an ingest or ``serve`` is appending to the store.
+    """
+    with store_lock(store, exclusive=True):
+        return _compact_store(store, workers, force, chunk_lines)
+
+
+def _compact_store(store: Path, workers: int, force: bool, chunk_lines: int) -> list[CompactionResult]:
+    signals_dir = store / "signals"
+    manifest_path = signals_dir / COMPACTION_MANIFEST
+    manifest = {} if force else _load_manifest(manifest_path)
+    partitions = list(iter_partitions(store))
+    names = {partition: partition.relative_to(signals_dir).as_posix() for partition in partitions}
+
+    results: dict[Path, CompactionResult] = {}
+    pending: list[Path] = []
+    for partition in partitions:
+        if manifest.get(names[partition]) == _fingerprint(partition):
+            results[partition] = CompactionResult(partition=partition, skipped=True)
+        else:
+            pending.append(partition)
+
+    if workers > 1 and len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for result in pool.map(compact_partition, pending, [chunk_lines] * len(pending)):
+                results[result.partition] = result
+    else:
+        for partition in pending:
+            results[partition] = compact_partition(partition, chunk_lines=chunk_lines)
+
+    if partitions:
+        updated = {names[partition]: _fingerprint(partition) for partition in partitions}
+        tmp = manifest_path.with_name(manifest_path.name + ".tmp")
+        tmp.write_text(json.dumps(updated, sort_keys=True, indent=2), encoding="utf-8")
+        os.replace(tmp, manifest_path)
+
+    return [results[partition] for partition in partitions]
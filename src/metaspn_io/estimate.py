@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import itertools
+import math
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO
+
+from metaspn_io.adapters.base import AdapterOptions, IngestContext, JsonlAdapter, raw_prefilter
+from metaspn_io.io_utils import iter_jsonl_lines, iter_jsonl_paths
+from metaspn_io.issues import IssueSink
+
+DEFAULT_SAMPLE_RATE = 0.001
+DEFAULT_RANGE_BYTES = 64 * 1024
+MIN_RANGES = 8
+_Z95 = 1.96
+
+
+@dataclass(frozen=True)
+class Interval:
+    """Point estimate with a 95% confidence interval."""
+
+    value: float
+    low: float
+    high: float
+
+    def format(self, digits: int = 0) -> tuple[str, str]:
+        return f"{self.value:.{digits}f}", f"{self.low:.{digits}f}..{self.high:.{digits}f}"
+
+
+@dataclass
+class _Cluster:
+    """Counts from one sampled byte range (or one whole file, when ``exact``)."""
+
+    size: int
+    records: int = 0
+    errors: int = 0
+    payloads: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class SourceEstimate:
+    files: int
+    bytes_total: int
+    bytes_read: int
+    ranges: int
+    records: Interval
+    errors: Interval
+    error_rate: Interval
+    payloads: dict[str, Interval]
+
+    @property
+    def exact(self) -> bool:
+        return self.bytes_read >= self.bytes_total
+
+    def report_lines(self) -> list[str]:
+        lines = [
+            f"estimate.files={self.files}",
+            f"estimate.bytes_total={self.bytes_total}",
+            f"estimate.bytes_read={self.bytes_read}",
+            f"estimate.ranges={self.ranges}",
+            f"estimate.exact={str(self.exact).lower()}",
+        ]
+        named = [("records", self.records), ("errors", self.errors)]
+        named += [(f"payload.{name}", interval) for name, interval in sorted(self.payloads.items())]
+        for name, interval in named:
+            value, ci = interval.format()
+            lines += [f"estimate.{name}={value}", f"estimate.{name}.ci95={ci}"]
+        value, ci = self.error_rate.format(digits=4)
+        lines += [f"estimate.error_rate={value}", f"estimate.error_rate.ci95={ci}"]
+        return lines
+
+
+def _plan_ranges(sizes: list[int], rate: float, range_bytes: int) -> list[list[tuple[int, int]]] | None:
+    """``(start, length)`` ranges to read from each file, or ``None`` to read everything.
+
+    The files are laid end to end and ``n`` ranges are spread evenly over the
+    whole, one centred in each of ``n`` equal slices, so files are sampled in
+    proportion to their size and a small file may get no range at all. A range
+    that crosses a file boundary is split into one piece per file.
+    """
+    total = sum(sizes)
+    ranges = max(MIN_RANGES, math.ceil(total * rate / range_bytes))
+    if ranges * range_bytes >= total:
+        return None
+    stride = total / ranges
+    plan: list[list[tuple[int, int]]] = [[] for _ in sizes]
+    ends = list(itertools.accumulate(sizes))
+    idx = 0
+    for n in range(ranges):
+        start = int(n * stride + (stride - range_bytes) / 2)
+        end = start + range_bytes
+        while start < end:
+            while ends[idx] <= start:
+                idx += 1
+            piece_end = min(end, ends[idx])
+            plan[idx].append((start - (ends[idx] - sizes[idx]), piece_end - start))
+            start = piece_end
+    return plan
+
+
+def _read_range(f: BinaryIO, start: int, length: int) -> list[str]:
+    """Lines starting inside ``[start, start + length)``, so ranges neither overlap nor cut lines."""
+    f.seek(max(start - 1, 0))
+    if start > 0 and f.read(1) != b"\n":
+        f.readline()
+    pos = f.tell()
+    lines = []
+    while pos < start + length:
+        line = f.readline()
+        if not line:
+            break
+        lines.append(line.decode("utf-8", errors="replace"))
+        pos += len(line)
+    return lines
+
+
+def _total(clusters: list[_Cluster], exact: float, sampled_bytes: int, values: list[float]) -> tuple[float, float]:
+    """Ratio-to-size estimate of a total and its standard error.
+
+    ``values`` holds one number per sampled cluster. The total scales their sum by
+    the bytes of the sampled files over the bytes read, with the finite-population
+    correction, and adds ``exact`` from files read in full.
+    """
+    if not clusters:
+        return exact, 0.0
+    n = len(clusters)
+    read = sum(c.size for c in clusters)
+    ratio = sum(values) / read
+    total = exact + ratio * sampled_bytes
+    if n < 2:
+        return total, 0.0
+    residual = sum((v - ratio * c.size) ** 2 for v, c in zip(values, clusters)) / (n - 1)
+    mean_size = read / n
+    variance = max(0.0, 1 - read / sampled_bytes) * residual / (n * mean_size**2)
+    return total, sampled_bytes * math.sqrt(variance)
+
+
+def _interval(total: float, se: float, floor: float) -> Interval:
+    # Lines seen in the sample are certain, so the interval never drops below them.
+    return Interval(total, max(floor, total - _Z95 * se), total + _Z95 * se)
+
+
+def estimate_source(
+    adapter: JsonlAdapter,
+    source: Path,
+    options: AdapterOptions | None = None,
+    sample_rate: float = DEFAULT_SAMPLE_RATE,
+    range_bytes: int = DEFAULT_RANGE_BYTES,
+) -> SourceEstimate:
+    """Estimate record, error and payload-type counts from evenly spaced byte ranges.
+
+    Ranges are spread over all files together (see ``_plan_ranges``). Sampled
+    lines go through the adapter's normal parse and filter path but are not
+    sorted or kept. A source too small to sample at ``sample_rate`` is read in
+    full and counted exactly.
+    """
+    if not 0 < sample_rate <= 1:
+        raise ValueError("sample_rate must be in (0, 1]")
+    opts = options or AdapterOptions()
+    paths = list(iter_jsonl_paths(source))
+    sizes = [path.stat().st_size for path in paths]
+    plan = _plan_ranges(sizes, sample_rate, range_bytes)
+    exact: list[_Cluster] = []
+    sampled: list[_Cluster] = []
+    sampled_bytes = 0 if plan is None else sum(sizes)
+    for idx, (path, size) in enumerate(zip(paths, sizes)):
+        with path.open("rb") as f:
+            if plan is None:
+                pieces = [(size, f.read().decode("utf-8", errors="replace").splitlines())]
+            else:
+                pieces = [(length, _read_range(f, start, length)) for start, length in plan[idx]]
+        for length, lines in pieces:
+            ctx = IngestContext(issues=IssueSink(sample_size=0))
+            cluster = _Cluster(size=length)
+            records = iter_jsonl_lines(lines, str(path), prefilter=raw_prefilter(opts, ctx))
+            for _, _, signal in adapter._iter_rows(records, opts, ctx):
+                cluster.payloads[signal.payload_type] = cluster.payloads.get(signal.payload_type, 0) + 1
+            cluster.records = sum(1 for line in lines if line.strip())
+            cluster.errors = ctx.issues.count
+            (exact if plan is None else sampled).append(cluster)
+
+    def estimate(value_of) -> Interval:  # type: ignore[no-untyped-def]
+        known = sum(value_of(c) for c in exact)
+        seen = known + sum(value_of(c) for c in sampled)
+        total, se = _total(sampled, known, sampled_bytes, [value_of(c) for c in sampled])
+        return _interval(total, se, seen)
+
+    records = estimate(lambda c: c.records)
+    errors = estimate(lambda c: c.errors)
+    names = {name for c in exact + sampled for name in c.payloads}
+    payloads = {name: estimate(lambda c, name=name: c.payloads.get(name, 0)) for name in names}
+
+    rate = errors.value / records.value if records.value else 0.0
+    # Linearized ratio: the spread of errors - rate * records, scaled by the record total.
+    _, se = _total(sampled, 0.0, sampled_bytes, [c.errors - rate * c.records for c in sampled])
+    rate_se = se / records.value if records.value else 0.0
+    error_rate = Interval(rate, max(0.0, rate - _Z95 * rate_se), min(1.0, rate + _Z95 * rate_se))
+
+    return SourceEstimate(
+        files=len(paths),
+        bytes_total=sum(sizes),
+        bytes_read=sum(c.size for c in exact + sampled),
+        ranges=len(exact) + len(sampled),
+        records=records,
+        errors=errors,
+        error_rate=error_rate,
+        payloads=payloads,
+    )
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+from metaspn_io.io_utils import iter_jsonl_paths, json_line
+from metaspn_io.timeutils import parse_timestamp
+from metaspn_io.writer import replace_jsonl
+
+
+def _decimal(value: Any) -> Decimal:
+    # Payload amounts are floats; going through str keeps their shortest repr exact.
+    return Decimal(str(value))
+
+
+def format_amount(value: Decimal) -> str:
+    return format(value.normalize(), "f") if value else "0"
+
+
+def _entry(signal: dict[str, Any]) -> dict[str, Any] | None:
+    payload = signal.get("payload") or {}
+    base = {"signal_id": signal["signal_id"], "timestamp": signal["timestamp"], "token_mint": payload["token_mint"]}
+    if signal.get("payload_type") == "HolderChangeSeen":
+        return {**base, "kind": "holder", "wallet": payload["wallet"], "delta": format_amount(_decimal(payload["delta"]))}
+    if signal.get("payload_type") == "SupplyChangeSeen":
+        return {**base, "kind": "supply", "new_supply": format_amount(_decimal(payload["new_supply"]))}
+    return None
+
+
+@dataclass
+class Holdings:
+    """Balances per ``(token_mint, wallet)`` and the last reported supply per mint."""
+
+    balances: dict[tuple[str, str], Decimal]
+    supply: dict[str, Decimal]
+
+    def apply(self, entry: dict[str, Any]) -> None:
+        if entry["kind"] == "holder":
+            key = (entry["token_mint"], entry["wallet"])
+            balance = self.balances.get(key, Decimal(0)) + Decimal(entry["delta"])
+            if balance:
+                self.balances[key] = balance
+            else:
+                self.balances.pop(key, None)
+        else:
+            self.supply[entry["token_mint"]] = Decimal(entry["new_supply"])
+
+    def holders(self, token_mint: str) -> dict[str, Decimal]:
+        return {wallet: balance for (mint, wallet), balance in self.balances.items() if mint == token_mint}
+
+
+@dataclass(frozen=True)
+class HolderUpdate:
+    applied: int
+    duplicates: int
+    days_rebuilt: int
+
+
+class HolderState:
+    """On-disk holder balances materialized from ``HolderChangeSeen`` / ``SupplyChangeSeen``.
+
+    ``<path>/deltas/<date>.jsonl`` journals every applied change of a UTC day, sorted
+    by ``(timestamp, signal_id)``; ``<path>/snapshots/<date>.jsonl`` holds all
+    non-zero balances and supplies at the end of that day. ``update`` journals only
+    signals whose ``signal_id`` is new for their day, then rebuilds snapshots from
+    the earliest touched day onward, starting from the snapshot before it. Amounts
+    are summed as ``Decimal`` so replay order cannot change a balance.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.deltas_dir = path / "deltas"
+        self.snapshots_dir = path / "snapshots"
+
+    def _days(self, directory: Path) -> list[str]:
+        if not directory.is_dir():
+            return []
+        return sorted(p.stem for p in directory.glob("*.jsonl") if not p.name.startswith("."))
+
+    def _read(self, path: Path) -> Iterator[dict[str, Any]]:
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+        except FileNotFoundError:
+            return
+
+    def _load_snapshot(self, day: str | None) -> Holdings:
+        holdings = Holdings(balances={}, supply={})
+        if day is None:
+            return holdings
+        for row in self._read(self.snapshots_dir / f"{day}.jsonl"):
+            if row["kind"] == "balance":
+                holdings.balances[(row["token_mint"], row["wallet"])] = Decimal(row["balance"])
+            else:
+                holdings.supply[row["token_mint"]] = Decimal(row["supply"])
+        return holdings
+
+    def _write_snapshot(self, day: str, holdings: Holdings) -> None:
+        rows = [
+            {"kind": "balance", "token_mint": mint, "wallet": wallet, "balance": format_amount(balance)}
+            for (mint, wallet), balance in sorted(holdings.balances.items())
+        ]
+        rows += [
+            {"kind": "supply", "token_mint": mint, "supply": format_amount(supply)}
+            for mint, supply in sorted(holdings.supply.items())
+        ]
+        replace_jsonl(self.snapshots_dir / f"{day}.jsonl", (json_line(row) for row in rows))
+
+    def update(self, signals: Iterable[dict[str, Any]]) -> HolderUpdate:
+        by_day: dict[str, list[dict[str, Any]]] = {}
+        for signal in signals:
+            entry = _entry(signal)
+            if entry is not None:
+                by_day.setdefault(str(entry["timestamp"])[:10], []).append(entry)
+
+        applied = duplicates = 0
+        touched: list[str] = []
+        for day, entries in sorted(by_day.items()):
+            journal = self.deltas_dir / f"{day}.jsonl"
+            existing = list(self._read(journal))
+            seen = {row["signal_id"] for row in existing}
+            fresh = []
+            for entry in entries:
+                if entry["signal_id"] in seen:
+                    duplicates += 1
+                    continue
+                seen.add(entry["signal_id"])
+                fresh.append(entry)
+            if not fresh:
+                continue
+            applied += len(fresh)
+            touched.append(day)
+            rows = sorted(existing + fresh, key=lambda row: (row["timestamp"], row["signal_id"]))
+            replace_jsonl(journal, (json_line(row) for row in rows))
+
+        if not touched:
+            return HolderUpdate(applied=applied, duplicates=duplicates, days_rebuilt=0)
+        start = touched[0]
+        earlier = [day for day in self._days(self.snapshots_dir) if day < start]
+        holdings = self._load_snapshot(earlier[-1] if earlier else None)
+        rebuild = [day for day in self._days(self.deltas_dir) if day >= start]
+        for day in rebuild:
+            for entry in self._read(self.deltas_dir / f"{day}.jsonl"):
+                holdings.apply(entry)
+            self._write_snapshot(day, holdings)
+        return HolderUpdate(applied=applied, duplicates=duplicates, days_rebuilt=len(rebuild))
+
+    def update_from(self, source: Path) -> HolderUpdate:
+        """Materialize from signal JSONL output (a file or a directory of ``*.jsonl``)."""
+
+        def signals() -> Iterator[dict[str, Any]]:
+            for path in iter_jsonl_paths(source):
+                yield from self._read(path)
+
+        return self.update(signals())
+
+    def at(self, when: str) -> Holdings:
+        """Holdings as of ``when``: a ``YYYY-MM-DD`` day (end of day) or a UTC timestamp.
+
+        Loads the nearest snapshot before the requested day and applies the journal
+        from there, stopping at ``when`` within its day.
+        """
+        cutoff: str | None = None
+        if len(when) > 10:
+            ts, _ = parse_timestamp(when)
+            cutoff = ts.strftime("%Y-%m-%dT%H:%M:%SZ")
+        day = cutoff[:10] if cutoff is not None else when
+        earlier = [d for d in self._days(self.snapshots_dir) if d < day or (d == day and cutoff is None)]
+        holdings = self._load_snapshot(earlier[-1] if earlier else None)
+        base = earlier[-1] if earlier else ""
+        for journal_day in self._days(self.deltas_dir):
+            if journal_day <= base or journal_day > day:
+                continue
+            for entry in self._read(self.deltas_dir / f"{journal_day}.jsonl"):
+                if cutoff is not None and entry["timestamp"] > cutoff:
+                    break
+                holdings.apply(entry)
+        return holdings
@@ -1,13 +1,50 @@
 from __future__ import annotations
 
+import sys
+from collections.abc import Iterator
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from typing import Any, TextIO
 
-from metaspn_io.adapters.base import AdapterOptions
+from metaspn_io.adapters.base import DEFAULT_REORDER_WINDOW, AdapterOptions, IngestContext, JsonlAdapter
 from metaspn_io.adapters.registry import AdapterRegistry
-from metaspn_io.io_utils import append_jsonl, write_jsonl
+from metaspn_io.estimate import DEFAULT_SAMPLE_RATE, SourceEstimate, estimate_source
+from metaspn_io.io_utils import json_line
+from metaspn_io.issues import DEFAULT_SAMPLE_SIZE, IssueSink
+from metaspn_io.memprof import MemoryProfile
+from metaspn_io.pipeline import DEFAULT_PIPELINE_QUEUE, Pipeline, iter_pipelined_signals
+from metaspn_io.predicates import Predicate, compile_predicate
+from metaspn_io.shards import write_shards
+from metaspn_io.sketches import DEFAULT_TOP_K, SignalSketches
+from metaspn_io.store import append_store, open_layout, store_lock
+from metaspn_io.tee import TeeSpec, write_tee
 from metaspn_io.timeutils import parse_timestamp
+from metaspn_io.writer import JsonlWriter, replace_jsonl
+
+
+# `--source -` reads stdin and `--out -` writes stdout.
+STREAM = Path("-")
+
+
+@dataclass(frozen=True)
+class SinkOptions:
+    """Outputs of ``run_ingest`` besides ``out`` and ``store``, and how they are written.
+
+    Every sink is off by default. ``durability`` applies to ``out``, ``store`` and
+    the files written next to ``out`` (shards and tees).
+    """
+
+    durability: str = "run"
+    partition_by: tuple[str, ...] | None = None
+    shards: int | None = None
+    shard_key: str = "entity"
+    tees: list[TeeSpec] | None = None
+    npz: Path | None = None
+    holders: Path | None = None
+    season_state: Path | None = None
+    sqlite_out: Path | None = None
+    sketch_out: Path | None = None
 
 
 @dataclass(frozen=True)
@@ -16,6 +53,7 @@ class IngestResult:
     errors: int
     output: Path | None
     error_log: Path | None
+    memory: MemoryProfile | None = None
 
 
 def _parse_range(value: str | None) -> datetime | None:
@@ -34,8 +72,8 @@ def _parse_date_window(day: str | None) -> tuple[datetime | None, datetime | Non
 
 
 def _resolve_output_path(out: Path | None, day: str | None) -> Path | None:
-    if out is None:
-        return None
+    if out is None or out == STREAM:
+        return out
     if day is None:
         return out
     if out.suffix == ".jsonl":
@@ -43,6 +81,32 @@ def _resolve_output_path(out: Path | None, day: str | None) -> Path | None:
     return out / f"{day}.jsonl"
 
 
+def _write_stream(sink: TextIO, lines: Iterator[str]) -> None:
+    for line in lines:
+        sink.write(line)
+    sink.flush()
+
+
+def _adapter_options(
+    day: str | None,
+    since: str | None,
+    until: str | None,
+    lenient: bool,
+    prefilter: bool,
+    types: list[str] | None,
+    where: str | Predicate | None,
+) -> AdapterOptions:
+    date_since, date_until = _parse_date_window(day)
+    return AdapterOptions(
+        since=_parse_range(since) or date_since,
+        until=_parse_range(until) or date_until,
+        lenient=lenient,
+        prefilter=prefilter,
+        types=None if types is None else frozenset(t.strip().lower() for t in types),
+        where=compile_predicate(where) if isinstance(where, str) else where,
+    )
+
+
 def run_ingest(
     registry: AdapterRegistry,
     adapter_name: str,
@@ -56,54 +120,222 @@ def run_ingest(
     stats: bool = False,
     lenient: bool = False,
     error_log_path: Path | None = None,
+    issue_sample_size: int | None = DEFAULT_SAMPLE_SIZE,
+    sinks: SinkOptions | None = None,
+    prefilter: bool = False,
+    types: list[str] | None = None,
+    where: str | Predicate | None = None,
+    cache: Path | None = None,
+    cache_max_bytes: int | None = None,
+    reorder_window: int = DEFAULT_REORDER_WINDOW,
+    memory_profile: str | None = None,
+    top_k: int = DEFAULT_TOP_K,
+    pipeline: bool = False,
+    pipeline_queue: int = DEFAULT_PIPELINE_QUEUE,
+    stdin: TextIO | None = None,
+    stdout: TextIO | None = None,
 ) -> IngestResult:
     adapter = registry.get(adapter_name)
-    date_since, date_until = _parse_date_window(day)
-    parsed_since = _parse_range(since)
-    parsed_until = _parse_range(until)
+    sinks = sinks or SinkOptions()
     resolved_out = _resolve_output_path(out, day)
 
-    options = AdapterOptions(
-        since=parsed_since or date_since,
-        until=parsed_until or date_until,
-        lenient=lenient,
+    error_log = error_log_path or Path("workspace/logs/ingest_errors.jsonl")
+    issues = IssueSink(path=None if dry_run else error_log, sample_size=issue_sample_size)
+    context = IngestContext(issues=issues)
+    options = _adapter_options(day, since, until, lenient, prefilter, types, where)
+
+    pipe = Pipeline(queue_size=pipeline_queue) if pipeline else None
+    profile = MemoryProfile(mode=memory_profile) if memory_profile else None
+    if profile is not None:
+        profile.start()
+
+    stream_out = resolved_out == STREAM
+    if source == STREAM:
+        if not isinstance(adapter, JsonlAdapter):
+            raise ValueError(f"adapter '{adapter_name}' cannot read from stdin")
+        produced: Iterator[dict[str, Any]] = (
+            sig.to_dict()
+            for sig in adapter.iter_stream_signals(
+                stdin or sys.stdin, options=options, context=context, window=reorder_window
+            )
+        )
+    elif cache is not None and isinstance(adapter, JsonlAdapter):
+        from metaspn_io.cache import DEFAULT_CACHE_BYTES, SignalCache
+
+        signal_cache = SignalCache(cache, max_bytes=cache_max_bytes or DEFAULT_CACHE_BYTES)
+        produced = signal_cache.iter_signals(adapter, source, options=options, context=context)
+    elif pipe is not None:
+        produced = iter_pipelined_signals(pipe, adapter, source, options, context)
+    else:
+        produced = (sig.to_dict() for sig in adapter.iter_signals(source, options=options, context=context))
+    if pipe is not None and (source == STREAM or cache is not None):
+        produced = pipe.source("signals", produced)
+
+    # With `--out -` signals are written as the adapter releases them and not kept.
+    sink = stdout or sys.stdout
+    # Pipelined, a plain `--out` is serialized and written on their own threads during the run.
+    writer_feed = None
+    if pipe is not None and not dry_run and resolved_out is not None and not sinks.shards and not sinks.tees:
+        writer_feed = pipe.channel("serialize")
+        lines = pipe.source("write", (json_line(signal) for signal in writer_feed))
+        if stream_out:
+            pipe.run("stdout", lambda: _write_stream(sink, lines))
+        else:
+            target = resolved_out
+            pipe.run("out", lambda: replace_jsonl(target, lines, durability=sinks.durability))
+    # --npz is fed from this loop in chunks; the list is kept only for sinks that take it whole.
+    arrays = None
+    if sinks.npz is not None and not dry_run:
+        from metaspn_io.arrays import TokenArrayBuilder
+
+        arrays = TokenArrayBuilder()
+    list_sinks = (
+        sinks.tees,
+        sinks.sqlite_out,
+        sinks.holders,
+        sinks.season_state,
+        store,
+        resolved_out is not None and writer_feed is None,
     )
+    keep = not stream_out and (dry_run or any(list_sinks))
+    signals: list[dict[str, Any]] = []
+    emitted = 0
+    by_payload: dict[str, int] = {}
+    sketches = SignalSketches(top_k=top_k) if stats or sinks.sketch_out is not None else None
+    try:
+        with issues:
+            for signal in produced:
+                emitted += 1
+                payload_type = str(signal["payload_type"])
+                by_payload[payload_type] = by_payload.get(payload_type, 0) + 1
+                if sketches is not None:
+                    sketches.update(signal)
+                if writer_feed is not None:
+                    writer_feed.put(signal)
+                if arrays is not None:
+                    arrays.add(signal)
+                if keep:
+                    signals.append(signal)
+                elif writer_feed is None and not dry_run:
+                    sink.write(json_line(signal))
+            if writer_feed is not None:
+                writer_feed.close()
+            elif stream_out:
+                sink.flush()
+    except BaseException:
+        if pipe is not None:
+            # A stage failure surfaces here as an abort; re-raise its original error.
+            pipe.close(abort=True)
+        raise
+    if pipe is not None:
+        pipe.close()
+    if not issues.count:
+        error_log = None
+    if profile is not None:
+        # The traced peak of this stage includes the adapter's sort buffer.
+        profile.mark("parse", buffered=len(signals))
 
-    signals = [sig.to_dict() for sig in adapter.iter_signals(source, options=options)]
-    issues = [issue.to_dict() for issue in getattr(adapter, "issues", [])]
+    if sketches is not None and sinks.sketch_out is not None and not dry_run:
+        sketches.save(sinks.sketch_out)
 
-    error_log = error_log_path
-    if error_log is None and issues:
-        error_log = Path("workspace/logs/ingest_errors.jsonl")
+    tee_counts: dict[Path, int] = {}
+    if not dry_run and not stream_out:
+        if resolved_out is not None and sinks.shards:
+            write_shards(resolved_out, signals, sinks.shards, shard_key=sinks.shard_key, durability=sinks.durability)
+        if sinks.tees:
+            full = None if sinks.shards else resolved_out
+            tee_counts = write_tee(signals, sinks.tees, out=full, durability=sinks.durability)
+        elif resolved_out is not None and not sinks.shards and writer_feed is None:
+            replace_jsonl(resolved_out, (json_line(signal) for signal in signals), durability=sinks.durability)
+        if sinks.sqlite_out is not None:
+            from metaspn_io.sqlite_sink import write_sqlite
 
-    if not dry_run:
-        if resolved_out is not None:
-            write_jsonl(resolved_out, signals)
+            write_sqlite(sinks.sqlite_out, signals)
+        if arrays is not None:
+            arrays.finish().save_npz(sinks.npz)
+        if sinks.holders is not None:
+            from metaspn_io.holders import HolderState
+
+            HolderState(sinks.holders).update(signals)
+        if sinks.season_state is not None:
+            from metaspn_io.seasons import SeasonAggregates
+
+            aggregates = SeasonAggregates.load(sinks.season_state)
+            aggregates.update(signals)
+            aggregates.save()
         if store is not None:
-            for signal in signals:
-                day = str(signal["timestamp"])[:10]
-                partition = store / "signals" / f"{day}.jsonl"
-                append_jsonl(partition, [signal])
-        if issues and error_log is not None:
-            append_jsonl(error_log, issues)
+            with store_lock(store):
+                layout = open_layout(store, sinks.partition_by)
+                with JsonlWriter(durability=sinks.durability) as writer:
+                    append_store(store, signals, writer, layout=layout)
+    if profile is not None:
+        profile.mark("sinks", buffered=len(signals))
+        profile.stop()
 
     if stats:
-        by_payload: dict[str, int] = {}
-        for sig in signals:
-            payload_type = str(sig["payload_type"])
-            by_payload[payload_type] = by_payload.get(payload_type, 0) + 1
-        print(f"adapter={adapter_name}")
-        print(f"source={source}")
-        print(f"emitted={len(signals)}")
-        print(f"errors={len(issues)}")
+        # Keep stdout clean for the signal stream.
+        report = sys.stderr if stream_out else sys.stdout
+        print(f"adapter={adapter_name}", file=report)
+        print(f"source={source}", file=report)
+        print(f"emitted={emitted}", file=report)
+        print(f"errors={issues.count}", file=report)
+        print(f"sort_path={context.sort_path}", file=report)
         for payload_type, count in sorted(by_payload.items()):
-            print(f"payload.{payload_type}={count}")
+            print(f"payload.{payload_type}={count}", file=report)
+        counters = ("prefiltered_window", "filtered_type", "filtered_where", "cache_hits", "cache_misses", "reorder_late")
+        for name in counters:
+            if name in context.counters:
+                print(f"{name}={context.counters[name]}", file=report)
+        if sketches is not None:
+            for line in sketches.report_lines():
+                print(line, file=report)
+        for message, count in sorted(issues.by_message.items()):
+            print(f"issues.message.{message.replace(' ', '_')}={count}", file=report)
+        for input_file, count in sorted(issues.by_file.items()):
+            print(f"issues.file.{input_file}={count}", file=report)
+        for spec in sinks.tees or []:
+            if spec.path in tee_counts:
+                print(f"tee.{spec.path}={tee_counts[spec.path]}", file=report)
         if error_log is not None:
-            print(f"error_log={error_log}")
+            print(f"error_log={error_log}", file=report)
+    if pipe is not None and stats:
+        for line in pipe.report_lines():
+            print(line, file=sys.stderr if stream_out else sys.stdout)
+    if profile is not None:
+        for line in profile.report_lines():
+            print(line, file=sys.stderr if stream_out else sys.stdout)
 
     return IngestResult(
-        emitted=len(signals),
-        errors=len(issues),
+        emitted=emitted,
+        errors=issues.count,
         output=resolved_out,
         error_log=error_log,
+        memory=profile,
     )
+
+
+def run_estimate(
+    registry: AdapterRegistry,
+    adapter_name: str,
+    source: Path,
+    day: str | None = None,
+    since: str | None = None,
+    until: str | None = None,
+    lenient: bool = False,
+    prefilter: bool = False,
+    types: list[str] | None = None,
+    where: str | Predicate | None = None,
+    sample_rate: float = DEFAULT_SAMPLE_RATE,
+) -> SourceEstimate:
+    """Print ``estimate.*`` stats extrapolated from a sample of ``source``; writes nothing."""
+    adapter = registry.get(adapter_name)
+    if not isinstance(adapter, JsonlAdapter):
+        raise ValueError(f"adapter '{adapter_name}' does not support --estimate")
+    options = _adapter_options(day, since, until, lenient, prefilter, types, where)
+    result = estimate_source(adapter, source, options=options, sample_rate=sample_rate)
+    print(f"adapter={adapter_name}")
+    print(f"source={source}")
+    print(f"sample_rate={sample_rate}")
+    for line in result.report_lines():
+        print(line)
+    return result
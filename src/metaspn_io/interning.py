@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from metaspn_io.models import EntityRef
+
+
+class Interner:
+    """Per-run intern table for repetitive strings and flyweight ``EntityRef`` objects.
+
+    Adapters pass chains, mints, wallets, platforms and similar values through the
+    table so buffered signals share one object per distinct value instead of one
+    per record. Tables live as long as the ``IngestContext`` that owns them, unlike
+    ``sys.intern``. ``enabled=False`` passes values through unchanged.
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self._strings: dict[str, str] = {}
+        self._refs: dict[tuple[str, str, str], EntityRef] = {}
+
+    def __call__(self, value: str) -> str:
+        if not self.enabled:
+            return value
+        return self._strings.setdefault(value, value)
+
+    def optional(self, value: str | None) -> str | None:
+        return None if value is None else self(value)
+
+    def entity_ref(self, kind: str, platform: str, identifier: str) -> EntityRef:
+        key = (kind, platform, identifier)
+        ref = self._refs.get(key) if self.enabled else None
+        if ref is None:
+            from metaspn_io.models import EntityRef
+
+            ref = EntityRef(kind=self(kind), platform=self(platform), identifier=self(identifier))
+            if self.enabled:
+                self._refs[key] = ref
+        return ref
+
+    def __len__(self) -> int:
+        return len(self._strings) + len(self._refs)
+
+
+# Shared pass-through table for ``_parse_record`` calls that bring no interner.
+NO_INTERNING = Interner(enabled=False)
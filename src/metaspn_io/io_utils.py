@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 import json
-from collections.abc import Iterator
-from dataclasses import dataclass
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from metaspn_io.timeutils import TimestampError, in_range, parse_timestamp
+
 
 @dataclass(frozen=True)
 class RawRecord:
@@ -30,6 +33,88 @@ class ParseIssue:
         }
 
 
+def _raw_string_field(line: str, key: str) -> str | None:
+    """Cheaply extract a top-level string value from a raw JSON line.
+
+    Returns ``None`` whenever the answer is not certain: the key is missing or
+    repeated, may be nested, or the value is not a plain escape-free string.
+    """
+    needle = f'"{key}"'
+    pos = line.find(needle)
+    if pos <= 0 or line.find(needle, pos + 1) != -1 or line[pos - 1] == "\\":
+        return None
+    prefix = line[:pos]
+    if prefix.count("{") != 1 or "}" in prefix or "[" in prefix:
+        return None
+    idx = pos + len(needle)
+    end = len(line)
+    while idx < end and line[idx] in " \t":
+        idx += 1
+    if idx >= end or line[idx] != ":":
+        return None
+    idx += 1
+    while idx < end and line[idx] in " \t":
+        idx += 1
+    if idx >= end or line[idx] != '"':
+        return None
+    close = line.find('"', idx + 1)
+    if close == -1:
+        return None
+    value = line[idx + 1 : close]
+    if "\\" in value:
+        return None
+    return value
+
+
+@dataclass
+class RawPrefilter:
+    """Opt-in filter applied to raw lines before (and, for types, after) JSON decoding.
+
+    A line is dropped before decoding only when the raw scan is certain: the line
+    is one complete object, and its top-level ``timestamp`` parses to a time
+    outside ``[since, until]`` or its ``type`` is not in ``types``. Anything
+    ambiguous, including truncated lines, is decoded and parsed as usual, so
+    malformed lines are still reported. ``types`` is enforced again on decoded
+    records, so results do not depend on what the raw scan could see.
+    """
+
+    since: datetime | None = None
+    until: datetime | None = None
+    types: frozenset[str] | None = None
+    counters: dict[str, int] = field(default_factory=dict)
+
+    def _count(self, name: str) -> None:
+        self.counters[name] = self.counters.get(name, 0) + 1
+
+    def rejects_line(self, line: str) -> bool:
+        text = line.strip()
+        if not (text.startswith("{") and text.endswith("}")):
+            return False
+        if self.types is not None:
+            typ = _raw_string_field(text, "type")
+            if typ is not None and typ.strip().lower() not in self.types:
+                self._count("filtered_type")
+                return True
+        if self.since is not None or self.until is not None:
+            raw_ts = _raw_string_field(text, "timestamp")
+            if raw_ts is None:
+                return False
+            try:
+                ts, _ = parse_timestamp(raw_ts)
+            except TimestampError:
+                return False
+            if not in_range(ts, self.since, self.until):
+                self._count("prefiltered_window")
+                return True
+        return False
+
+    def rejects_record(self, data: dict[str, Any]) -> bool:
+        if self.types is not None and str(data.get("type", "")).strip().lower() not in self.types:
+            self._count("filtered_type")
+            return True
+        return False
+
+
 def iter_jsonl_paths(source_path: Path) -> Iterator[Path]:
     if source_path.is_file():
         yield source_path
@@ -40,40 +125,93 @@ def iter_jsonl_paths(source_path: Path) -> Iterator[Path]:
             yield path
 
 
-def iter_jsonl_records(source_path: Path) -> Iterator[RawRecord | ParseIssue]:
-    for path in iter_jsonl_paths(source_path):
-        with path.open("r", encoding="utf-8") as f:
-            for idx, line in enumerate(f, start=1):
-                raw_line = line.rstrip("\n")
-                if not raw_line.strip():
-                    continue
+def is_time_sorted(path: Path, key: str = "timestamp") -> bool:
+    """Whether every record of a JSONL file is in non-decreasing ``key`` order.
+
+    Timestamps are read with a raw scan where possible and a decode otherwise.
+    Lines that are not JSON objects are ignored, since they never emit; a record
+    whose timestamp is missing or invalid makes the answer ``False``.
+    """
+    previous: datetime | None = None
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            raw_line = line.rstrip("\n")
+            if not raw_line.strip():
+                continue
+            raw_ts: Any = _raw_string_field(raw_line, key)
+            if raw_ts is None:
                 try:
                     parsed = json.loads(raw_line)
-                except json.JSONDecodeError as exc:
-                    yield ParseIssue(
-                        message=f"invalid json: {exc}",
-                        input_file=str(path),
-                        input_line_number=idx,
-                        raw_line=raw_line,
-                    )
+                except json.JSONDecodeError:
                     continue
                 if not isinstance(parsed, dict):
-                    yield ParseIssue(
-                        message="json line must be an object",
-                        input_file=str(path),
-                        input_line_number=idx,
-                        raw_line=raw_line,
-                    )
                     continue
-                yield RawRecord(data=parsed, input_file=str(path), input_line_number=idx)
+                raw_ts = parsed.get(key)
+                if not isinstance(raw_ts, str):
+                    return False
+            try:
+                ts, _ = parse_timestamp(raw_ts)
+            except TimestampError:
+                return False
+            if previous is not None and ts < previous:
+                return False
+            previous = ts
+    return True
+
+
+def iter_jsonl_records(
+    source_path: Path,
+    prefilter: RawPrefilter | None = None,
+) -> Iterator[RawRecord | ParseIssue]:
+    for path in iter_jsonl_paths(source_path):
+        with path.open("r", encoding="utf-8") as f:
+            yield from iter_jsonl_lines(f, str(path), prefilter=prefilter)
+
+
+def iter_jsonl_lines(
+    lines: Iterable[str],
+    input_file: str,
+    prefilter: RawPrefilter | None = None,
+    first_line: int = 1,
+) -> Iterator[RawRecord | ParseIssue]:
+    for idx, line in enumerate(lines, start=first_line):
+        raw_line = line.rstrip("\n")
+        if not raw_line.strip():
+            continue
+        if prefilter is not None and prefilter.rejects_line(raw_line):
+            continue
+        try:
+            parsed = json.loads(raw_line)
+        except json.JSONDecodeError as exc:
+            yield ParseIssue(
+                message=f"invalid json: {exc}",
+                input_file=input_file,
+                input_line_number=idx,
+                raw_line=raw_line,
+            )
+            continue
+        if not isinstance(parsed, dict):
+            yield ParseIssue(
+                message="json line must be an object",
+                input_file=input_file,
+                input_line_number=idx,
+                raw_line=raw_line,
+            )
+            continue
+        if prefilter is not None and prefilter.rejects_record(parsed):
+            continue
+        yield RawRecord(data=parsed, input_file=input_file, input_line_number=idx)
+
+
+def json_line(record: dict[str, Any]) -> str:
+    return json.dumps(record, separators=(",", ":"), sort_keys=True) + "\n"
 
 
 def write_jsonl(path: Path, records: list[dict[str, Any]]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     with path.open("w", encoding="utf-8") as f:
         for rec in records:
-            f.write(json.dumps(rec, separators=(",", ":"), sort_keys=True))
-            f.write("\n")
+            f.write(json_line(rec))
 
 
 def append_jsonl(path: Path, records: list[dict[str, Any]]) -> None:
@@ -82,5 +220,4 @@ def append_jsonl(path: Path, records: list[dict[str, Any]]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     with path.open("a", encoding="utf-8") as f:
         for rec in records:
-            f.write(json.dumps(rec, separators=(",", ":"), sort_keys=True))
-            f.write("\n")
+            f.write(json_line(rec))
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import IO, Any
+
+from metaspn_io.io_utils import ParseIssue
+
+DEFAULT_SAMPLE_SIZE = 100
+
+
+def issue_class(message: str) -> str:
+    """Group issue messages by their prefix, e.g. ``invalid json: ...`` -> ``invalid json``."""
+    return message.split(":", 1)[0].strip()
+
+
+class IssueSink:
+    """Stream parse issues to an error log while keeping only bounded state in memory.
+
+    Every issue is counted and written, but only the first ``sample_size`` issues of
+    each message class keep their ``raw_line``; later ones are logged with ``raw_line``
+    set to ``None``. ``sample_size=None`` keeps every raw line.
+    """
+
+    def __init__(self, path: Path | None = None, sample_size: int | None = DEFAULT_SAMPLE_SIZE) -> None:
+        self.path = path
+        self.sample_size = sample_size
+        self.count = 0
+        self.by_message: dict[str, int] = {}
+        self.by_file: dict[str, int] = {}
+        self.samples: list[ParseIssue] = []
+        self._handle: IO[str] | None = None
+
+    def append(self, issue: ParseIssue) -> None:
+        self.count += 1
+        cls = issue_class(issue.message)
+        seen = self.by_message.get(cls, 0)
+        self.by_message[cls] = seen + 1
+        self.by_file[issue.input_file] = self.by_file.get(issue.input_file, 0) + 1
+
+        sampled = self.sample_size is None or seen < self.sample_size
+        if sampled:
+            self.samples.append(issue)
+        if self.path is None:
+            return
+
+        record: dict[str, Any] = issue.to_dict()
+        if not sampled:
+            record["raw_line"] = None
+        if self._handle is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._handle = self.path.open("a", encoding="utf-8")
+        self._handle.write(json.dumps(record, separators=(",", ":"), sort_keys=True))
+        self._handle.write("\n")
+
+    def replay(self, input_file: str, samples: list[ParseIssue], by_message: dict[str, int]) -> None:
+        """Add one file's issues from a summary: ``samples`` as usual, the rest of each class as counts.
+
+        Issues that were not sampled are counted but not written to the error log.
+        """
+        for issue in samples:
+            self.append(issue)
+        for cls, total in by_message.items():
+            extra = total - sum(issue_class(issue.message) == cls for issue in samples)
+            if extra > 0:
+                self.count += extra
+                self.by_message[cls] = self.by_message.get(cls, 0) + extra
+                self.by_file[input_file] = self.by_file.get(input_file, 0) + extra
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __enter__(self) -> IssueSink:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
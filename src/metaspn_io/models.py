@@ -1,11 +1,15 @@
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass, is_dataclass
+import importlib.util
+from dataclasses import asdict, dataclass, fields, is_dataclass
 from datetime import datetime
 from typing import Any
 
 SCHEMA_VERSION = "0.1"
 
+# Probe once: each failed `from metaspn_schemas import ...` rescans sys.path.
+_HAS_SCHEMAS = importlib.util.find_spec("metaspn_schemas") is not None
+
 
 @dataclass(frozen=True)
 class EntityRef:
@@ -26,6 +30,8 @@ class TraceContext:
 
 
 try:
+    if not _HAS_SCHEMAS:
+        raise ImportError("metaspn_schemas is not installed")
     from metaspn_schemas import (  # type: ignore[attr-defined]
         MeetingBooked,
         MessageSent,
@@ -79,6 +85,8 @@ except Exception:
         currency: str = "USD"
 
 try:
+    if not _HAS_SCHEMAS:
+        raise ImportError("metaspn_schemas is not installed")
     from metaspn_schemas import (  # type: ignore[attr-defined]
         HolderChangeSeen,
         LiquidityEventSeen,
@@ -164,6 +172,8 @@ except Exception:
 
 
 try:
+    if not _HAS_SCHEMAS:
+        raise ImportError("metaspn_schemas is not installed")
     from metaspn_schemas import (  # type: ignore[attr-defined]
         SeasonEnded,
         SeasonGameCreated,
@@ -237,7 +247,7 @@ class SignalEnvelope:
     def to_dict(self) -> dict[str, Any]:
         payload_obj = self.payload
         if is_dataclass(payload_obj):
-            payload_obj = asdict(payload_obj)
+            payload_obj = _asdict(payload_obj)
 
         return {
             "schema_version": self.schema_version,
@@ -246,11 +256,26 @@ class SignalEnvelope:
             "source": self.source,
             "payload_type": self.payload_type,
             "payload": payload_obj,
-            "entity_refs": [asdict(ref) for ref in self.entity_refs],
-            "trace": asdict(self.trace),
+            "entity_refs": [_asdict(ref) for ref in self.entity_refs],
+            "trace": _asdict(self.trace),
         }
 
 
+_FIELD_NAMES: dict[type, tuple[str, ...]] = {}
+_SCALARS = frozenset((str, int, float, bool, type(None)))
+
+
+def _asdict(obj: Any) -> dict[str, Any]:
+    """``asdict`` without its recursive deep copy when every field holds a scalar."""
+    names = _FIELD_NAMES.get(type(obj))
+    if names is None:
+        names = _FIELD_NAMES[type(obj)] = tuple(f.name for f in fields(obj))
+    values = {name: getattr(obj, name) for name in names}
+    if all(type(value) in _SCALARS for value in values.values()):
+        return values
+    return asdict(obj)
+
+
 PAYLOAD_TYPES: dict[str, type] = {
     "SocialPostSeen": SocialPostSeen,
     "ProfileSnapshotSeen": ProfileSnapshotSeen,
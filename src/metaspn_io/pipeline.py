@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from metaspn_io.adapters.base import Adapter, AdapterOptions, IngestContext
+
+DEFAULT_PIPELINE_QUEUE = 8
+DEFAULT_PIPELINE_BATCH = 1024
+_POLL = 0.1
+
+
+class _End:
+    pass
+
+
+_END = _End()
+
+
+class _Aborted(Exception):
+    """Raised in pipeline threads once another stage has failed."""
+
+
+@dataclass
+class QueueStats:
+    """Depth and wait times of one queue.
+
+    Producers waiting on a full queue (``put_wait``) mean the consumer is the
+    bottleneck; a consumer waiting on an empty one (``get_wait``) means the producer is.
+    """
+
+    name: str
+    capacity: int
+    batches: int = 0
+    max_depth: int = 0
+    depth_total: int = 0
+    put_wait: float = 0.0
+    get_wait: float = 0.0
+
+    @property
+    def mean_depth(self) -> float:
+        return self.depth_total / self.batches if self.batches else 0.0
+
+
+class Channel:
+    """Bounded FIFO of item batches between two pipeline threads."""
+
+    def __init__(self, name: str, capacity: int, batch_size: int, stop: threading.Event) -> None:
+        self.stats = QueueStats(name=name, capacity=capacity)
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=capacity)
+        self._batch: list[Any] = []
+        self._batch_size = batch_size
+        self._stop = stop
+
+    def _put(self, entry: Any) -> None:
+        started = time.perf_counter()
+        while True:
+            try:
+                self._queue.put(entry, timeout=_POLL)
+                break
+            except queue.Full:
+                if self._stop.is_set():
+                    raise _Aborted from None
+        self.stats.put_wait += time.perf_counter() - started
+        depth = self._queue.qsize()
+        self.stats.batches += 1
+        self.stats.depth_total += depth
+        self.stats.max_depth = max(self.stats.max_depth, depth)
+
+    def put(self, item: Any) -> None:
+        self._batch.append(item)
+        if len(self._batch) >= self._batch_size:
+            self._put(self._batch)
+            self._batch = []
+
+    def close(self) -> None:
+        if self._batch:
+            self._put(self._batch)
+            self._batch = []
+        self._put(_END)
+
+    def fail(self, exc: BaseException) -> None:
+        self._put(exc)
+
+    def __iter__(self) -> Iterator[Any]:
+        while True:
+            started = time.perf_counter()
+            while True:
+                try:
+                    entry = self._queue.get(timeout=_POLL)
+                    break
+                except queue.Empty:
+                    if self._stop.is_set():
+                        raise _Aborted from None
+            self.stats.get_wait += time.perf_counter() - started
+            if entry is _END:
+                return
+            if isinstance(entry, BaseException):
+                raise entry
+            yield from entry
+
+
+class Pipeline:
+    """Threads connected by bounded queues of batches.
+
+    Each stage runs on its own thread and hands batches of ``batch_size`` items to
+    the next through a queue holding at most ``queue_size`` batches. Every queue
+    has one producer and one consumer, so item order is preserved end to end. An
+    exception in any stage stops the others and is re-raised by ``close``.
+    """
+
+    def __init__(self, queue_size: int = DEFAULT_PIPELINE_QUEUE, batch_size: int = DEFAULT_PIPELINE_BATCH) -> None:
+        if queue_size < 1 or batch_size < 1:
+            raise ValueError("queue_size and batch_size must be positive")
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.channels: list[Channel] = []
+        self._threads: list[threading.Thread] = []
+        self._errors: list[BaseException] = []
+        self._stop = threading.Event()
+
+    def channel(self, name: str) -> Channel:
+        """A queue fed by the calling thread; ``close`` it once every item is put."""
+        channel = Channel(name, self.queue_size, self.batch_size, self._stop)
+        self.channels.append(channel)
+        return channel
+
+    def source(self, name: str, items: Iterable[Any]) -> Iterator[Any]:
+        """Consume ``items`` on a new thread; the returned iterator yields them in order."""
+        channel = self.channel(name)
+
+        def produce() -> None:
+            try:
+                for item in items:
+                    channel.put(item)
+                channel.close()
+            except _Aborted:
+                pass
+            except BaseException as exc:
+                self._errors.append(exc)
+                try:
+                    channel.fail(exc)
+                except _Aborted:
+                    pass
+                self._stop.set()
+
+        self._start(name, produce)
+        return iter(channel)
+
+    def run(self, name: str, target: Callable[[], Any]) -> None:
+        """Run ``target`` on a new thread; a failure stops the pipeline."""
+
+        def consume() -> None:
+            try:
+                target()
+            except _Aborted:
+                pass
+            except BaseException as exc:
+                self._errors.append(exc)
+                self._stop.set()
+
+        self._start(name, consume)
+
+    def _start(self, name: str, target: Callable[[], None]) -> None:
+        thread = threading.Thread(target=target, name=f"metaspn-{name}", daemon=True)
+        self._threads.append(thread)
+        thread.start()
+
+    def close(self, abort: bool = False) -> None:
+        """Wait for every stage, re-raising the first stage error.
+
+        Call with ``abort=True`` when the calling thread fails: the stages are
+        stopped first, and a stage error that caused the failure takes precedence.
+        """
+        if abort:
+            self._stop.set()
+        for thread in self._threads:
+            thread.join()
+        if self._errors:
+            raise self._errors[0]
+
+    def report_lines(self) -> list[str]:
+        lines = []
+        for channel in self.channels:
+            stats = channel.stats
+            prefix = f"pipeline.queue.{stats.name}"
+            lines += [
+                f"{prefix}.batches={stats.batches}",
+                f"{prefix}.max_depth={stats.max_depth}/{stats.capacity}",
+                f"{prefix}.mean_depth={stats.mean_depth:.2f}",
+                f"{prefix}.put_wait_s={stats.put_wait:.3f}",
+                f"{prefix}.get_wait_s={stats.get_wait:.3f}",
+            ]
+        return lines
+
+
+def iter_pipelined_signals(
+    pipeline: Pipeline,
+    adapter: Adapter,
+    source: Path,
+    options: AdapterOptions,
+    context: IngestContext,
+) -> Iterator[dict[str, Any]]:
+    """``adapter.iter_signals`` as dicts, produced on the ``signals`` thread.
+
+    Reading is deliberately not a stage of its own: the adapter chooses between
+    merging and sorting from the files themselves, so reading, parsing and
+    sorting all run inside ``iter_signals`` on this one thread, and only
+    serialization and writing overlap with them.
+    """
+    signals = adapter.iter_signals(source, options=options, context=context)
+    return pipeline.source("signals", (signal.to_dict() for signal in signals))
@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+# Grammar (keywords are case-insensitive):
+#   expr       := and_expr ("or" and_expr)*
+#   and_expr   := not_expr ("and" not_expr)*
+#   not_expr   := "not" not_expr | "(" expr ")" | comparison
+#   comparison := field op value | field ["not"] "in" set
+#   op         := "==" | "=" | "!=" | ">" | ">=" | "<" | "<="
+#   value      := number | 'string' | "string" | bareword
+#   set        := "[" value ("," value)* "]" | @path   (one value per line, '#' comments)
+# Fields name keys of the raw input record; dots reach into nested objects.
+# Set members that look like numbers also match numerically, as "=" does.
+
+_NUMBER = r"-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?"
+_TOKEN = re.compile(
+    rf"""\s*(?:
+        (?P<number>{_NUMBER})(?![\w.])
+      | (?P<string>'[^']*'|"[^"]*")
+      | (?P<file>@[^\s()]+)
+      | (?P<op>==|!=|>=|<=|=|>|<)
+      | (?P<punct>[()\[\],])
+      | (?P<word>[A-Za-z_$][\w.$-]*)
+    )""",
+    re.VERBOSE,
+)
+
+_NUMBER_LITERAL = re.compile(_NUMBER)
+
+Matcher = Callable[[dict[str, Any]], bool]
+
+
+class PredicateError(ValueError):
+    pass
+
+
+def _tokenize(text: str) -> list[tuple[str, str]]:
+    tokens: list[tuple[str, str]] = []
+    pos = 0
+    while pos < len(text):
+        if text[pos:].strip() == "":
+            break
+        match = _TOKEN.match(text, pos)
+        if match is None:
+            raise PredicateError(f"unexpected input at position {pos}: {text[pos:pos + 20]!r}")
+        kind = match.lastgroup or ""
+        tokens.append((kind, match.group(kind)))
+        pos = match.end()
+    return tokens
+
+
+def _lookup(data: dict[str, Any], field: str) -> Any:
+    value: Any = data
+    for part in field.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def _as_number(value: Any) -> float | None:
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(str(value))
+    except ValueError:
+        return None
+
+
+def _as_text(value: Any) -> str:
+    # JSON spells booleans lowercase, so `flag = true` matches a decoded True.
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _compare(field: str, op: str, literal: str | float) -> Matcher:
+    if isinstance(literal, float):
+        tests = {
+            "==": lambda a: a == literal,
+            "!=": lambda a: a != literal,
+            ">": lambda a: a > literal,
+            ">=": lambda a: a >= literal,
+            "<": lambda a: a < literal,
+            "<=": lambda a: a <= literal,
+        }
+        test = tests[op]
+
+        def numeric(data: dict[str, Any]) -> bool:
+            number = _as_number(_lookup(data, field))
+            return number is not None and test(number)
+
+        return numeric
+
+    text_tests = {
+        "==": lambda a: a == literal,
+        "!=": lambda a: a != literal,
+        ">": lambda a: a > literal,
+        ">=": lambda a: a >= literal,
+        "<": lambda a: a < literal,
+        "<=": lambda a: a <= literal,
+    }
+    text_test = text_tests[op]
+
+    def textual(data: dict[str, Any]) -> bool:
+        value = _lookup(data, field)
+        return value is not None and text_test(_as_text(value))
+
+    return textual
+
+
+def _membership(field: str, members: list[str | float], negate: bool) -> Matcher:
+    texts = frozenset(m for m in members if isinstance(m, str))
+    numbers = frozenset(m for m in members if isinstance(m, float))
+
+    def contains(data: dict[str, Any]) -> bool:
+        value = _lookup(data, field)
+        if value is None:
+            return False
+        found = _as_text(value) in texts
+        if not found and numbers:
+            number = _as_number(value)
+            found = number is not None and number in numbers
+        return found != negate
+
+    return contains
+
+
+class _Parser:
+    def __init__(self, text: str, base_dir: Path | None) -> None:
+        self.tokens = _tokenize(text)
+        self.pos = 0
+        self.base_dir = base_dir
+        self.files: list[str] = []
+
+    def peek(self) -> tuple[str, str] | None:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def keyword(self, word: str) -> bool:
+        token = self.peek()
+        if token is not None and token[0] == "word" and token[1].lower() == word:
+            self.pos += 1
+            return True
+        return False
+
+    def expect(self, kind: str, value: str | None = None) -> str:
+        token = self.peek()
+        if token is None or token[0] != kind or (value is not None and token[1] != value):
+            found = "end of expression" if token is None else repr(token[1])
+            raise PredicateError(f"expected {value or kind}, found {found}")
+        self.pos += 1
+        return token[1]
+
+    def parse(self) -> Matcher:
+        matcher = self.parse_or()
+        if self.peek() is not None:
+            raise PredicateError(f"unexpected {self.peek()[1]!r}")  # type: ignore[index]
+        return matcher
+
+    def parse_or(self) -> Matcher:
+        parts = [self.parse_and()]
+        while self.keyword("or"):
+            parts.append(self.parse_and())
+        if len(parts) == 1:
+            return parts[0]
+        return lambda data: any(part(data) for part in parts)
+
+    def parse_and(self) -> Matcher:
+        parts = [self.parse_not()]
+        while self.keyword("and"):
+            parts.append(self.parse_not())
+        if len(parts) == 1:
+            return parts[0]
+        return lambda data: all(part(data) for part in parts)
+
+    def parse_not(self) -> Matcher:
+        if self.keyword("not"):
+            inner = self.parse_not()
+            return lambda data: not inner(data)
+        token = self.peek()
+        if token == ("punct", "("):
+            self.pos += 1
+            inner = self.parse_or()
+            self.expect("punct", ")")
+            return inner
+        return self.parse_comparison()
+
+    def parse_comparison(self) -> Matcher:
+        field = self.expect("word")
+        if self.keyword("not"):
+            if not self.keyword("in"):
+                raise PredicateError(f"expected 'in' after '{field} not'")
+            return _membership(field, self.parse_set(), negate=True)
+        if self.keyword("in"):
+            return _membership(field, self.parse_set(), negate=False)
+        op = self.expect("op")
+        return _compare(field, "==" if op == "=" else op, self.parse_value())
+
+    def parse_value(self) -> str | float:
+        token = self.peek()
+        if token is None:
+            raise PredicateError("expected a value, found end of expression")
+        kind, text = token
+        self.pos += 1
+        if kind == "number":
+            return float(text)
+        if kind == "string":
+            return text[1:-1]
+        if kind == "word":
+            return text
+        raise PredicateError(f"expected a value, found {text!r}")
+
+    def parse_set(self) -> list[str | float]:
+        token = self.peek()
+        if token is not None and token[0] == "file":
+            self.pos += 1
+            path = Path(token[1][1:])
+            if self.base_dir is not None and not path.is_absolute():
+                path = self.base_dir / path
+            try:
+                lines = path.read_text(encoding="utf-8").splitlines()
+            except OSError as exc:
+                raise PredicateError(f"cannot read {path}: {exc}") from exc
+            self.files.append("\n".join(lines))
+            members: list[str | float] = []
+            for line in lines:
+                member = line.strip()
+                if member and not member.startswith("#"):
+                    members.append(member)
+                    if _NUMBER_LITERAL.fullmatch(member):
+                        members.append(float(member))
+            return members
+        self.expect("punct", "[")
+        members = [self.parse_value()]
+        while self.peek() == ("punct", ","):
+            self.pos += 1
+            members.append(self.parse_value())
+        self.expect("punct", "]")
+        return members
+
+
+class Predicate:
+    """Compiled ``--where`` expression evaluated against raw input records.
+
+    Comparisons against numbers coerce the field to a number; all other
+    comparisons use the field's string form, with booleans spelled ``true`` and
+    ``false`` as in JSON. Missing fields never match.
+    ``fingerprint`` covers the expression and the contents of any ``@file`` sets.
+    """
+
+    def __init__(self, expression: str, base_dir: Path | None = None) -> None:
+        self.expression = expression
+        parser = _Parser(expression, base_dir)
+        self._matcher = parser.parse()
+        digest = hashlib.sha256(expression.encode("utf-8"))
+        for contents in parser.files:
+            digest.update(b"\0" + contents.encode("utf-8"))
+        self.fingerprint = digest.hexdigest()
+
+    def __call__(self, data: dict[str, Any]) -> bool:
+        return self._matcher(data)
+
+    def __repr__(self) -> str:
+        return f"Predicate({self.expression!r})"
+
+
+def compile_predicate(expression: str, base_dir: Path | None = None) -> Predicate:
+    return Predicate(expression, base_dir=base_dir)
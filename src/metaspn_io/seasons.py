@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+from metaspn_io.holders import format_amount
+from metaspn_io.io_utils import iter_jsonl_paths
+from metaspn_io.writer import _fsync_dir
+
+AGGREGATES_FILE = "aggregates.json"
+SEEN_DIR = "seen"
+
+# payload type -> (total field, counter field, payload field naming the account)
+SEASON_PAYLOAD_TYPES: dict[str, tuple[str, str, str]] = {
+    "SeasonStakeRecorded": ("staked", "stakes", "wallet"),
+    "SeasonRewardDistributed": ("distributed", "distributions", "pool"),
+    "SeasonRewardClaimed": ("claimed", "claims", "wallet"),
+}
+
+
+@dataclass
+class SeasonTotals:
+    staked: Decimal = Decimal(0)
+    distributed: Decimal = Decimal(0)
+    claimed: Decimal = Decimal(0)
+    stakes: int = 0
+    distributions: int = 0
+    claims: int = 0
+
+    def add(self, other: SeasonTotals) -> None:
+        self.staked += other.staked
+        self.distributed += other.distributed
+        self.claimed += other.claimed
+        self.stakes += other.stakes
+        self.distributions += other.distributions
+        self.claims += other.claims
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "staked": format_amount(self.staked),
+            "distributed": format_amount(self.distributed),
+            "claimed": format_amount(self.claimed),
+            "stakes": self.stakes,
+            "distributions": self.distributions,
+            "claims": self.claims,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> SeasonTotals:
+        return cls(
+            staked=Decimal(data["staked"]),
+            distributed=Decimal(data["distributed"]),
+            claimed=Decimal(data["claimed"]),
+            stakes=int(data["stakes"]),
+            distributions=int(data["distributions"]),
+            claims=int(data["claims"]),
+        )
+
+
+@dataclass(frozen=True)
+class AggregateUpdate:
+    applied: int
+    duplicates: int
+
+
+@dataclass
+class SeasonAggregates:
+    """Running Season 1 totals per ``(season_id, game_id, account)``.
+
+    The account is the staking or claiming wallet, or the pool a reward was
+    distributed from. Totals are ``Decimal`` sums. Like the holder journal,
+    ``signal_id`` is deduplicated within its UTC day: ``<path>/seen/<date>.txt``
+    lists the IDs applied for that day, one per line, and only days a batch
+    touches are read. Feeding overlapping batches (or replaying everything from
+    scratch) therefore yields the same totals without holding every ID in memory.
+
+    ``save`` appends new IDs to their day files, then atomically replaces
+    ``aggregates.json``, which records how many bytes of each day file are
+    committed; bytes past that (from a crash in between) are ignored and cut off.
+    """
+
+    path: Path
+    rows: dict[tuple[str, str, str], SeasonTotals] = field(default_factory=dict)
+    _committed: dict[str, int] = field(default_factory=dict, repr=False)
+    _seen: dict[str, set[str]] = field(default_factory=dict, repr=False)
+    _pending: dict[str, list[str]] = field(default_factory=dict, repr=False)
+    _games: dict[tuple[str, str], SeasonTotals] = field(default_factory=dict, repr=False)
+    _wallets: dict[tuple[str, str], SeasonTotals] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def load(cls, path: Path) -> SeasonAggregates:
+        aggregates = cls(path=path)
+        try:
+            state = json.loads((path / AGGREGATES_FILE).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return aggregates
+        aggregates._committed = {day: int(size) for day, size in state["seen"].items()}
+        for row in state["rows"]:
+            aggregates._add((row["season_id"], row["game_id"], row["account"]), SeasonTotals.from_dict(row))
+        return aggregates
+
+    def _seen_path(self, day: str) -> Path:
+        return self.path / SEEN_DIR / f"{day}.txt"
+
+    def _seen_on(self, day: str) -> set[str]:
+        seen = self._seen.get(day)
+        if seen is None:
+            size = self._committed.get(day, 0)
+            data = b""
+            if size:
+                with self._seen_path(day).open("rb") as f:
+                    data = f.read(size)
+            seen = self._seen[day] = set(data.decode("utf-8").split())
+        return seen
+
+    def _add(self, key: tuple[str, str, str], totals: SeasonTotals) -> None:
+        season_id, game_id, account = key
+        self.rows.setdefault(key, SeasonTotals()).add(totals)
+        self._games.setdefault((season_id, game_id), SeasonTotals()).add(totals)
+        self._wallets.setdefault((season_id, account), SeasonTotals()).add(totals)
+
+    def update(self, signals: Iterable[dict[str, Any]]) -> AggregateUpdate:
+        applied = duplicates = 0
+        for signal in signals:
+            spec = SEASON_PAYLOAD_TYPES.get(str(signal.get("payload_type")))
+            if spec is None:
+                continue
+            day = str(signal["timestamp"])[:10]
+            seen = self._seen_on(day)
+            if signal["signal_id"] in seen:
+                duplicates += 1
+                continue
+            seen.add(signal["signal_id"])
+            self._pending.setdefault(day, []).append(signal["signal_id"])
+            total_field, count_field, account_field = spec
+            payload = signal["payload"]
+            delta = SeasonTotals()
+            setattr(delta, total_field, Decimal(str(payload["amount"])))
+            setattr(delta, count_field, 1)
+            self._add((payload["season_id"], payload["game_id"], payload[account_field]), delta)
+            applied += 1
+        return AggregateUpdate(applied=applied, duplicates=duplicates)
+
+    def update_from(self, source: Path) -> AggregateUpdate:
+        """Apply signal JSONL output (a file or a directory of ``*.jsonl``)."""
+
+        def signals() -> Iterator[dict[str, Any]]:
+            for path in iter_jsonl_paths(source):
+                with path.open("r", encoding="utf-8") as f:
+                    for line in f:
+                        if line.strip():
+                            yield json.loads(line)
+
+        return self.update(signals())
+
+    def game(self, season_id: str, game_id: str) -> SeasonTotals:
+        return self._games.get((season_id, game_id), SeasonTotals())
+
+    def wallet(self, season_id: str, account: str) -> SeasonTotals:
+        return self._wallets.get((season_id, account), SeasonTotals())
+
+    def get(self, season_id: str, game_id: str, account: str) -> SeasonTotals:
+        return self.rows.get((season_id, game_id, account), SeasonTotals())
+
+    def export(self) -> Iterator[dict[str, Any]]:
+        """Rows sorted by ``(season_id, game_id, account)``."""
+        for (season_id, game_id, account), totals in sorted(self.rows.items()):
+            yield {"season_id": season_id, "game_id": game_id, "account": account, **totals.to_dict()}
+
+    def save(self) -> None:
+        committed = dict(self._committed)
+        if self._pending:
+            (self.path / SEEN_DIR).mkdir(parents=True, exist_ok=True)
+        for day, ids in sorted(self._pending.items()):
+            data = "".join(f"{signal_id}\n" for signal_id in ids).encode("utf-8")
+            with self._seen_path(day).open("ab") as f:
+                # Drop IDs a crashed save appended but never committed.
+                f.truncate(committed.get(day, 0))
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            committed[day] = committed.get(day, 0) + len(data)
+        if self._pending:
+            _fsync_dir(self.path / SEEN_DIR)
+
+        state = {"version": 2, "rows": list(self.export()), "seen": committed}
+        target = self.path / AGGREGATES_FILE
+        tmp = target.with_name(f".{target.name}.tmp")
+        self.path.mkdir(parents=True, exist_ok=True)
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(state, f, separators=(",", ":"), sort_keys=True)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, target)
+        _fsync_dir(self.path)
+        self._committed = committed
+        self._pending = {}
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import json
+import queue
+import socket
+import socketserver
+import threading
+from collections.abc import Iterable
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from metaspn_io.adapters.base import AdapterOptions, IngestContext
+from metaspn_io.adapters.registry import AdapterRegistry
+from metaspn_io.io_utils import ParseIssue, iter_jsonl_lines, json_line
+from metaspn_io.issues import IssueSink
+from metaspn_io.store import StoreLayout, group_by_partition, open_layout, store_lock
+from metaspn_io.writer import JsonlWriter
+
+DEFAULT_QUEUE_SIZE = 64
+DEFAULT_MAX_BATCH_LINES = 100_000
+DEFAULT_PUT_TIMEOUT = 30.0
+DEFAULT_COMMIT_TIMEOUT = 60.0
+
+# Wire protocol: the client sends one JSON header line
+# (`{"adapter": "...", "lenient": false}`), then the raw JSONL batch, then
+# half-closes its side. The server replies with one JSON line once the batch
+# has been committed to the store, or with `{"ok": false, "error": ...}`.
+
+
+@dataclass
+class _Batch:
+    signals: list[dict[str, Any]]
+    issues: list[ParseIssue]
+    done: threading.Event = field(default_factory=threading.Event)
+    error: str | None = None
+
+
+class _StoreWriter(threading.Thread):
+    """Single writer thread that group-commits queued batches into the store.
+
+    The first failed commit marks the writer unhealthy (``failure``): that group
+    and every batch queued after it are answered with the error instead of being
+    written, since the store may be left with part of a group.
+    """
+
+    def __init__(
+        self,
+        store: Path,
+        error_log: Path | None,
+        batches: queue.Queue[_Batch | None],
+        max_group: int,
+        durability: str,
+        layout: StoreLayout,
+    ) -> None:
+        super().__init__(name="metaspn-store-writer", daemon=True)
+        self.store = store
+        self.layout = layout
+        # commit() is driven by the group loop, never by buffered line counts.
+        self.writer = JsonlWriter(durability=durability, commit_lines=2**62)
+        self.error_log = error_log
+        self.batches = batches
+        self.max_group = max_group
+        self.commits = 0
+        self.failure: str | None = None
+
+    def run(self) -> None:
+        while True:
+            first = self.batches.get()
+            if first is None:
+                self._close()
+                return
+            group = [first]
+            stop = False
+            while len(group) < self.max_group:
+                try:
+                    item = self.batches.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                group.append(item)
+            try:
+                if self.failure is None:
+                    self._commit(group)
+            except Exception as exc:
+                self.failure = f"store write failed: {exc}"
+            finally:
+                for batch in group:
+                    batch.error = self.failure
+                    batch.done.set()
+            if stop:
+                self._close()
+                return
+
+    def _close(self) -> None:
+        try:
+            self.writer.close()
+        except Exception:
+            if self.failure is None:
+                raise
+
+    def _commit(self, group: list[_Batch]) -> None:
+        signals = (sig for batch in group for sig in batch.signals)
+        self.writer.write_many(group_by_partition(self.store, signals, layout=self.layout))
+        self.writer.commit()
+        issues = [issue for batch in group for issue in batch.issues]
+        if issues and self.error_log is not None:
+            self.error_log.parent.mkdir(parents=True, exist_ok=True)
+            with self.error_log.open("a", encoding="utf-8") as f:
+                f.write("".join(json_line(issue.to_dict()) for issue in issues))
+        self.commits += 1
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: IngestServer
+
+    def handle(self) -> None:
+        try:
+            reply = self.server.ingest_batch(self.rfile)
+        except Exception as exc:  # report to the client instead of dropping the connection
+            reply = {"ok": False, "error": str(exc)}
+        self.wfile.write(json.dumps(reply, sort_keys=True).encode("utf-8") + b"\n")
+
+
+class IngestServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Long-running ingest daemon that keeps adapters warm behind a Unix socket.
+
+    Connection handlers normalize batches concurrently; a single writer thread
+    appends them to the store, committing every queued batch in one pass with the
+    given ``JsonlWriter`` durability (``batch`` by default). When the
+    queue is full, handlers block (up to ``put_timeout``) before answering "busy",
+    and a batch not committed within ``commit_timeout`` is answered with an error
+    (it may still be written; re-sending it is safe because compaction dedups).
+    After a failed store write the server is unhealthy and rejects every batch.
+    """
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(
+        self,
+        socket_path: Path,
+        registry: AdapterRegistry,
+        store: Path,
+        error_log: Path | None = None,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        max_batch_lines: int = DEFAULT_MAX_BATCH_LINES,
+        put_timeout: float = DEFAULT_PUT_TIMEOUT,
+        commit_timeout: float = DEFAULT_COMMIT_TIMEOUT,
+        durability: str = "batch",
+        partition_by: tuple[str, ...] | None = None,
+    ) -> None:
+        self.socket_path = socket_path
+        self.registry = registry
+        self.max_batch_lines = max_batch_lines
+        self.put_timeout = put_timeout
+        self.commit_timeout = commit_timeout
+        self.batches: queue.Queue[_Batch | None] = queue.Queue(maxsize=queue_size)
+        # Held until server_close, so compaction cannot rewrite files under the writer.
+        self._store_lock = ExitStack()
+        self._store_lock.enter_context(store_lock(store))
+        try:
+            self.writer = _StoreWriter(
+                store,
+                error_log,
+                self.batches,
+                max_group=queue_size,
+                durability=durability,
+                layout=open_layout(store, partition_by),
+            )
+            if socket_path.exists():
+                socket_path.unlink()
+            super().__init__(str(socket_path), _Handler)
+        except BaseException:
+            self._store_lock.close()
+            raise
+        self.writer.start()
+
+    @property
+    def healthy(self) -> bool:
+        return self.writer.failure is None and self.writer.is_alive()
+
+    def ingest_batch(self, rfile: Any) -> dict[str, Any]:
+        header = json.loads(rfile.readline() or b"{}")
+        adapter = self.registry.get(str(header.get("adapter", "")))
+        lines = []
+        for raw in rfile:
+            lines.append(raw.decode("utf-8"))
+            if len(lines) > self.max_batch_lines:
+                return {"ok": False, "error": f"batch exceeds {self.max_batch_lines} lines"}
+
+        if self.writer.failure is not None:
+            return {"ok": False, "error": f"server unhealthy: {self.writer.failure}"}
+
+        context = IngestContext(issues=IssueSink(sample_size=None))
+        options = AdapterOptions(lenient=bool(header.get("lenient", False)))
+        records = iter_jsonl_lines(lines, str(header.get("input_file", "<socket>")))
+        signals = [sig.to_dict() for sig in adapter.iter_record_signals(records, options=options, context=context)]
+
+        batch = _Batch(signals=signals, issues=context.issues.samples)
+        try:
+            self.batches.put(batch, timeout=self.put_timeout)
+        except queue.Full:
+            return {"ok": False, "error": "busy"}
+        if not batch.done.wait(self.commit_timeout):
+            return {"ok": False, "error": f"batch not committed within {self.commit_timeout:g}s"}
+        if batch.error is not None:
+            return {"ok": False, "error": batch.error}
+        return {"ok": True, "emitted": len(signals), "errors": context.issues.count}
+
+    def server_close(self) -> None:
+        super().server_close()
+        if self.writer.is_alive():
+            self.batches.put(None)
+            self.writer.join()
+        self._store_lock.close()
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+
+
+def send_batch(
+    socket_path: Path,
+    adapter: str,
+    lines: Iterable[str],
+    lenient: bool = False,
+    timeout: float | None = 60.0,
+) -> dict[str, Any]:
+    """Send one JSONL batch to a running ``metaspn io serve`` daemon and return its reply."""
+    header = {"adapter": adapter, "lenient": lenient}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(socket_path))
+        payload = [json.dumps(header) + "\n"]
+        for line in lines:
+            payload.append(line if line.endswith("\n") else line + "\n")
+        sock.sendall("".join(payload).encode("utf-8"))
+        sock.shutdown(socket.SHUT_WR)
+        with sock.makefile("rb") as f:
+            reply = f.readline()
+    return json.loads(reply)
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from metaspn_io.io_utils import json_line
+
+SHARD_KEYS = ("entity", "token_mint", "wallet", "signal_id")
+
+
+def shard_key_value(signal: dict[str, Any], shard_key: str) -> str:
+    if shard_key == "signal_id":
+        return str(signal["signal_id"])
+    if shard_key == "entity":
+        refs = signal.get("entity_refs") or [{}]
+        ref = refs[0]
+        return f"{ref.get('kind', '')}|{ref.get('platform', '')}|{ref.get('identifier', '')}"
+    if shard_key in ("token_mint", "wallet"):
+        payload = signal.get("payload")
+        value = payload.get(shard_key) if isinstance(payload, dict) else None
+        return "" if value is None else str(value)
+    raise ValueError(f"shard key must be one of {', '.join(SHARD_KEYS)}; got '{shard_key}'")
+
+
+def shard_for(value: str, shards: int) -> int:
+    """Stable shard index: independent of process, platform and ``PYTHONHASHSEED``."""
+    digest = hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % shards
+
+
+def shard_paths(out: Path, shards: int) -> list[Path]:
+    return [out.with_name(f"{out.stem}-{idx:05d}-of-{shards:05d}.jsonl") for idx in range(shards)]
+
+
+def manifest_path(out: Path) -> Path:
+    return out.with_name(f"{out.stem}.shards.json")
+
+
+@dataclass(frozen=True)
+class ShardManifest:
+    shard_key: str
+    paths: list[Path]
+    counts: list[int]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "shard_key": self.shard_key,
+            "shards": len(self.paths),
+            "hash": "blake2b-64",
+            "total": sum(self.counts),
+            "files": [{"path": path.name, "count": count} for path, count in zip(self.paths, self.counts)],
+        }
+
+
+def write_shards(
+    out: Path,
+    signals: Iterable[dict[str, Any]],
+    shards: int,
+    shard_key: str = "entity",
+    durability: str = "run",
+) -> ShardManifest:
+    """Route signals to ``shards`` files by stable hash of ``shard_key``.
+
+    Signals keep their input order within each shard, so globally sorted input
+    gives time-ordered shards. Every shard file is written (possibly empty) through
+    a temp file and atomic rename, then the manifest is written the same way.
+    """
+    if shards < 1:
+        raise ValueError("shards must be >= 1")
+    paths = shard_paths(out, shards)
+    counts = [0] * shards
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmps = [path.with_name(f".{path.name}.tmp") for path in paths]
+    handles = [tmp.open("w", encoding="utf-8") for tmp in tmps]
+    try:
+        for signal in signals:
+            idx = shard_for(shard_key_value(signal, shard_key), shards)
+            handles[idx].write(json_line(signal))
+            counts[idx] += 1
+        for handle in handles:
+            handle.flush()
+            if durability != "none":
+                os.fsync(handle.fileno())
+    except BaseException:
+        for handle, tmp in zip(handles, tmps):
+            handle.close()
+            tmp.unlink(missing_ok=True)
+        raise
+    for handle, tmp, path in zip(handles, tmps, paths):
+        handle.close()
+        os.replace(tmp, path)
+
+    manifest = ShardManifest(shard_key=shard_key, paths=paths, counts=counts)
+    target = manifest_path(out)
+    tmp = target.with_name(f".{target.name}.tmp")
+    tmp.write_text(json.dumps(manifest.to_dict(), sort_keys=True, indent=2), encoding="utf-8")
+    os.replace(tmp, target)
+    return manifest
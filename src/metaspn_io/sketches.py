@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import heapq
+import json
+import math
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+from metaspn_io.writer import replace_jsonl
+
+# Bump whenever hashing or the saved layout changes: old sketches cannot be merged with new ones.
+SKETCH_FORMAT = 2
+DEFAULT_HLL_PRECISION = 14
+DEFAULT_CMS_WIDTH = 2048
+DEFAULT_CMS_DEPTH = 4
+DEFAULT_TOP_K = 10
+# Space-Saving keeps more counters than it reports so the reported top-K are accurate.
+_SPACE_SAVING_FACTOR = 10
+
+
+def _hash128(value: str) -> int:
+    # Same hash family as sharding, so sketches agree across processes and machines.
+    # One digest feeds every sketch: HyperLogLog takes the high 64 bits, Count-Min
+    # derives its rows from both halves (Kirsch-Mitzenmacher double hashing).
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest(), "big")
+
+
+class HyperLogLog:
+    """Distinct-count sketch with ``2**precision`` registers (~1.04/sqrt(m) relative error)."""
+
+    def __init__(self, precision: int = DEFAULT_HLL_PRECISION) -> None:
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value: str) -> None:
+        self.add_hash(_hash128(value))
+
+    def add_hash(self, hashed128: int) -> None:
+        hashed = hashed128 >> 64
+        index = hashed >> (64 - self.precision)
+        rest = hashed & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting is far more accurate while many registers are empty.
+            estimate = m * math.log(m / zeros)
+        return round(estimate)
+
+    def merge(self, other: HyperLogLog) -> None:
+        if other.precision != self.precision:
+            raise ValueError("cannot merge HyperLogLog sketches of different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"precision": self.precision, "registers": base64.b64encode(self.registers).decode("ascii")}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> HyperLogLog:
+        sketch = cls(int(data["precision"]))
+        sketch.registers = bytearray(base64.b64decode(data["registers"]))
+        return sketch
+
+
+class CountMinSketch:
+    """Frequency sketch; ``estimate`` never undercounts and overcounts by at most ~e/width of the total."""
+
+    def __init__(self, width: int = DEFAULT_CMS_WIDTH, depth: int = DEFAULT_CMS_DEPTH) -> None:
+        self.width = width
+        self.depth = depth
+        self.rows = [[0] * width for _ in range(depth)]
+
+    def _cells(self, hashed: int) -> Iterable[tuple[list[int], int]]:
+        high, low = hashed >> 64, hashed & 0xFFFFFFFFFFFFFFFF
+        for depth, row in enumerate(self.rows):
+            yield row, (high + depth * low) % self.width
+
+    def add(self, value: str, count: int = 1) -> None:
+        self.add_hash(_hash128(value), count)
+
+    def add_hash(self, hashed: int, count: int = 1) -> None:
+        for row, cell in self._cells(hashed):
+            row[cell] += count
+
+    def estimate(self, value: str) -> int:
+        return min(row[cell] for row, cell in self._cells(_hash128(value)))
+
+    def merge(self, other: CountMinSketch) -> None:
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("cannot merge Count-Min sketches of different shape")
+        self.rows = [[a + b for a, b in zip(mine, theirs)] for mine, theirs in zip(self.rows, other.rows)]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"width": self.width, "depth": self.depth, "rows": self.rows}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> CountMinSketch:
+        sketch = cls(int(data["width"]), int(data["depth"]))
+        sketch.rows = [[int(cell) for cell in row] for row in data["rows"]]
+        return sketch
+
+
+class SpaceSaving:
+    """Top-K heavy hitters in ``capacity`` counters.
+
+    Each counter is ``[count, error]``: ``count`` may overcount by up to ``error``.
+    Merging follows the mergeable-summaries construction, so a merged sketch keeps
+    the same guarantees as one built over the combined stream.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_TOP_K * _SPACE_SAVING_FACTOR) -> None:
+        self.capacity = capacity
+        self.counters: dict[str, list[int]] = {}
+        # Lazy min-heap of (count, value); entries whose count is stale are skipped.
+        self._heap: list[tuple[int, str]] = []
+
+    def add(self, value: str, count: int = 1) -> None:
+        counter = self.counters.get(value)
+        if counter is not None:
+            counter[0] += count
+            heapq.heappush(self._heap, (counter[0], value))
+        elif len(self.counters) < self.capacity:
+            self.counters[value] = [count, 0]
+            heapq.heappush(self._heap, (count, value))
+        else:
+            floor = self._evict()
+            self.counters[value] = [floor + count, floor]
+            heapq.heappush(self._heap, (floor + count, value))
+        if len(self._heap) > 4 * self.capacity:
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        self._heap = [(c[0], value) for value, c in self.counters.items()]
+        heapq.heapify(self._heap)
+
+    def _evict(self) -> int:
+        while True:
+            count, value = heapq.heappop(self._heap)
+            counter = self.counters.get(value)
+            if counter is not None and counter[0] == count:
+                del self.counters[value]
+                return count
+
+    def _floor(self) -> int:
+        if len(self.counters) < self.capacity:
+            return 0
+        return min(count for count, _ in self.counters.values())
+
+    def top(self, k: int = DEFAULT_TOP_K) -> list[tuple[str, int, int]]:
+        """``(value, count, error)`` sorted by count, then value."""
+        ranked = sorted(self.counters.items(), key=lambda item: (-item[1][0], item[0]))
+        return [(value, count, error) for value, (count, error) in ranked[:k]]
+
+    def merge(self, other: SpaceSaving) -> None:
+        mine, theirs = self._floor(), other._floor()
+        merged: dict[str, list[int]] = {}
+        for value in self.counters.keys() | other.counters.keys():
+            a = self.counters.get(value, [mine, mine])
+            b = other.counters.get(value, [theirs, theirs])
+            merged[value] = [a[0] + b[0], a[1] + b[1]]
+        ranked = sorted(merged.items(), key=lambda item: (-item[1][0], item[0]))
+        self.capacity = max(self.capacity, other.capacity)
+        self.counters = dict(ranked[: self.capacity])
+        self._rebuild()
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"capacity": self.capacity, "counters": {value: list(c) for value, c in sorted(self.counters.items())}}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> SpaceSaving:
+        sketch = cls(int(data["capacity"]))
+        sketch.counters = {value: [int(c[0]), int(c[1])] for value, c in data["counters"].items()}
+        sketch._rebuild()
+        return sketch
+
+
+class SignalSketches:
+    """Distinct wallets and token mints plus their heavy hitters, over ``payload.wallet``/``payload.token_mint``.
+
+    Every part is mergeable, so sketches saved by sharded or parallel runs combine
+    into the sketch of the whole input with ``merge``.
+    """
+
+    FIELDS = ("wallet", "token_mint")
+
+    def __init__(self, top_k: int = DEFAULT_TOP_K) -> None:
+        self.top_k = top_k
+        self.signals = 0
+        self.distinct = {name: HyperLogLog() for name in self.FIELDS}
+        self.frequency = {name: CountMinSketch() for name in self.FIELDS}
+        self.heavy = {name: SpaceSaving(top_k * _SPACE_SAVING_FACTOR) for name in self.FIELDS}
+
+    def update(self, signal: dict[str, Any]) -> None:
+        self.signals += 1
+        payload = signal.get("payload") or {}
+        for name in self.FIELDS:
+            value = payload.get(name)
+            if value:
+                hashed = _hash128(value)
+                self.distinct[name].add_hash(hashed)
+                self.frequency[name].add_hash(hashed)
+                self.heavy[name].add(value)
+
+    def merge(self, other: SignalSketches) -> None:
+        self.signals += other.signals
+        self.top_k = max(self.top_k, other.top_k)
+        for name in self.FIELDS:
+            self.distinct[name].merge(other.distinct[name])
+            self.frequency[name].merge(other.frequency[name])
+            self.heavy[name].merge(other.heavy[name])
+
+    def top(self, name: str) -> list[tuple[str, int]]:
+        """Top-K values of ``name`` with their Count-Min frequency estimate."""
+        return [(value, self.frequency[name].estimate(value)) for value, _, _ in self.heavy[name].top(self.top_k)]
+
+    def report_lines(self) -> list[str]:
+        lines = [f"sketch.distinct_wallets={self.distinct['wallet'].count()}"]
+        lines.append(f"sketch.distinct_tokens={self.distinct['token_mint'].count()}")
+        for name in self.FIELDS:
+            for rank, (value, count) in enumerate(self.top(name), start=1):
+                lines.append(f"sketch.top.{name}.{rank}={value}:{count}")
+        return lines
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "format": SKETCH_FORMAT,
+            "top_k": self.top_k,
+            "signals": self.signals,
+            "distinct": {name: sketch.to_dict() for name, sketch in self.distinct.items()},
+            "frequency": {name: sketch.to_dict() for name, sketch in self.frequency.items()},
+            "heavy": {name: sketch.to_dict() for name, sketch in self.heavy.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> SignalSketches:
+        if data.get("format") != SKETCH_FORMAT:
+            raise ValueError(f"unsupported sketch format: {data.get('format')!r}")
+        sketches = cls(int(data["top_k"]))
+        sketches.signals = int(data["signals"])
+        sketches.distinct = {name: HyperLogLog.from_dict(d) for name, d in data["distinct"].items()}
+        sketches.frequency = {name: CountMinSketch.from_dict(d) for name, d in data["frequency"].items()}
+        sketches.heavy = {name: SpaceSaving.from_dict(d) for name, d in data["heavy"].items()}
+        return sketches
+
+    def save(self, path: Path) -> None:
+        replace_jsonl(path, [json.dumps(self.to_dict(), separators=(",", ":"), sort_keys=True) + "\n"])
+
+    @classmethod
+    def load(cls, path: Path) -> SignalSketches:
+        return cls.from_dict(json.loads(path.read_text(encoding="utf-8")))
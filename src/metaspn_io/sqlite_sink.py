@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+DEFAULT_SQLITE_BATCH = 50_000
+
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS signals (
+    signal_id TEXT PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    source TEXT NOT NULL,
+    payload_type TEXT NOT NULL,
+    entity_identifier TEXT,
+    schema_version TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    entity_refs TEXT NOT NULL,
+    trace TEXT NOT NULL
+) WITHOUT ROWID
+"""
+
+SQLITE_INDEXES = {
+    "signals_timestamp": "timestamp",
+    "signals_payload_type": "payload_type, timestamp",
+    "signals_source": "source, timestamp",
+    "signals_entity_identifier": "entity_identifier",
+}
+
+_UPSERT = """
+INSERT INTO signals (
+    signal_id, timestamp, source, payload_type, entity_identifier, schema_version, payload, entity_refs, trace
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(signal_id) DO UPDATE SET
+    timestamp = excluded.timestamp,
+    source = excluded.source,
+    payload_type = excluded.payload_type,
+    entity_identifier = excluded.entity_identifier,
+    schema_version = excluded.schema_version,
+    payload = excluded.payload,
+    entity_refs = excluded.entity_refs,
+    trace = excluded.trace
+"""
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), sort_keys=True)
+
+
+def _row(signal: dict[str, Any]) -> tuple[Any, ...]:
+    refs = signal.get("entity_refs") or []
+    return (
+        signal["signal_id"],
+        signal["timestamp"],
+        signal["source"],
+        signal["payload_type"],
+        refs[0].get("identifier") if refs else None,
+        signal["schema_version"],
+        _dumps(signal["payload"]),
+        _dumps(refs),
+        _dumps(signal["trace"]),
+    )
+
+
+def _batches(signals: Iterable[dict[str, Any]], size: int) -> Iterator[list[tuple[Any, ...]]]:
+    batch: list[tuple[Any, ...]] = []
+    for signal in signals:
+        batch.append(_row(signal))
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def write_sqlite(path: Path, signals: Iterable[dict[str, Any]], batch_size: int = DEFAULT_SQLITE_BATCH) -> int:
+    """Upsert signals into ``<path>``'s ``signals`` table; returns the number of rows written.
+
+    Rows are written with one ``executemany`` transaction per ``batch_size`` signals
+    in WAL mode. ``signal_id`` is the primary key, so re-ingesting the same data
+    replaces rows instead of duplicating them. Secondary indexes are created after
+    the load when the table started empty, and maintained incrementally otherwise.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, isolation_level=None)
+    try:
+        for pragma in _PRAGMAS:
+            conn.execute(pragma)
+        conn.execute(_SCHEMA)
+        was_empty = conn.execute("SELECT 1 FROM signals LIMIT 1").fetchone() is None
+        if was_empty:
+            # A bulk load into an empty table is faster without indexes to maintain.
+            for name in SQLITE_INDEXES:
+                conn.execute(f"DROP INDEX IF EXISTS {name}")
+        written = 0
+        for batch in _batches(signals, batch_size):
+            conn.execute("BEGIN")
+            try:
+                conn.executemany(_UPSERT, batch)
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            written += len(batch)
+        for name, columns in SQLITE_INDEXES.items():
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON signals ({columns})")
+        conn.execute("PRAGMA optimize")
+        return written
+    finally:
+        conn.close()
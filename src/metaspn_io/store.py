@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+from collections.abc import Collection, Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from metaspn_io.io_utils import json_line
+from metaspn_io.writer import JsonlWriter
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+LAYOUT_MANIFEST = "layout.json"
+STORE_LOCK = ".lock"
+PARTITION_FIELDS = ("source", "payload_type", "date", "hour")
+DEFAULT_PARTITION_BY = ("date",)
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9_.$-]")
+
+
+class StoreLockedError(RuntimeError):
+    pass
+
+
+@contextmanager
+def store_lock(store: Path, exclusive: bool = False) -> Iterator[None]:
+    """Hold ``<store>/.lock`` for the duration of the block.
+
+    Appenders (ingest, ``serve``, ``AsyncStoreSink``) share the lock, so they can
+    write side by side. Compaction rewrites partitions and needs it exclusively:
+    an exclusive request fails at once with ``StoreLockedError`` instead of
+    waiting on a daemon that may never exit, and a shared request waits for a
+    running compaction to finish. Without ``fcntl`` (Windows) this is a no-op.
+    """
+    if fcntl is None:
+        yield
+        return
+    store.mkdir(parents=True, exist_ok=True)
+    fd = os.open(store / STORE_LOCK, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if exclusive:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                raise StoreLockedError(f"store {store} is in use by a running ingest or serve") from None
+        else:
+            fcntl.flock(fd, fcntl.LOCK_SH)
+        yield
+    finally:
+        os.close(fd)
+
+
+def _clean(value: str) -> str:
+    return _UNSAFE.sub("_", value) or "_"
+
+
+@dataclass(frozen=True)
+class StoreLayout:
+    """Partition scheme for ``<store>/signals``.
+
+    Every field but the last is a ``field=value`` directory and the last one names
+    the file, e.g. ``("source", "date")`` writes ``source=solana/2026-02-06.jsonl``.
+    The default ``("date",)`` is the original ``signals/YYYY-MM-DD.jsonl`` layout.
+    """
+
+    partition_by: tuple[str, ...] = DEFAULT_PARTITION_BY
+
+    def __post_init__(self) -> None:
+        unknown = [name for name in self.partition_by if name not in PARTITION_FIELDS]
+        if not self.partition_by or unknown or len(set(self.partition_by)) != len(self.partition_by):
+            raise ValueError(
+                f"partition fields must be distinct values from {', '.join(PARTITION_FIELDS)}; "
+                f"got {', '.join(self.partition_by) or 'nothing'}"
+            )
+
+    def values(self, signal: dict[str, Any]) -> tuple[str, ...]:
+        timestamp = str(signal["timestamp"])
+        available = {
+            "source": lambda: _clean(str(signal.get("source", ""))),
+            "payload_type": lambda: _clean(str(signal.get("payload_type", ""))),
+            "date": lambda: timestamp[:10],
+            "hour": lambda: timestamp[11:13],
+        }
+        return tuple(available[name]() for name in self.partition_by)
+
+    def partition_path(self, store: Path, signal: dict[str, Any]) -> Path:
+        values = self.values(signal)
+        path = store / "signals"
+        for name, value in zip(self.partition_by[:-1], values[:-1]):
+            path = path / f"{name}={value}"
+        return path / f"{values[-1]}.jsonl"
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"version": 1, "partition_by": list(self.partition_by)}
+
+
+def load_layout(store: Path) -> StoreLayout:
+    """Layout recorded in the store manifest, or the default day layout for legacy stores."""
+    try:
+        manifest = json.loads((store / LAYOUT_MANIFEST).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return StoreLayout()
+    return StoreLayout(partition_by=tuple(manifest["partition_by"]))
+
+
+def open_layout(store: Path, partition_by: tuple[str, ...] | None = None) -> StoreLayout:
+    """Resolve the layout for writing, recording it in the manifest on first use.
+
+    Raises ``ValueError`` if ``partition_by`` conflicts with the recorded layout.
+    """
+    manifest = store / LAYOUT_MANIFEST
+    if manifest.exists():
+        layout = load_layout(store)
+        if partition_by is not None and tuple(partition_by) != layout.partition_by:
+            raise ValueError(
+                f"store {store} is partitioned by {','.join(layout.partition_by)}; "
+                f"refusing to write with {','.join(partition_by)}"
+            )
+        return layout
+    layout = StoreLayout(partition_by=tuple(partition_by or DEFAULT_PARTITION_BY))
+    store.mkdir(parents=True, exist_ok=True)
+    tmp = manifest.with_name(manifest.name + ".tmp")
+    tmp.write_text(json.dumps(layout.to_dict(), sort_keys=True, indent=2), encoding="utf-8")
+    os.replace(tmp, manifest)
+    return layout
+
+
+def _matches(name: str, value: str, filters: dict[str, Any]) -> bool:
+    if name in ("source", "payload_type"):
+        allowed = filters.get(name)
+        return allowed is None or value in allowed
+    if name == "date":
+        since, until = filters.get("since"), filters.get("until")
+        return (since is None or value >= since[:10]) and (until is None or value <= until[:10])
+    if name == "hour":
+        since, until = filters.get("since"), filters.get("until")
+        # Hours can only be pruned once the date is known, see iter_partitions.
+        date = filters.get("_date")
+        if date is None:
+            return True
+        # A date-only bound covers the whole day: since from hour 00, until through hour 23.
+        stamp = (date, value)
+        return (since is None or stamp >= (since[:10], since[11:13] or "00")) and (
+            until is None or stamp <= (until[:10], until[11:13] or "23")
+        )
+    return True
+
+
+def iter_partitions(
+    store: Path,
+    source: Collection[str] | None = None,
+    payload_type: Collection[str] | None = None,
+    since: str | None = None,
+    until: str | None = None,
+    layout: StoreLayout | None = None,
+) -> Iterator[Path]:
+    """Yield partition files in path order, pruning whole directories that cannot match.
+
+    ``since``/``until`` are ISO-8601 UTC strings (``YYYY-MM-DD`` or full timestamps).
+    """
+    layout = layout or load_layout(store)
+    filters: dict[str, Any] = {
+        "source": None if source is None else {_clean(value) for value in source},
+        "payload_type": None if payload_type is None else {_clean(value) for value in payload_type},
+        "since": since,
+        "until": until,
+    }
+
+    def walk(directory: Path, depth: int, scope: dict[str, Any]) -> Iterator[Path]:
+        name = layout.partition_by[depth]
+        last = depth == len(layout.partition_by) - 1
+        try:
+            entries = sorted(directory.iterdir())
+        except FileNotFoundError:
+            return
+        for entry in entries:
+            if last:
+                if not (entry.is_file() and entry.suffix == ".jsonl") or entry.name.startswith("."):
+                    continue
+                value = entry.stem
+            else:
+                prefix = f"{name}="
+                if not (entry.is_dir() and entry.name.startswith(prefix)):
+                    continue
+                value = entry.name[len(prefix):]
+            if not _matches(name, value, scope):
+                continue
+            if last:
+                yield entry
+            else:
+                yield from walk(entry, depth + 1, {**scope, "_date": value} if name == "date" else scope)
+
+    yield from walk(store / "signals", 0, filters)
+
+
+def group_by_partition(
+    store: Path,
+    signals: Iterable[dict[str, Any]],
+    layout: StoreLayout | None = None,
+) -> dict[Path, list[str]]:
+    """Serialize signals and group the lines by store partition, preserving order."""
+    layout = layout or StoreLayout()
+    grouped: dict[Path, list[str]] = {}
+    for signal in signals:
+        grouped.setdefault(layout.partition_path(store, signal), []).append(json_line(signal))
+    return grouped
+
+
+def append_store(
+    store: Path,
+    signals: Iterable[dict[str, Any]],
+    writer: JsonlWriter,
+    layout: StoreLayout | None = None,
+) -> None:
+    layout = layout or StoreLayout()
+    for signal in signals:
+        writer.write(layout.partition_path(store, signal), json_line(signal))
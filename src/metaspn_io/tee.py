@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import os
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any
+
+from metaspn_io.io_utils import json_line
+from metaspn_io.writer import _fsync_dir
+
+TEE_FIELDS = ("payload_type", "source")
+
+
+@dataclass(frozen=True)
+class TeeSpec:
+    """Route signals whose ``field`` is one of ``values`` to ``path``."""
+
+    field: str
+    values: frozenset[str]
+    path: Path
+
+    def matches(self, signal: dict[str, Any]) -> bool:
+        return str(signal.get(self.field)) in self.values
+
+
+def parse_tee(text: str) -> TeeSpec:
+    """Parse ``field=value[,value...]:path``, e.g. ``payload_type=TokenTradeSeen:trades.jsonl``."""
+    selector, sep, path = text.partition(":")
+    field, eq, values = selector.partition("=")
+    field = field.strip()
+    names = frozenset(value.strip() for value in values.split(",") if value.strip())
+    if not sep or not eq or not path or not names:
+        raise ValueError(f"expected field=value[,value...]:path; got '{text}'")
+    if field not in TEE_FIELDS:
+        raise ValueError(f"tee field must be one of {', '.join(TEE_FIELDS)}; got '{field}'")
+    return TeeSpec(field=field, values=names, path=Path(path))
+
+
+def write_tee(
+    signals: Iterable[dict[str, Any]],
+    tees: list[TeeSpec],
+    out: Path | None = None,
+    durability: str = "run",
+) -> dict[Path, int]:
+    """Write ``out`` and every tee in one pass, serializing each signal once.
+
+    Each file is written to a temp file and renamed into place, as ``replace_jsonl``
+    does, only after every output succeeded. Returns the line count per path.
+    """
+    targets: list[tuple[TeeSpec | None, Path]] = [(None, out)] if out is not None else []
+    targets += [(spec, spec.path) for spec in tees]
+    paths = [path for _, path in targets]
+    if len(set(paths)) != len(paths):
+        raise ValueError("each tee needs its own output path")
+
+    handles: list[tuple[TeeSpec | None, Path, Path, IO[bytes]]] = []
+    counts = dict.fromkeys(paths, 0)
+    try:
+        for spec, path in targets:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f".{path.name}.tmp")
+            handles.append((spec, path, tmp, tmp.open("wb")))
+        for signal in signals:
+            line = json_line(signal).encode("utf-8")
+            for spec, path, _, handle in handles:
+                if spec is None or spec.matches(signal):
+                    handle.write(line)
+                    counts[path] += 1
+        for _, _, _, handle in handles:
+            handle.flush()
+            if durability != "none":
+                os.fsync(handle.fileno())
+            handle.close()
+        for _, path, tmp, _ in handles:
+            os.replace(tmp, path)
+    except BaseException:
+        for _, _, tmp, handle in handles:
+            handle.close()
+            tmp.unlink(missing_ok=True)
+        raise
+    if durability != "none":
+        for directory in {path.parent for path in paths}:
+            _fsync_dir(directory)
+    return counts
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import os
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from pathlib import Path
+from typing import BinaryIO
+
+DURABILITY_MODES = ("none", "batch", "interval", "run")
+DEFAULT_INTERVAL = 1.0
+DEFAULT_COMMIT_LINES = 10_000
+DEFAULT_MAX_OPEN = 64
+
+
+def recover_tail(path: Path) -> int:
+    """Truncate a torn trailing line left by a crash; returns the number of bytes dropped."""
+    try:
+        size = path.stat().st_size
+    except FileNotFoundError:
+        return 0
+    if size == 0:
+        return 0
+    with path.open("rb+") as f:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) == b"\n":
+            return 0
+        end = size
+        block = 64 * 1024
+        while end > 0:
+            start = max(0, end - block)
+            f.seek(start)
+            chunk = f.read(end - start)
+            idx = chunk.rfind(b"\n")
+            if idx != -1:
+                keep = start + idx + 1
+                break
+            end = start
+        else:
+            keep = 0
+        f.truncate(keep)
+        f.flush()
+        os.fsync(f.fileno())
+    return size - keep
+
+
+def _fsync_dir(path: Path) -> None:
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class JsonlWriter:
+    """Append-only JSONL writer with group commit and a selectable durability policy.
+
+    Lines are buffered per file and written with one ``write()`` per file on
+    ``commit()``, so many signals share a flush and an fsync:
+
+    - ``none``: flush on commit, never fsync
+    - ``batch``: fsync every file touched by a commit
+    - ``interval``: fsync on commit once ``interval`` seconds have passed since the last fsync
+    - ``run``: fsync every file written during the run once, on ``close()``
+
+    Files are checked for a torn trailing line (see ``recover_tail``) before the
+    first append, so a crash never leaves a partial line in front of new data.
+    Up to ``max_open`` files are kept open; colder files are synced as the policy
+    requires and closed.
+    """
+
+    def __init__(
+        self,
+        durability: str = "run",
+        interval: float = DEFAULT_INTERVAL,
+        commit_lines: int = DEFAULT_COMMIT_LINES,
+        max_open: int = DEFAULT_MAX_OPEN,
+    ) -> None:
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"durability must be one of {', '.join(DURABILITY_MODES)}; got '{durability}'")
+        self.durability = durability
+        self.interval = interval
+        self.commit_lines = commit_lines
+        self.max_open = max_open
+        self.commits = 0
+        self.fsyncs = 0
+        self._buffers: dict[Path, list[str]] = {}
+        self._buffered = 0
+        self._handles: OrderedDict[Path, BinaryIO] = OrderedDict()
+        self._unsynced: set[Path] = set()
+        self._recovered: set[Path] = set()
+        self._last_sync = time.monotonic()
+
+    def write(self, path: Path, line: str) -> None:
+        self._buffers.setdefault(path, []).append(line)
+        self._buffered += 1
+        if self._buffered >= self.commit_lines:
+            self.commit()
+
+    def write_many(self, grouped: dict[Path, list[str]]) -> None:
+        for path, lines in grouped.items():
+            self._buffers.setdefault(path, []).extend(lines)
+            self._buffered += len(lines)
+        if self._buffered >= self.commit_lines:
+            self.commit()
+
+    def commit(self) -> None:
+        if not self._buffers:
+            return
+        touched = list(self._buffers)
+        for path in touched:
+            lines = self._buffers[path]
+            handle = self._handle(path)
+            handle.write("".join(lines).encode("utf-8"))
+            handle.flush()
+            self._unsynced.add(path)
+            # Drop each buffer as soon as it is written, so retrying after a
+            # failure part-way through never writes the same lines twice.
+            del self._buffers[path]
+            self._buffered -= len(lines)
+        self.commits += 1
+
+        if self.durability == "batch":
+            self._sync(touched)
+        elif self.durability == "interval" and time.monotonic() - self._last_sync >= self.interval:
+            self._sync(list(self._unsynced))
+
+    def close(self) -> None:
+        try:
+            self.commit()
+            if self.durability != "none":
+                self._sync(list(self._unsynced))
+        finally:
+            for handle in self._handles.values():
+                handle.close()
+            self._handles.clear()
+
+    def _handle(self, path: Path) -> BinaryIO:
+        handle = self._handles.get(path)
+        if handle is not None:
+            self._handles.move_to_end(path)
+            return handle
+        if path not in self._recovered:
+            recover_tail(path)
+            self._recovered.add(path)
+        created = not path.exists()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handle = path.open("ab")
+        if created and self.durability != "none":
+            _fsync_dir(path.parent)
+        self._handles[path] = handle
+        while len(self._handles) > self.max_open:
+            cold_path, cold = self._handles.popitem(last=False)
+            if cold_path in self._unsynced and self.durability != "none":
+                os.fsync(cold.fileno())
+                self.fsyncs += 1
+                self._unsynced.discard(cold_path)
+            cold.close()
+        return handle
+
+    def _sync(self, paths: Iterable[Path]) -> None:
+        for path in paths:
+            handle = self._handles.get(path)
+            if handle is not None and path in self._unsynced:
+                os.fsync(handle.fileno())
+                self.fsyncs += 1
+            self._unsynced.discard(path)
+        self._last_sync = time.monotonic()
+
+    def __enter__(self) -> JsonlWriter:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def replace_jsonl(path: Path, lines: Iterable[str], durability: str = "run") -> None:
+    """Write a whole JSONL file through a temp file and atomic rename."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    try:
+        with tmp.open("wb") as f:
+            for line in lines:
+                f.write(line.encode("utf-8"))
+            f.flush()
+            if durability != "none":
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    if durability != "none":
+        _fsync_dir(path.parent)
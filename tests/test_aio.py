@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import gc
+import time
+import warnings
+from pathlib import Path
+
+import pytest
+
+from metaspn_io import aio
+from metaspn_io.adapters import default_registry
+from metaspn_io.aio import AsyncJsonlSink, AsyncStoreSink, aiter_signal_batches, aiter_signals, run_ingest_async
+from metaspn_io.ingest import run_ingest
+
+FIXTURES = Path(__file__).parent / "fixtures"
+SEASON1 = "season1_onchain_jsonl_v1"
+
+
+def _lines(path: Path) -> list[str]:
+    return sorted(
+        line for file in sorted(path.rglob("*.jsonl")) for line in file.read_text(encoding="utf-8").splitlines()
+    )
+
+
+def test_aiter_signals_matches_sync_adapter() -> None:
+    adapter = default_registry().get(SEASON1)
+    expected = [signal.to_dict() for signal in adapter.iter_signals(FIXTURES / "season1")]
+
+    async def collect() -> list[dict]:
+        return [signal async for signal in aiter_signals(adapter, FIXTURES / "season1", batch_size=3)]
+
+    assert asyncio.run(collect()) == expected
+
+
+class SlowAdapter:
+    """Season 1 adapter that takes ``delay`` seconds per signal, counting what it produced."""
+
+    def __init__(self, delay: float) -> None:
+        self.inner = default_registry().get(SEASON1)
+        self.name, self.version = self.inner.name, self.inner.version
+        self.delay = delay
+        self.produced = 0
+
+    def iter_signals(self, source_path, options=None, context=None):
+        for signal in self.inner.iter_signals(source_path, options=options, context=context):
+            time.sleep(self.delay)
+            self.produced += 1
+            yield signal
+
+
+def test_aiter_signal_batches_yields_to_event_loop() -> None:
+    adapter = SlowAdapter(delay=0.02)
+    ticks = 0
+
+    async def ticker() -> None:
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.001)
+
+    async def consume() -> list[int]:
+        task = asyncio.create_task(ticker())
+        # Ticks counted when each batch arrives; the ticker must run while the next is produced.
+        seen = [ticks async for _ in aiter_signal_batches(adapter, FIXTURES / "season1", batch_size=2)]
+        task.cancel()
+        return seen
+
+    seen = asyncio.run(consume())
+    assert len(seen) >= 2
+    assert all(after - before >= 2 for before, after in zip(seen, seen[1:])), seen
+
+
+def test_closing_early_waits_for_the_worker() -> None:
+    adapter = SlowAdapter(delay=0.02)
+
+    async def consume() -> int:
+        batches = aiter_signal_batches(adapter, FIXTURES / "season1", batch_size=2, queue_size=1)
+        await batches.__anext__()
+        await batches.aclose()
+        produced = adapter.produced
+        await asyncio.sleep(0.2)
+        return produced
+
+    assert asyncio.run(consume()) == adapter.produced
+
+
+# The abandoned generator can only be finalized on the closed loop, which Python reports as unraisable.
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnraisableExceptionWarning")
+def test_worker_stops_when_the_loop_closes_under_it() -> None:
+    class RecordingExecutor(concurrent.futures.ThreadPoolExecutor):
+        def submit(self, fn, /, *args, **kwargs):
+            self.future = super().submit(fn, *args, **kwargs)
+            return self.future
+
+    executor = RecordingExecutor(max_workers=1)
+    adapter = default_registry().get(SEASON1)
+    loop = asyncio.new_event_loop()
+    batches = aiter_signal_batches(adapter, FIXTURES / "season1", batch_size=1, queue_size=1, executor=executor)
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        loop.run_until_complete(batches.__anext__())
+        loop.close()
+        try:
+            # The worker is blocked handing over a batch nobody will take; it must give up.
+            assert executor.future.result(timeout=5) is None
+        finally:
+            executor.shutdown(wait=False)
+        gc.collect()
+    assert not [w for w in caught if "never awaited" in str(w.message)]
+
+
+def test_aiter_propagates_errors() -> None:
+    adapter = default_registry().get(SEASON1)
+
+    async def consume() -> None:
+        async for _ in aiter_signals(adapter, FIXTURES / "season1", options=None, batch_size=0):
+            pass
+
+    with pytest.raises(ValueError, match="batch_size"):
+        asyncio.run(consume())
+
+
+def test_run_ingest_async_matches_run_ingest(tmp_path: Path) -> None:
+    common = {"registry": default_registry(), "adapter_name": SEASON1, "source": FIXTURES / "season1"}
+    sync = run_ingest(
+        **common, out=tmp_path / "sync.jsonl", store=tmp_path / "sync-store", error_log_path=tmp_path / "e1.jsonl"
+    )
+    result = asyncio.run(
+        run_ingest_async(
+            **common,
+            out=tmp_path / "async.jsonl",
+            store=tmp_path / "async-store",
+            error_log_path=tmp_path / "e2.jsonl",
+            batch_size=4,
+        )
+    )
+    assert result.emitted == sync.emitted
+    assert (tmp_path / "async.jsonl").read_bytes() == (tmp_path / "sync.jsonl").read_bytes()
+    assert _lines(tmp_path / "async-store" / "signals") == _lines(tmp_path / "sync-store" / "signals")
+
+
+def test_cancelled_ingest_keeps_previous_out(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    out = tmp_path / "out.jsonl"
+    out.write_text("previous\n", encoding="utf-8")
+    started = asyncio.Event()
+
+    class SlowStoreSink(AsyncStoreSink):
+        async def write(self, signals: list[dict]) -> None:
+            await super().write(signals)
+            started.set()
+            await asyncio.sleep(10)
+
+    monkeypatch.setattr(aio, "AsyncStoreSink", SlowStoreSink)
+
+    async def scenario() -> None:
+        task = asyncio.create_task(
+            run_ingest_async(
+                registry=default_registry(),
+                adapter_name=SEASON1,
+                source=FIXTURES / "season1",
+                out=out,
+                store=tmp_path / "store",
+                error_log_path=tmp_path / "errors.jsonl",
+                batch_size=2,
+            )
+        )
+        await asyncio.wait_for(started.wait(), timeout=5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(scenario())
+    assert out.read_text(encoding="utf-8") == "previous\n"
+    assert not list(tmp_path.glob(".*.tmp"))
+    assert len(_lines(tmp_path / "store" / "signals")) == 2
+
+
+def test_store_sink_failing_to_open_aborts_the_out_sink(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    opened: list[AsyncJsonlSink] = []
+
+    class RecordingJsonlSink(AsyncJsonlSink):
+        def __init__(self, *args, **kwargs) -> None:
+            super().__init__(*args, **kwargs)
+            opened.append(self)
+
+    class LockedStoreSink(AsyncStoreSink):
+        def __init__(self, *args, **kwargs) -> None:
+            raise RuntimeError("store is locked")
+
+    monkeypatch.setattr(aio, "AsyncJsonlSink", RecordingJsonlSink)
+    monkeypatch.setattr(aio, "AsyncStoreSink", LockedStoreSink)
+    ingest = run_ingest_async(
+        registry=default_registry(),
+        adapter_name=SEASON1,
+        source=FIXTURES / "season1",
+        out=tmp_path / "out.jsonl",
+        store=tmp_path / "store",
+        error_log_path=tmp_path / "errors.jsonl",
+    )
+    with pytest.raises(RuntimeError, match="locked"):
+        asyncio.run(ingest)
+    (sink,) = opened
+    assert sink._executor._shutdown
+    assert not (tmp_path / "out.jsonl").exists()
+
+
+def test_async_jsonl_sink_context_manager(tmp_path: Path) -> None:
+    path = tmp_path / "sub" / "out.jsonl"
+
+    async def scenario() -> None:
+        async with AsyncJsonlSink(path, durability="none") as sink:
+            await sink.write([{"b": 1, "a": 2}])
+            await sink.write([{"c": 3}])
+
+    asyncio.run(scenario())
+    assert path.read_text(encoding="utf-8") == '{"a":2,"b":1}\n{"c":3}\n'
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from metaspn_io.adapters import default_registry  # noqa: E402
+from metaspn_io.arrays import TokenArrayBuilder, build_token_arrays  # noqa: E402
+from metaspn_io.cli import main  # noqa: E402
+from metaspn_io.ingest import SinkOptions, run_ingest  # noqa: E402
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _signals() -> list[dict]:
+    adapter = default_registry(discover=False).get("solana_rpc_v1")
+    return [signal.to_dict() for signal in adapter.iter_signals(FIXTURES / "tokens" / "solana_rpc.jsonl")]
+
+
+def test_token_arrays_columns_and_dictionaries() -> None:
+    result = build_token_arrays(_signals())
+    trades = result.arrays["TokenTradeSeen"]
+    assert trades.dtype["timestamp"] == np.dtype("datetime64[s]")
+    assert trades.dtype["amount"] == np.dtype("float64")
+    assert trades["timestamp"][0] == np.datetime64("2026-02-06T10:00:00")
+    assert trades["amount"][0] == 10.5
+    assert result.dictionaries["wallet"][trades["wallet"][0]] == "w1"
+    holders = result.arrays["HolderChangeSeen"]
+    # Dictionaries are shared, so the same mint has the same code in every array.
+    assert holders["token_mint"][0] == trades["token_mint"][0]
+    assert len(result.arrays["LiquidityEventSeen"]) == 1
+
+
+def test_chunked_build_matches_single_chunk() -> None:
+    signals = _signals() * 5
+    whole = build_token_arrays(signals)
+    chunked = TokenArrayBuilder(chunk_rows=2).extend(signals).finish()
+    for payload_type, array in whole.arrays.items():
+        assert np.array_equal(array, chunked.arrays[payload_type])
+
+
+def test_cli_writes_npz(tmp_path: Path) -> None:
+    out = tmp_path / "tokens.npz"
+    main(["io", "ingest", "--adapter", "solana_rpc_v1", "--source", str(FIXTURES / "tokens"), "--npz", str(out)])
+    with np.load(out) as data:
+        assert len(data["TokenTradeSeen"]) >= 1
+        assert "w1" in list(data["dict.wallet"])
+
+
+def test_npz_alone_does_not_buffer_signals(tmp_path: Path) -> None:
+    result = run_ingest(
+        registry=default_registry(discover=False),
+        adapter_name="solana_rpc_v1",
+        source=FIXTURES / "tokens" / "solana_rpc.jsonl",
+        sinks=SinkOptions(npz=tmp_path / "tokens.npz"),
+        error_log_path=tmp_path / "errors.jsonl",
+        memory_profile="rss",
+    )
+    assert result.emitted > 0
+    assert [stage.buffered for stage in result.memory.stages if stage.stage == "parse"] == [0]
+    with np.load(tmp_path / "tokens.npz") as data:
+        assert len(data["TokenTradeSeen"]) >= 1
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import json
+from dataclasses import asdict
+from pathlib import Path
+
+import pytest
+
+from metaspn_io import iter_signal_batches
+from metaspn_io.adapters import default_registry
+from metaspn_io.adapters.base import AdapterOptions, IngestContext
+from metaspn_io.issues import IssueSink
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _adapter():
+    return default_registry(discover=False).get("social_jsonl_v1")
+
+
+def test_batches_match_iter_signals_in_every_format() -> None:
+    source = FIXTURES / "social"
+    options = AdapterOptions(lenient=True)
+    expected = [signal.to_dict() for signal in _adapter().iter_signals(source, options=options)]
+
+    dicts = list(iter_signal_batches(_adapter(), source, options=options, batch_size=2))
+    assert [batch.size for batch in dicts] == [2, 2, len(expected) - 4]
+    assert [row for batch in dicts for row in batch.records] == expected
+
+    lines = [line for batch in iter_signal_batches(_adapter(), source, options, 2, "bytes") for line in batch.records]
+    assert [json.loads(line) for line in lines] == expected
+    assert all(line.endswith(b"\n") for line in lines)
+
+    columns = list(iter_signal_batches(_adapter(), source, options, 2, "columns"))
+    assert columns[0].records["signal_id"] == [row["signal_id"] for row in expected[:2]]
+    assert all(len(values) == batch.size for batch in columns for values in batch.records.values())
+
+
+def test_to_dict_matches_dataclasses_asdict() -> None:
+    registry = default_registry(discover=False)
+    signals = list(registry.get("solana_rpc_v1").iter_signals(FIXTURES / "tokens" / "solana_rpc.jsonl"))
+    signals += list(_adapter().iter_signals(FIXTURES / "social", options=AdapterOptions(lenient=True)))
+    assert [signal.to_dict() for signal in signals] == [asdict(signal) for signal in signals]
+
+
+def test_batches_carry_issues_raised_since_previous_batch() -> None:
+    batches = list(iter_signal_batches(_adapter(), FIXTURES / "social", batch_size=1))
+    issues = [issue for batch in batches for issue in batch.issues]
+    assert len(issues) == 2
+    assert issues[0].input_file.endswith("2026-02-06.jsonl")
+
+
+def test_caller_context_keeps_exact_counts() -> None:
+    context = IngestContext(issues=IssueSink(sample_size=1))
+    batches = list(iter_signal_batches(_adapter(), FIXTURES / "social", batch_size=10, context=context))
+    assert context.issues.count == 2
+    assert sum(len(batch.issues) for batch in batches) == len(context.issues.samples)
+
+
+def test_rejects_bad_arguments_when_called() -> None:
+    with pytest.raises(ValueError, match="format must be one of"):
+        iter_signal_batches(_adapter(), FIXTURES / "social", format="arrow")
+    with pytest.raises(ValueError, match="batch_size must be positive"):
+        iter_signal_batches(_adapter(), FIXTURES / "social", batch_size=0)
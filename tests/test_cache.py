@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import json
+import shutil
+from dataclasses import replace
+from pathlib import Path
+
+from metaspn_io.adapters import default_registry
+from metaspn_io.adapters.base import AdapterOptions, IngestContext
+from metaspn_io.cache import SignalCache
+from metaspn_io.issues import IssueSink
+from metaspn_io.predicates import compile_predicate
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _source(tmp_path: Path) -> Path:
+    source = tmp_path / "social"
+    shutil.copytree(FIXTURES / "social", source)
+    return source
+
+
+def _adapter():
+    return default_registry(discover=False).get("social_jsonl_v1")
+
+
+def test_cached_output_matches_adapter_and_replays_issues(tmp_path: Path) -> None:
+    source, cache = _source(tmp_path), SignalCache(tmp_path / "cache")
+    expected_ctx = IngestContext()
+    expected = [signal.to_dict() for signal in _adapter().iter_signals(source, context=expected_ctx)]
+
+    for hits in (0, 2):
+        ctx = IngestContext()
+        assert list(cache.iter_signals(_adapter(), source, context=ctx)) == expected
+        assert ctx.counters.get("cache_hits", 0) == hits
+        assert ctx.issues.count == expected_ctx.issues.count
+        assert ctx.counters["records"] == expected_ctx.counters["records"]
+
+
+def test_changed_file_options_and_version_miss(tmp_path: Path) -> None:
+    source, cache = _source(tmp_path), SignalCache(tmp_path / "cache")
+    list(cache.iter_signals(_adapter(), source))
+
+    with (source / "2026-02-06.jsonl").open("a", encoding="utf-8") as f:
+        f.write(
+            '{"platform":"twitter","type":"post_seen","author_handle":"zoe","url":"u",'
+            '"timestamp":"2026-02-06T11:00:00Z"}\n'
+        )
+    ctx = IngestContext()
+    list(cache.iter_signals(_adapter(), source, context=ctx))
+    assert (ctx.counters["cache_hits"], ctx.counters["cache_misses"]) == (1, 1)
+
+    ctx = IngestContext()
+    options = AdapterOptions(where=compile_predicate("author_handle != alice"))
+    signals = list(cache.iter_signals(_adapter(), source, options=options, context=ctx))
+    assert ctx.counters["cache_misses"] == 2
+    assert all(signal["payload"]["author_handle"] != "alice" for signal in signals)
+
+    upgraded = replace(_adapter(), version="9.9")
+    ctx = IngestContext()
+    list(cache.iter_signals(upgraded, source, context=ctx))
+    assert ctx.counters["cache_misses"] == 2
+    assert [path.name for path in (tmp_path / "cache" / "social_jsonl_v1").iterdir()] == ["9.9"]
+
+
+def test_eviction_keeps_cache_within_budget(tmp_path: Path) -> None:
+    source = _source(tmp_path)
+    list(SignalCache(tmp_path / "cache", max_bytes=1).iter_signals(_adapter(), source))
+    assert list((tmp_path / "cache").glob("*/*/*/*.jsonl")) == []
+
+
+def test_identical_file_at_another_path_keeps_its_own_trace(tmp_path: Path) -> None:
+    source, cache = _source(tmp_path), SignalCache(tmp_path / "cache")
+    copy = tmp_path / "copy"
+    copy.mkdir()
+    shutil.copy(source / "2026-02-06.jsonl", copy / "other.jsonl")
+    list(cache.iter_signals(_adapter(), source))
+
+    ctx = IngestContext()
+    signals = list(cache.iter_signals(_adapter(), copy, context=ctx))
+    assert ctx.counters["cache_misses"] == 1
+    assert {signal["trace"]["input_file"] for signal in signals} == {str(copy / "other.jsonl")}
+    assert set(ctx.issues.by_file) <= {str(copy / "other.jsonl")}
+
+
+def test_entries_keep_issue_counts_and_only_sampled_issues(tmp_path: Path) -> None:
+    source = tmp_path / "bad.jsonl"
+    source.write_text("not json\n" * 5, encoding="utf-8")
+    cache = SignalCache(tmp_path / "cache")
+    for hits in (0, 1):
+        ctx = IngestContext(issues=IssueSink(sample_size=2))
+        assert list(cache.iter_signals(_adapter(), source, context=ctx)) == []
+        assert ctx.counters.get("cache_hits", 0) == hits
+        assert (ctx.issues.count, ctx.issues.by_message, len(ctx.issues.samples)) == (5, {"invalid json": 5}, 2)
+        assert ctx.issues.by_file == {str(source): 5}
+    (entry,) = (tmp_path / "cache").glob("*/*/*/*.jsonl")
+    assert len(json.loads(entry.read_text(encoding="utf-8").splitlines()[0])["issues"]) == 2
+
+    # A caller that keeps every issue cannot use the sampled entry.
+    ctx = IngestContext(issues=IssueSink(sample_size=None))
+    list(cache.iter_signals(_adapter(), source, context=ctx))
+    assert ctx.counters["cache_misses"] == 1
+    assert len(ctx.issues.samples) == 5
@@ -36,6 +36,8 @@ def test_cli_ingest_smoke_date_partition() -> None:
                 "2026-02-05",
                 "--out",
                 str(out_dir),
+                "--error-log",
+                str(Path(tmpdir) / "errors.jsonl"),
             ]
         )
         assert exit_code == 0
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from metaspn_io.adapters import default_registry
+from metaspn_io.cli import main
+from metaspn_io.compact import COMPACTION_MANIFEST, compact_partition, compact_store
+from metaspn_io.ingest import run_ingest
+from metaspn_io.store import StoreLockedError, store_lock
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _ingest_twice(store: Path) -> None:
+    registry = default_registry(discover=False)
+    for source in ("solana_rpc.jsonl", "pumpfun.jsonl", "solana_rpc.jsonl"):
+        run_ingest(
+            registry=registry,
+            adapter_name="pumpfun_v1" if source == "pumpfun.jsonl" else "solana_rpc_v1",
+            source=FIXTURES / "tokens" / source,
+            store=store,
+            error_log_path=store / "errors.jsonl",
+        )
+
+
+def test_compact_sorts_and_drops_duplicate_signal_ids(tmp_path: Path) -> None:
+    store = tmp_path / "store"
+    _ingest_twice(store)
+    partition = store / "signals" / "2026-02-06.jsonl"
+    assert len(partition.read_text(encoding="utf-8").splitlines()) == 18
+
+    [result] = compact_store(store)
+
+    rows = [json.loads(line) for line in partition.read_text(encoding="utf-8").splitlines()]
+    assert (result.lines_in, result.lines_out, result.duplicates) == (18, 10, 8)
+    assert len({row["signal_id"] for row in rows}) == 10
+    keys = [(row["timestamp"], row["signal_id"]) for row in rows]
+    assert keys == sorted(keys)
+
+
+def test_compact_spills_runs_and_matches_in_memory_result(tmp_path: Path) -> None:
+    store_a, store_b = tmp_path / "a", tmp_path / "b"
+    _ingest_twice(store_a)
+    _ingest_twice(store_b)
+    a = store_a / "signals" / "2026-02-06.jsonl"
+    b = store_b / "signals" / "2026-02-06.jsonl"
+
+    compact_partition(a)
+    compact_partition(b, chunk_lines=3)
+
+    assert a.read_bytes() == b.read_bytes()
+    assert sorted(p.name for p in b.parent.iterdir()) == ["2026-02-06.jsonl"]
+
+
+@pytest.mark.parametrize("chunk_lines", [100, 1])
+def test_compact_keeps_first_copy_of_a_duplicate(tmp_path: Path, chunk_lines: int) -> None:
+    partition = tmp_path / "2026-02-06.jsonl"
+    rows = [
+        {"timestamp": "2026-02-06T10:00:00Z", "signal_id": "s1", "payload": {"v": "z-first"}},
+        {"timestamp": "2026-02-06T09:00:00Z", "signal_id": "s0", "payload": {"v": "only"}},
+        {"timestamp": "2026-02-06T10:00:00Z", "signal_id": "s1", "payload": {"v": "a-second"}},
+    ]
+    partition.write_text("".join(json.dumps(row) + "\n" for row in rows), encoding="utf-8")
+
+    result = compact_partition(partition, chunk_lines=chunk_lines)
+
+    kept = [json.loads(line)["payload"]["v"] for line in partition.read_text(encoding="utf-8").splitlines()]
+    assert kept == ["only", "z-first"]
+    assert result.duplicates == 1
+
+
+def test_compact_refuses_a_store_in_use(tmp_path: Path, capsys) -> None:
+    store = tmp_path / "store"
+    _ingest_twice(store)
+    with store_lock(store):
+        with pytest.raises(StoreLockedError):
+            compact_store(store)
+        assert main(["io", "compact", "--store", str(store)]) == 1
+    assert "in use" in capsys.readouterr().err
+    [result] = compact_store(store)
+    assert result.duplicates == 8
+
+
+def test_compact_skips_unchanged_partitions(tmp_path: Path) -> None:
+    store = tmp_path / "store"
+    _ingest_twice(store)
+    assert not compact_store(store)[0].skipped
+    assert (store / "signals" / COMPACTION_MANIFEST).exists()
+
+    assert compact_store(store)[0].skipped
+    assert not compact_store(store, force=True)[0].skipped
+
+    _ingest_twice(store)
+    assert not compact_store(store)[0].skipped
+
+
+def test_compact_cli_parallel(tmp_path: Path, capsys) -> None:
+    store = tmp_path / "store"
+    _ingest_twice(store)
+    run_ingest(
+        registry=default_registry(discover=False),
+        adapter_name="season1_onchain_jsonl_v1",
+        source=FIXTURES / "season1" / "onchain.jsonl",
+        store=store,
+        error_log_path=tmp_path / "errors.jsonl",
+    )
+
+    assert main(["io", "compact", "--store", str(store), "--workers", "2", "--stats"]) == 0
+    out = capsys.readouterr().out
+    assert "partitions=2" in out
+    assert "partition.2026-02-06.jsonl=in:18,out:10,duplicates:8,invalid:0" in out
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from metaspn_io.adapters import default_registry
+from metaspn_io.adapters.base import AdapterOptions, IngestContext
+from metaspn_io.adapters.solana_rpc_jsonl import SolanaRpcAdapter
+from metaspn_io.interning import Interner
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def test_context_collects_issues_and_counters() -> None:
+    adapter = SolanaRpcAdapter()
+    context = IngestContext()
+    signals = list(adapter.iter_signals(FIXTURES / "tokens" / "solana_rpc.jsonl", context=context))
+
+    assert not hasattr(adapter, "issues")
+    assert context.counters["emitted"] == len(signals) == 8
+    assert context.counters["records"] == 8
+    assert context.issues.count == 0
+
+
+def test_interleaved_calls_on_one_adapter_keep_separate_issues(tmp_path: Path) -> None:
+    broken = tmp_path / "broken.jsonl"
+    broken.write_text("not json\n{\"type\":\"trade\"}\n", encoding="utf-8")
+    adapter = SolanaRpcAdapter()
+    ctx_a, ctx_b = IngestContext(), IngestContext()
+
+    gen_a = adapter.iter_signals(FIXTURES / "tokens" / "solana_rpc.jsonl", context=ctx_a)
+    gen_b = adapter.iter_signals(broken, context=ctx_b)
+    next(gen_a)
+    assert list(gen_b) == []
+    rest_a = list(gen_a)
+
+    assert len(rest_a) == 7
+    assert ctx_a.issues.count == 0
+    assert ctx_b.issues.count == 2
+
+
+def test_parallel_ingests_share_one_registry() -> None:
+    registry = default_registry(discover=False)
+    jobs = [
+        ("season1_onchain_jsonl_v1", FIXTURES / "season1" / "onchain.jsonl", 6, 1),
+        ("season1_onchain_jsonl_v1", FIXTURES / "season1" / "chain_with_issues.jsonl", 2, 3),
+        ("social_jsonl_v1", FIXTURES / "social", 4, 2),
+        ("solana_rpc_v1", FIXTURES / "tokens" / "solana_rpc.jsonl", 8, 0),
+    ] * 8
+
+    def run(job: tuple[str, Path, int, int]) -> tuple[int, int, int, int]:
+        name, source, emitted, errors = job
+        context = IngestContext()
+        signals = list(registry.get(name).iter_signals(source, options=AdapterOptions(), context=context))
+        return len(signals), context.issues.count, emitted, errors
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(run, jobs))
+
+    for got_emitted, got_errors, emitted, errors in results:
+        assert (got_emitted, got_errors) == (emitted, errors)
+
+
+def test_interner_shares_repeated_values_across_signals(tmp_path: Path) -> None:
+    source = tmp_path / "trades.jsonl"
+    source.write_text(
+        '{"type":"trade","chain":"solana","token_mint":"m1","wallet":"w1","side":"buy","amount":1,'
+        '"timestamp":"2026-02-06T10:00:00Z"}\n'
+        '{"type":"trade","chain":"solana","token_mint":"m1","wallet":"w1","side":"buy","amount":2,'
+        '"timestamp":"2026-02-06T10:01:00Z"}\n',
+        encoding="utf-8",
+    )
+    first, second = SolanaRpcAdapter().iter_signals(source)
+    assert first.payload.wallet is second.payload.wallet
+    assert first.entity_refs[0] is second.entity_refs[0]
+    assert first.timestamp is first.trace.ingested_at
+
+    plain = list(SolanaRpcAdapter().iter_signals(source, context=IngestContext(interner=Interner(enabled=False))))
+    assert plain[0].payload.wallet is not plain[1].payload.wallet
+    assert [signal.to_dict() for signal in plain] == [first.to_dict(), second.to_dict()]
+
+
+def test_adapters_without_intern_parameter_still_parse(tmp_path: Path) -> None:
+    from metaspn_io.adapters.social_jsonl import SocialJsonlAdapter
+
+    class LegacyAdapter(SocialJsonlAdapter):
+        def _parse_record(self, data, input_file, line_number, options):  # type: ignore[no-untyped-def,override]
+            return super()._parse_record(data, input_file, line_number, options)
+
+    source = tmp_path / "social.jsonl"
+    source.write_text(
+        '{"platform":"twitter","type":"post_seen","author_handle":"alice","text":"hi","url":"u",'
+        '"timestamp":"2026-02-06T10:00:00Z"}\n',
+        encoding="utf-8",
+    )
+    assert not LegacyAdapter._takes_intern
+    assert SocialJsonlAdapter._takes_intern
+    (signal,) = LegacyAdapter().iter_signals(source)
+    assert signal.to_dict() == next(SocialJsonlAdapter().iter_signals(source)).to_dict()
+
+    from metaspn_io.adapters.pumpfun_jsonl import PumpfunAdapter
+
+    class LegacyPumpfun(PumpfunAdapter):
+        def _parse_record(self, data, input_file, line_number, options):  # type: ignore[no-untyped-def,override]
+            return super()._parse_record(data, input_file, line_number, options)
+
+    tokens = FIXTURES / "tokens" / "pumpfun.jsonl"
+    legacy = [signal.to_dict() for signal in LegacyPumpfun().iter_signals(tokens)]
+    assert legacy == [signal.to_dict() for signal in PumpfunAdapter().iter_signals(tokens)]
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from metaspn_io.adapters import default_registry
+from metaspn_io.cli import main
+from metaspn_io.estimate import estimate_source
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _write_source(path: Path, rows: int, seed: int = 7) -> dict[str, int]:
+    rng = random.Random(seed)
+    truth = {"trade": 0, "holder_change": 0, "errors": 0}
+    with path.open("w", encoding="utf-8") as f:
+        for i in range(rows):
+            roll = rng.random()
+            ts = f"2026-02-06T{i // 3600 % 24:02d}:{i // 60 % 60:02d}:{i % 60:02d}Z"
+            if roll < 0.02:
+                f.write('{"type": "trade", "broken"\n')
+                truth["errors"] += 1
+            elif roll < 0.7:
+                record = {"type": "trade", "token_mint": f"m{i % 50}", "wallet": f"w{i}", "side": "buy",
+                          "amount": rng.random() * 100, "price_usd": 1.0, "timestamp": ts}
+                f.write(json.dumps(record) + "\n")
+                truth["trade"] += 1
+            else:
+                record = {"type": "holder_change", "token_mint": f"m{i % 50}", "wallet": f"w{i}",
+                          "delta": 1.5, "timestamp": ts}
+                f.write(json.dumps(record) + "\n")
+                truth["holder_change"] += 1
+    return truth
+
+
+def test_estimate_small_file_is_exact() -> None:
+    adapter = default_registry().get("solana_rpc_v1")
+    result = estimate_source(adapter, FIXTURES / "tokens" / "solana_rpc.jsonl")
+    assert result.exact
+    assert result.records.value == result.records.low == result.records.high == 8
+    assert result.payloads["TokenTradeSeen"].value == 1
+    assert result.error_rate.value == 0
+
+
+def test_estimate_sampled_counts_cover_truth(tmp_path: Path) -> None:
+    source = tmp_path / "raw"
+    source.mkdir()
+    truth = _write_source(source / "a.jsonl", 40_000)
+    adapter = default_registry().get("solana_rpc_v1")
+    result = estimate_source(adapter, source, sample_rate=0.05, range_bytes=4096)
+
+    assert not result.exact
+    assert result.bytes_read < result.bytes_total / 10
+    # A 95% interval misses now and then; three standard errors keeps the test deterministic but honest.
+    for interval, actual in (
+        (result.payloads["TokenTradeSeen"], truth["trade"]),
+        (result.payloads["HolderChangeSeen"], truth["holder_change"]),
+        (result.records, 40_000),
+        (result.errors, truth["errors"]),
+        (result.error_rate, truth["errors"] / 40_000),
+    ):
+        se = (interval.high - interval.value) / 1.96
+        assert 0 < se and abs(interval.value - actual) <= 3 * se
+    assert abs(result.payloads["TokenTradeSeen"].value - truth["trade"]) / truth["trade"] < 0.05
+
+
+def test_estimate_samples_across_many_small_files(tmp_path: Path) -> None:
+    source = tmp_path / "raw"
+    source.mkdir()
+    records = 0
+    for idx in range(40):
+        _write_source(source / f"{idx:02d}.jsonl", 500, seed=idx)
+        records += 500
+    adapter = default_registry().get("solana_rpc_v1")
+    result = estimate_source(adapter, source, sample_rate=0.001, range_bytes=4096)
+
+    assert not result.exact
+    assert result.files == 40
+    assert result.bytes_read <= 8 * 4096 < result.bytes_total / 50
+    se = (result.records.high - result.records.value) / 1.96
+    assert 0 < se and abs(result.records.value - records) <= 3 * se
+
+
+def test_estimate_rejects_bad_rate() -> None:
+    adapter = default_registry().get("solana_rpc_v1")
+    with pytest.raises(ValueError):
+        estimate_source(adapter, FIXTURES / "tokens", sample_rate=0)
+
+
+def test_cli_estimate_prints_intervals(capsys: pytest.CaptureFixture[str]) -> None:
+    args = ["io", "ingest", "--adapter", "solana_rpc_v1", "--source", str(FIXTURES / "tokens" / "solana_rpc.jsonl")]
+    assert main([*args, "--sample-rate", "0.5"]) == 0
+    out = capsys.readouterr().out
+    assert "estimate.records=8" in out
+    assert "estimate.payload.TokenTradeSeen.ci95=1..1" in out
+    assert "estimate.error_rate=0.0000" in out
+
+
+def test_cli_estimate_rejects_outputs(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    args = ["io", "ingest", "--adapter", "solana_rpc_v1", "--source", str(FIXTURES / "tokens"), "--estimate"]
+    with pytest.raises(SystemExit) as excinfo:
+        main([*args, "--out", str(tmp_path / "out.jsonl"), "--store", str(tmp_path / "store")])
+    assert excinfo.value.code == 2
+    assert "cannot be combined with --out, --store" in capsys.readouterr().err
+    assert not (tmp_path / "out.jsonl").exists()
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import json
+from decimal import Decimal
+from pathlib import Path
+
+from metaspn_io.cli import main
+from metaspn_io.holders import HolderState
+
+
+def _holder(signal_id: str, timestamp: str, wallet: str, delta: float, mint: str = "mint-a") -> dict:
+    return {
+        "signal_id": signal_id,
+        "timestamp": timestamp,
+        "payload_type": "HolderChangeSeen",
+        "payload": {"chain": "solana", "token_mint": mint, "wallet": wallet, "delta": delta},
+    }
+
+
+def _supply(signal_id: str, timestamp: str, new_supply: float, mint: str = "mint-a") -> dict:
+    return {
+        "signal_id": signal_id,
+        "timestamp": timestamp,
+        "payload_type": "SupplyChangeSeen",
+        "payload": {"chain": "solana", "token_mint": mint, "new_supply": new_supply, "delta": None},
+    }
+
+
+SIGNALS = [
+    _holder("s1", "2026-02-05T10:00:00Z", "w1", 0.1),
+    _holder("s2", "2026-02-05T11:00:00Z", "w1", 0.2),
+    _supply("s3", "2026-02-05T11:00:00Z", 1000.0),
+    _holder("s4", "2026-02-06T09:00:00Z", "w2", 5.0),
+    _holder("s5", "2026-02-07T09:00:00Z", "w1", -0.3),
+    _holder("s6", "2026-02-07T12:00:00Z", "w2", 1.5),
+]
+
+
+def test_snapshots_answer_any_day_and_time(tmp_path: Path) -> None:
+    state = HolderState(tmp_path / "holders")
+    result = state.update(SIGNALS)
+    assert (result.applied, result.duplicates, result.days_rebuilt) == (6, 0, 3)
+
+    assert state.at("2026-02-04").balances == {}
+    # Decimal sums are exact: 0.1 + 0.2 - 0.3 leaves no dust, so w1 drops out.
+    assert state.at("2026-02-05").balances == {("mint-a", "w1"): Decimal("0.3")}
+    assert state.at("2026-02-07").holders("mint-a") == {"w2": Decimal("6.5")}
+    assert state.at("2026-02-07T10:00:00Z").holders("mint-a") == {"w2": Decimal("5")}
+    assert state.at("2026-02-07T05:00:00-05:00").holders("mint-a") == {"w2": Decimal("5")}
+    assert state.at("2026-02-09").supply == {"mint-a": Decimal("1000")}
+
+
+def test_incremental_updates_match_full_replay(tmp_path: Path) -> None:
+    full = HolderState(tmp_path / "full")
+    full.update(SIGNALS)
+
+    incremental = HolderState(tmp_path / "incremental")
+    incremental.update(SIGNALS[3:5])
+    incremental.update(SIGNALS[:4])
+    result = incremental.update(SIGNALS)
+    assert (result.applied, result.duplicates) == (1, 5)
+    assert result.days_rebuilt == 1
+
+    for day in ("2026-02-05", "2026-02-06", "2026-02-07"):
+        assert incremental.at(day) == full.at(day)
+        snapshot = f"{day}.jsonl"
+        assert (incremental.snapshots_dir / snapshot).read_bytes() == (full.snapshots_dir / snapshot).read_bytes()
+
+
+def test_cli_updates_from_signal_output_and_queries(tmp_path: Path, capsys) -> None:
+    signals = tmp_path / "signals.jsonl"
+    signals.write_text("".join(json.dumps(signal) + "\n" for signal in SIGNALS), encoding="utf-8")
+    state = str(tmp_path / "holders")
+    main(["io", "holders", "--state", state, "--update", str(signals), "--at", "2026-02-06", "--token-mint", "mint-a"])
+    output = capsys.readouterr().out.splitlines()
+    assert "applied=6" in output
+    assert "balance.mint-a.w1=0.3" in output
+    assert "balance.mint-a.w2=5" in output
+    assert "supply.mint-a=1000" in output
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from metaspn_io.adapters import default_registry
+from metaspn_io.ingest import run_ingest
+from metaspn_io.io_utils import ParseIssue
+from metaspn_io.issues import IssueSink, issue_class
+
+
+def test_issue_class_groups_by_message_prefix() -> None:
+    assert issue_class("invalid json: Expecting value: line 1 column 1 (char 0)") == "invalid json"
+    assert issue_class("json line must be an object") == "json line must be an object"
+
+
+def test_sink_streams_every_issue_but_samples_raw_lines(tmp_path: Path) -> None:
+    log = tmp_path / "errors.jsonl"
+    with IssueSink(path=log, sample_size=2) as sink:
+        for idx in range(5):
+            sink.append(ParseIssue(f"invalid json: line {idx}", "a.jsonl", idx + 1, f"raw-{idx}"))
+        sink.append(ParseIssue("unsupported type: x", "b.jsonl", 1, "raw-x"))
+        assert log.exists()
+
+    rows = [json.loads(line) for line in log.read_text(encoding="utf-8").splitlines()]
+    assert len(sink) == sink.count == 6
+    assert [row["raw_line"] for row in rows] == ["raw-0", "raw-1", None, None, None, "raw-x"]
+    assert sink.by_message == {"invalid json": 5, "unsupported type": 1}
+    assert sink.by_file == {"a.jsonl": 5, "b.jsonl": 1}
+    assert len(sink.samples) == 3
+
+
+def test_ingest_error_count_is_exact_when_raw_lines_are_capped(tmp_path: Path, capsys) -> None:
+    source = tmp_path / "broken.jsonl"
+    source.write_text("not json\n" * 50, encoding="utf-8")
+    errors = tmp_path / "errors.jsonl"
+
+    result = run_ingest(
+        registry=default_registry(),
+        adapter_name="social_jsonl_v1",
+        source=source,
+        dry_run=False,
+        out=tmp_path / "signals.jsonl",
+        stats=True,
+        error_log_path=errors,
+        issue_sample_size=3,
+    )
+
+    rows = [json.loads(line) for line in errors.read_text(encoding="utf-8").splitlines()]
+    assert result.errors == 50
+    assert len(rows) == 50
+    assert sum(row["raw_line"] is not None for row in rows) == 3
+    out = capsys.readouterr().out
+    assert "issues.message.invalid_json=50" in out
+    assert f"issues.file.{source}=50" in out
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from metaspn_io.adapters import default_registry
+from metaspn_io.cli import main
+from metaspn_io.ingest import run_ingest
+from metaspn_io.memprof import MemoryProfile
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def test_memory_profile_rejects_unknown_mode() -> None:
+    with pytest.raises(ValueError):
+        MemoryProfile(mode="heap")
+
+
+def test_run_ingest_records_stage_memory(tmp_path: Path) -> None:
+    result = run_ingest(
+        registry=default_registry(),
+        adapter_name="season1_onchain_jsonl_v1",
+        source=FIXTURES / "season1",
+        out=tmp_path / "out.jsonl",
+        error_log_path=tmp_path / "errors.jsonl",
+        memory_profile="tracemalloc",
+    )
+    profile = result.memory
+    assert profile is not None
+    assert [stage.stage for stage in profile.stages] == ["start", "parse", "sinks", "end"]
+    parse = profile.stages[1]
+    assert parse.buffered == result.emitted
+    assert parse.traced_peak is not None and parse.traced_peak >= parse.traced > 0
+    assert profile.peak_rss and profile.peak_rss > 0
+    assert profile.bytes_per_signal() > 0
+    assert profile.top_sites
+
+
+def test_cli_memory_profile_rss_lines(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    args = ["io", "ingest", "--adapter", "season1_onchain_jsonl_v1", "--source", str(FIXTURES / "season1")]
+    args += ["--error-log", str(tmp_path / "errors.jsonl")]
+    assert main([*args, "--out", str(tmp_path / "out.jsonl"), "--memory-profile"]) == 0
+    out = capsys.readouterr().out
+    assert "memory.mode=rss" in out
+    assert "memory.peak_rss_bytes=" in out
+    assert "memory.stage.parse.buffered_signals=" in out
+    assert "memory.top." not in out
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import io
+from pathlib import Path
+
+import pytest
+
+from metaspn_io.adapters import default_registry
+from metaspn_io.cli import main
+from metaspn_io.ingest import run_ingest
+from metaspn_io.pipeline import Pipeline
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def test_pipeline_preserves_order_across_stages() -> None:
+    pipe = Pipeline(queue_size=2, batch_size=3)
+    doubled = pipe.source("double", (n * 2 for n in pipe.source("numbers", range(1000))))
+    assert list(doubled) == [n * 2 for n in range(1000)]
+    pipe.close()
+    stats = {channel.stats.name: channel.stats for channel in pipe.channels}
+    assert stats["numbers"].batches == 335
+    assert 0 < stats["numbers"].max_depth <= 2
+
+
+def test_pipeline_reraises_stage_error() -> None:
+    def broken():
+        yield from range(10)
+        raise RuntimeError("disk gone")
+
+    pipe = Pipeline(queue_size=1, batch_size=2)
+    items = pipe.source("numbers", broken())
+    with pytest.raises(RuntimeError, match="disk gone"):
+        try:
+            list(items)
+        except BaseException:
+            pipe.close(abort=True)
+            raise
+
+
+def test_pipeline_writer_error_stops_producer(tmp_path: Path) -> None:
+    pipe = Pipeline(queue_size=1, batch_size=1)
+    feed = pipe.channel("serialize")
+
+    def fail() -> None:
+        next(iter(feed))
+        raise OSError("no space left")
+
+    pipe.run("out", fail)
+    with pytest.raises(OSError, match="no space left"):
+        try:
+            for n in range(10_000):
+                feed.put(n)
+        except BaseException:
+            pipe.close(abort=True)
+            raise
+
+
+@pytest.mark.parametrize(
+    ("adapter", "source"),
+    [
+        ("season1_onchain_jsonl_v1", "season1"),
+        ("solana_rpc_v1", "tokens/solana_rpc.jsonl"),
+        ("pumpfun_v1", "tokens/pumpfun.jsonl"),
+        ("social_jsonl_v1", "social"),
+    ],
+)
+def test_pipelined_ingest_writes_identical_bytes(tmp_path: Path, adapter: str, source: str) -> None:
+    outputs = []
+    for pipelined in (False, True):
+        out = tmp_path / f"out-{pipelined}.jsonl"
+        run_ingest(
+            registry=default_registry(),
+            adapter_name=adapter,
+            source=FIXTURES / source,
+            out=out,
+            error_log_path=tmp_path / "errors.jsonl",
+            lenient=True,
+            pipeline=pipelined,
+            pipeline_queue=1,
+        )
+        outputs.append(out.read_bytes())
+    assert outputs[0] == outputs[1]
+    assert outputs[0]
+
+
+def test_pipelined_stdout_and_stats(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    serial, pipelined = io.StringIO(), io.StringIO()
+    for stdout, flag in ((serial, False), (pipelined, True)):
+        run_ingest(
+            registry=default_registry(),
+            adapter_name="season1_onchain_jsonl_v1",
+            source=FIXTURES / "season1",
+            out=Path("-"),
+            error_log_path=tmp_path / "errors.jsonl",
+            stdout=stdout,
+            pipeline=flag,
+        )
+    assert serial.getvalue() == pipelined.getvalue() != ""
+
+    args = ["io", "ingest", "--adapter", "season1_onchain_jsonl_v1", "--source", str(FIXTURES / "season1")]
+    args += ["--error-log", str(tmp_path / "errors.jsonl")]
+    assert main([*args, "--out", str(tmp_path / "out.jsonl"), "--pipeline", "--stats"]) == 0
+    out = capsys.readouterr().out
+    queues = {line.split(".")[2] for line in out.splitlines() if line.startswith("pipeline.queue.")}
+    assert queues == {"signals", "serialize", "write"}
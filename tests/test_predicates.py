@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from metaspn_io.adapters import default_registry
+from metaspn_io.cli import main
+from metaspn_io.ingest import run_ingest
+from metaspn_io.predicates import PredicateError, compile_predicate
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+@pytest.mark.parametrize(
+    ("expression", "record", "expected"),
+    [
+        ("amount > 100", {"amount": 150}, True),
+        ("amount > 100", {"amount": "150.5"}, True),
+        ("amount > 100", {"amount": "lots"}, False),
+        ("amount > 100", {}, False),
+        ("season_id = s1", {"season_id": "s1"}, True),
+        ("season_id == 's1' and not (amount <= 5)", {"season_id": "s1", "amount": 6}, True),
+        ("type in [trade, holder_change] or wallet != w1", {"type": "claim", "wallet": "w1"}, False),
+        ("wallet not in ['w1', 'w2']", {"wallet": "w3"}, True),
+        ("wallet not in ['w1', 'w2']", {}, False),
+        ("amount in [1, 2.5]", {"amount": 2.5}, True),
+        ("meta.slot >= 10", {"meta": {"slot": 12}}, True),
+        ("TYPE_X = a OR b = c", {"b": "c"}, True),
+        ("flag = true", {"flag": True}, True),
+        ("flag != false", {"flag": False}, False),
+        ("flag in [true]", {"flag": True}, True),
+    ],
+)
+def test_predicate_semantics(expression: str, record: dict, expected: bool) -> None:
+    assert compile_predicate(expression)(record) is expected
+
+
+def test_predicate_reads_set_file(tmp_path: Path) -> None:
+    mints = tmp_path / "mints.txt"
+    mints.write_text("# watchlist\nmint-a\n\n  mint-b  \n", encoding="utf-8")
+    predicate = compile_predicate(f"token_mint in @{mints} and amount > 100")
+    assert predicate({"token_mint": "mint-b", "amount": 101})
+    assert not predicate({"token_mint": "mint-c", "amount": 101})
+    assert not predicate({"token_mint": "mint-a", "amount": 100})
+
+
+def test_predicate_set_file_matches_numbers_and_closes_parentheses(tmp_path: Path) -> None:
+    (tmp_path / "amounts.txt").write_text("100\n2.5e1\n", encoding="utf-8")
+    predicate = compile_predicate("(amount in @amounts.txt)", base_dir=tmp_path)
+    assert predicate({"amount": 100.0})
+    assert predicate({"amount": "25"})
+    assert not predicate({"amount": 101})
+
+
+@pytest.mark.parametrize("expression", ["amount >", "amount ~ 1", "(a = 1", "a in [1", "a = 1 b", "a in @/nonexistent"])
+def test_predicate_errors(expression: str) -> None:
+    with pytest.raises(PredicateError):
+        compile_predicate(expression)
+
+
+def test_where_filters_before_parsing_and_counts_separately(tmp_path: Path, capsys) -> None:
+    out = tmp_path / "signals.jsonl"
+    result = run_ingest(
+        registry=default_registry(discover=False),
+        adapter_name="season1_onchain_jsonl_v1",
+        source=FIXTURES / "season1" / "chain_with_issues.jsonl",
+        out=out,
+        stats=True,
+        where="type not in [claim, unknown_event]",
+        error_log_path=tmp_path / "errors.jsonl",
+    )
+    output = capsys.readouterr().out
+    # Filtered records are never parsed, so only the undecodable line is an issue.
+    assert (result.emitted, result.errors) == (2, 1)
+    assert "filtered_where=2" in output
+
+
+def test_cli_rejects_invalid_where(capsys) -> None:
+    with pytest.raises(SystemExit):
+        main(["io", "ingest", "--adapter", "solana_rpc_v1", "--source", "x", "--dry-run", "--where", "amount >"])
+    assert "expected a value" in capsys.readouterr().err
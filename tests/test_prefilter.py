@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from metaspn_io.adapters import default_registry
+from metaspn_io.adapters.base import AdapterOptions, IngestContext
+from metaspn_io.io_utils import RawPrefilter
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def test_raw_scan_only_rejects_certain_lines() -> None:
+    since = datetime(2026, 2, 6, tzinfo=timezone.utc)
+    until = datetime(2026, 2, 6, 23, 59, 59, tzinfo=timezone.utc)
+    prefilter = RawPrefilter(since=since, until=until)
+    assert prefilter.rejects_line('{"type":"trade","timestamp":"2026-02-05T10:00:00Z"}')
+    assert not prefilter.rejects_line('{"type":"trade","timestamp":"2026-02-06T10:00:00Z"}')
+    assert not prefilter.rejects_line('{"timestamp":"not-a-date"}')
+    assert not prefilter.rejects_line('{"timestamp":1770372000}')
+    assert not prefilter.rejects_line('{"meta":{"timestamp":"2026-02-05T10:00:00Z"}}')
+    assert not prefilter.rejects_line('{"timestamp":"2026-02-05T10:00:00Z","timestamp":"2026-02-06T10:00:00Z"}')
+    assert not prefilter.rejects_line('{"timestamp":"2026-02-05T10:00:00Z","amount":')
+    assert prefilter.counters == {"prefiltered_window": 1}
+
+    prefilter = RawPrefilter(types=frozenset({"trade"}))
+    assert prefilter.rejects_line('{"type":"holder_change"}')
+    assert not prefilter.rejects_line('{"type":"\\u0074rade"}')
+    assert prefilter.rejects_record({"type": "holder_change"})
+    assert not prefilter.rejects_record({"type": " TRADE "})
+    assert prefilter.counters == {"filtered_type": 2}
+
+
+@pytest.mark.parametrize(
+    ("adapter", "source"),
+    [
+        ("social_jsonl_v1", FIXTURES / "social"),
+        ("solana_rpc_v1", FIXTURES / "tokens" / "solana_rpc.jsonl"),
+        ("season1_onchain_jsonl_v1", FIXTURES / "season1"),
+    ],
+)
+@pytest.mark.parametrize("lenient", [False, True])
+def test_prefilter_emits_identical_signals(adapter: str, source: Path, lenient: bool) -> None:
+    registry = default_registry(discover=False)
+    since = datetime(2026, 2, 5, 12, 30, tzinfo=timezone.utc)
+    until = datetime(2026, 2, 6, 10, 4, tzinfo=timezone.utc)
+
+    def run(prefilter: bool) -> tuple[list[dict], IngestContext]:
+        context = IngestContext()
+        options = AdapterOptions(since=since, until=until, lenient=lenient, prefilter=prefilter)
+        signals = [s.to_dict() for s in registry.get(adapter).iter_signals(source, options=options, context=context)]
+        return signals, context
+
+    baseline, plain = run(False)
+    filtered, context = run(True)
+    assert filtered == baseline
+    assert context.counters.get("prefiltered_window", 0) > 0
+    # Lines skipped by the raw scan are not mapped, so only their mapping issues can go missing.
+    issues = {(i.input_file, i.input_line_number) for i in plain.issues.samples}
+    assert {(i.input_file, i.input_line_number) for i in context.issues.samples} <= issues
+    if lenient:
+        assert context.issues.by_message == plain.issues.by_message
+
+
+def test_prefilter_still_reports_malformed_lines_outside_window(tmp_path: Path) -> None:
+    source = tmp_path / "tokens.jsonl"
+    source.write_text(
+        (FIXTURES / "tokens" / "solana_rpc.jsonl").read_text(encoding="utf-8")
+        + '{"type":"trade","token_mint":"m","wallet":"w","timestamp":"2020-01-01T00:00:00Z","amount":\n',
+        encoding="utf-8",
+    )
+    adapter = default_registry(discover=False).get("solana_rpc_v1")
+    since = datetime(2026, 2, 6, tzinfo=timezone.utc)
+    counts = []
+    for prefilter in (False, True):
+        context = IngestContext()
+        list(adapter.iter_signals(source, AdapterOptions(since=since, lenient=True, prefilter=prefilter), context))
+        counts.append((context.issues.count, context.issues.by_message))
+    assert counts[0] == counts[1]
+    assert counts[0][0] >= 1
+
+
+def test_types_allowlist_is_applied_even_when_raw_scan_is_ambiguous(tmp_path: Path) -> None:
+    source = tmp_path / "tokens.jsonl"
+    source.write_text(
+        (FIXTURES / "tokens" / "solana_rpc.jsonl").read_text(encoding="utf-8")
+        + '{"type":"\\u0074rade","token_mint":"m","wallet":"w","amount":1,"timestamp":"2026-02-06T12:00:00Z"}\n'
+        + '{"type":"holder_change","meta":{"type":"x"},"token_mint":"m","wallet":"w","delta":1,"timestamp":"2026-02-06T12:00:00Z"}\n',
+        encoding="utf-8",
+    )
+    context = IngestContext()
+    options = AdapterOptions(types=frozenset({"trade"}))
+    signals = list(default_registry(discover=False).get("solana_rpc_v1").iter_signals(source, options, context))
+
+    assert [s.payload_type for s in signals] == ["TokenTradeSeen", "TokenTradeSeen"]
+    assert context.counters["filtered_type"] == 8
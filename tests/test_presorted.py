@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from metaspn_io.adapters import default_registry
+from metaspn_io.adapters.base import AdapterOptions, IngestContext
+from metaspn_io.io_utils import is_time_sorted, iter_jsonl_records
+
+
+def _post(handle: str, timestamp: str) -> str:
+    return json.dumps(
+        {
+            "platform": "twitter",
+            "type": "post_seen",
+            "author_handle": handle,
+            "url": f"https://x.com/{handle}/status/1",
+            "timestamp": timestamp,
+        }
+    )
+
+
+def _write(path: Path, lines: list[str]) -> Path:
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def _ids(signals) -> list[str]:
+    return [signal.signal_id for signal in signals]
+
+
+def test_sorted_files_stream_through_merge_in_sort_order(tmp_path: Path) -> None:
+    source = tmp_path / "social"
+    source.mkdir()
+    _write(
+        source / "a.jsonl",
+        [_post("zed", "2026-02-05T10:00:00Z"), _post("amy", "2026-02-05T10:00:00Z"), _post("cat", "2026-02-05T12:00:00Z")],
+    )
+    _write(source / "b.jsonl", [_post("bob", "2026-02-05T09:00:00Z"), _post("dan", "2026-02-05T10:00:00Z"), "not json"])
+    adapter = default_registry(discover=False).get("social_jsonl_v1")
+
+    context = IngestContext()
+    merged = list(adapter.iter_signals(source, context=context))
+    assert context.sort_path == "merge"
+    assert context.counters["emitted"] == 5
+    assert context.issues.count == 1
+
+    expected = list(adapter.iter_record_signals(iter_jsonl_records(source)))
+    assert _ids(merged) == _ids(expected)
+
+
+def test_out_of_order_file_falls_back_to_sort() -> None:
+    source = Path(__file__).parent / "fixtures" / "social" / "2026-02-05.jsonl"
+    adapter = default_registry(discover=False).get("social_jsonl_v1")
+    context = IngestContext()
+    signals = list(adapter.iter_signals(source, options=AdapterOptions(lenient=True), context=context))
+    assert context.sort_path == "sort"
+    assert [signal.timestamp for signal in signals] == sorted(signal.timestamp for signal in signals)
+
+
+def test_record_out_of_order_far_into_a_file_is_still_sorted(tmp_path: Path) -> None:
+    from metaspn_io.adapters.base import DEFAULT_REORDER_WINDOW
+
+    start = datetime(2026, 2, 5, 10, tzinfo=timezone.utc)
+    rows = [_post(f"u{i}", f"{start + timedelta(seconds=i):%Y-%m-%dT%H:%M:%SZ}") for i in range(DEFAULT_REORDER_WINDOW + 2000)]
+    assert is_time_sorted(_write(tmp_path / "a.jsonl", rows))
+    rows.append(_post("early", "2026-02-05T09:00:00Z"))
+    source = _write(tmp_path / "a.jsonl", rows)
+    adapter = default_registry(discover=False).get("social_jsonl_v1")
+    context = IngestContext()
+    signals = list(adapter.iter_signals(source, context=context))
+    assert context.sort_path == "sort"
+    assert "reorder_late" not in context.counters
+    assert signals[0].payload.author_handle == "early"
+    assert [signal.timestamp for signal in signals] == sorted(signal.timestamp for signal in signals)
+
+
+def test_merge_opens_files_as_it_reaches_them(tmp_path: Path, monkeypatch) -> None:
+    from metaspn_io.adapters import base
+
+    monkeypatch.setattr(base, "MAX_MERGE_FILES", 1)
+    adapter = default_registry(discover=False).get("social_jsonl_v1")
+    days = tmp_path / "days"
+    days.mkdir()
+    _write(days / "2.jsonl", [_post("c", "2026-02-06T10:00:00Z"), _post("d", "2026-02-06T11:00:00Z")])
+    _write(
+        days / "1.jsonl",
+        [_post("a", "2026-02-05T10:00:00Z"), _post("b", "2026-02-05T11:00:00Z"), _post("e", "2026-02-05T12:00:00Z")],
+    )
+    context = IngestContext()
+    assert [s.payload.author_handle for s in adapter.iter_signals(days, context=context)] == ["a", "b", "e", "c", "d"]
+    assert context.sort_path == "merge"
+
+    # Overlapping files would need two open at once, so the run is sorted instead.
+    _write(days / "3.jsonl", [_post("x", "2026-02-05T10:30:00Z")])
+    context = IngestContext()
+    assert [s.payload.author_handle for s in adapter.iter_signals(days, context=context)] == ["a", "x", "b", "e", "c", "d"]
+    assert context.sort_path == "sort"
+    assert "reorder_late" not in context.counters
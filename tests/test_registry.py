@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import importlib.metadata
+import sys
+
+import pytest
+
+from metaspn_io.adapters import default_registry
+from metaspn_io.adapters.registry import AdapterRegistry
+from metaspn_io.adapters.social_jsonl import SocialJsonlAdapter
+
+
+def test_default_registry_loads_adapters_on_first_get() -> None:
+    registry = default_registry(discover=False)
+    assert registry._adapters == {}
+
+    adapter = registry.get("social_jsonl_v1")
+    assert isinstance(adapter, SocialJsonlAdapter)
+    assert registry.get("social_jsonl_v1") is adapter
+    assert list(registry._adapters) == ["social_jsonl_v1"]
+
+
+def test_unknown_adapter_lists_known_names() -> None:
+    registry = default_registry(discover=False)
+    with pytest.raises(KeyError, match="Known adapters: outcomes_jsonl_v1, pumpfun_v1"):
+        registry.get("missing_v1")
+
+
+def test_entry_points_are_discovered_without_shadowing_builtins(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[str] = []
+
+    def fake_entry_points(group: str):
+        calls.append(group)
+        return [
+            importlib.metadata.EntryPoint(
+                name="third_party_v1",
+                value="metaspn_io.adapters.social_jsonl:SocialJsonlAdapter",
+                group=group,
+            ),
+            importlib.metadata.EntryPoint(
+                name="social_jsonl_v1",
+                value="metaspn_io.adapters.outcomes_jsonl:OutcomesJsonlAdapter",
+                group=group,
+            ),
+        ]
+
+    monkeypatch.setattr(importlib.metadata, "entry_points", fake_entry_points)
+    registry = default_registry()
+
+    # Built-in names resolve without scanning installed distributions.
+    assert isinstance(registry.get("social_jsonl_v1"), SocialJsonlAdapter)
+    assert calls == []
+
+    assert "third_party_v1" in registry.names()
+    assert calls == ["metaspn_io.adapters"]
+    assert isinstance(registry.get("third_party_v1"), SocialJsonlAdapter)
+
+
+def test_register_lazy_rejects_malformed_target() -> None:
+    registry = AdapterRegistry()
+    registry.register_lazy("broken_v1", "metaspn_io.adapters.social_jsonl")
+    with pytest.raises(ValueError, match="module:attr"):
+        registry.get("broken_v1")
+
+
+def test_adapter_classes_remain_importable_from_package() -> None:
+    import metaspn_io.adapters as adapters
+
+    assert adapters.SocialJsonlAdapter is SocialJsonlAdapter
+    assert "metaspn_io.adapters.social_jsonl" in sys.modules
+
+
+def test_jsonl_adapter_subclass_must_implement_parse_record() -> None:
+    from metaspn_io.adapters.base import JsonlAdapter
+
+    class Incomplete(JsonlAdapter):
+        pass
+
+    with pytest.raises(TypeError, match="_parse_record"):
+        Incomplete()
@@ -3,7 +3,7 @@ from __future__ import annotations
 from pathlib import Path
 import tempfile
 
-from metaspn_io.adapters.base import AdapterOptions
+from metaspn_io.adapters.base import AdapterOptions, IngestContext
 from metaspn_io.adapters.season1_onchain_jsonl import Season1OnchainJsonlAdapter
 from metaspn_io.adapters import default_registry
 from metaspn_io.ingest import run_ingest
@@ -13,7 +13,8 @@ FIXTURES = Path(__file__).parent / "fixtures" / "season1"
 
 def test_season1_adapter_maps_all_supported_event_types() -> None:
     adapter = Season1OnchainJsonlAdapter()
-    signals = list(adapter.iter_signals(FIXTURES / "onchain.jsonl", options=AdapterOptions()))
+    context = IngestContext()
+    signals = list(adapter.iter_signals(FIXTURES / "onchain.jsonl", options=AdapterOptions(), context=context))
 
     assert len(signals) == 6
     assert [s.payload_type for s in signals] == [
@@ -27,7 +28,7 @@ def test_season1_adapter_maps_all_supported_event_types() -> None:
     assert [s.timestamp for s in signals] == sorted(s.timestamp for s in signals)
     assert all(s.timestamp.endswith("Z") for s in signals)
     assert all(s.source == "solana" for s in signals)
-    assert len(adapter.issues) == 1
+    assert len(context.issues) == 1
 
 
 def test_season1_adapter_replay_is_byte_equivalent() -> None:
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import json
+from decimal import Decimal
+from pathlib import Path
+
+from metaspn_io.adapters import default_registry
+from metaspn_io.cli import main
+from metaspn_io.seasons import SEASON_PAYLOAD_TYPES, SeasonAggregates
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _signals() -> list[dict]:
+    adapter = default_registry(discover=False).get("season1_onchain_jsonl_v1")
+    return [signal.to_dict() for signal in adapter.iter_signals(FIXTURES / "season1" / "onchain.jsonl")]
+
+
+def test_totals_per_account_game_and_wallet(tmp_path: Path) -> None:
+    aggregates = SeasonAggregates.load(tmp_path)
+    result = aggregates.update(_signals())
+    assert (result.applied, result.duplicates) == (3, 0)
+    assert aggregates.get("s1", "g2", "staker-1").staked == Decimal("15")
+    assert aggregates.wallet("s1", "winner-1").claimed == Decimal("175")
+    game = aggregates.game("s1", "g2")
+    assert (game.staked, game.distributed, game.claimed) == (Decimal("15"), Decimal("250"), Decimal("175"))
+    assert (game.stakes, game.distributions, game.claims) == (1, 1, 1)
+    assert aggregates.game("s1", "missing").stakes == 0
+
+
+def test_incremental_updates_persist_and_match_replay(tmp_path: Path) -> None:
+    signals = _signals()
+    first = SeasonAggregates.load(tmp_path / "incremental")
+    first.update(signals[:3])
+    first.save()
+
+    reloaded = SeasonAggregates.load(tmp_path / "incremental")
+    result = reloaded.update(signals)
+    reloaded.save()
+    assert result.duplicates == sum(signal["payload_type"] in SEASON_PAYLOAD_TYPES for signal in signals[:3])
+    assert result.applied + result.duplicates == 3
+
+    replay = SeasonAggregates.load(tmp_path / "replay")
+    replay.update(signals)
+    assert list(SeasonAggregates.load(tmp_path / "incremental").export()) == list(replay.export())
+
+
+def test_cli_updates_and_exports(tmp_path: Path, capsys) -> None:
+    signals = tmp_path / "signals.jsonl"
+    signals.write_text("".join(json.dumps(signal) + "\n" for signal in _signals()), encoding="utf-8")
+    state, export = str(tmp_path / "season1"), tmp_path / "totals.jsonl"
+    main(["io", "season1", "--state", state, "--update", str(signals), "--export", str(export)])
+    main(["io", "season1", "--state", state, "--season-id", "s1", "--game-id", "g2"])
+    output = capsys.readouterr().out.splitlines()
+    assert "applied=3" in output
+    assert "distributed=250" in output
+    rows = [json.loads(line) for line in export.read_text(encoding="utf-8").splitlines()]
+    assert [row["account"] for row in rows] == ["reward-pool-1", "staker-1", "winner-1"]
+
+
+def test_seen_ids_are_kept_per_day_and_uncommitted_tail_is_ignored(tmp_path: Path) -> None:
+    signals = [signal for signal in _signals() if signal["payload_type"] in SEASON_PAYLOAD_TYPES]
+    aggregates = SeasonAggregates.load(tmp_path)
+    aggregates.update(signals[:1])
+    aggregates.save()
+    day = signals[0]["timestamp"][:10]
+    seen_file = tmp_path / "seen" / f"{day}.txt"
+    assert seen_file.read_text(encoding="utf-8") == signals[0]["signal_id"] + "\n"
+    state = json.loads((tmp_path / "aggregates.json").read_text(encoding="utf-8"))
+    assert state["seen"] == {day: seen_file.stat().st_size}
+
+    # A crash after appending IDs but before aggregates.json was replaced.
+    with seen_file.open("a", encoding="utf-8") as f:
+        f.write(signals[1]["signal_id"] + "\n")
+    reloaded = SeasonAggregates.load(tmp_path)
+    result = reloaded.update(signals)
+    assert (result.applied, result.duplicates) == (len(signals) - 1, 1)
+    reloaded.save()
+    ids = [line for path in sorted((tmp_path / "seen").glob("*.txt")) for line in path.read_text().splitlines()]
+    assert sorted(ids) == sorted(signal["signal_id"] for signal in signals)
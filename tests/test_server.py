@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from metaspn_io.adapters import default_registry
+from metaspn_io.server import IngestServer, send_batch
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture
+def server(tmp_path: Path):
+    # AF_UNIX paths are limited to ~100 bytes, so keep the socket out of tmp_path.
+    with tempfile.TemporaryDirectory(prefix="mio-") as sockdir:
+        srv = IngestServer(
+            socket_path=Path(sockdir) / "ingest.sock",
+            registry=default_registry(discover=False),
+            store=tmp_path / "store",
+            error_log=tmp_path / "errors.jsonl",
+            queue_size=4,
+        )
+        thread = threading.Thread(target=srv.serve_forever, daemon=True)
+        thread.start()
+        try:
+            yield srv
+        finally:
+            srv.shutdown()
+            srv.server_close()
+            thread.join()
+
+
+def _trade(idx: int) -> str:
+    return json.dumps(
+        {
+            "type": "trade",
+            "token_mint": "So11111111111111111111111111111111111111112",
+            "wallet": f"w{idx}",
+            "side": "buy",
+            "amount": float(idx),
+            "timestamp": f"2026-02-06T10:{idx % 60:02d}:00Z",
+        }
+    )
+
+
+def test_batch_is_normalized_and_committed_before_reply(server: IngestServer, tmp_path: Path) -> None:
+    lines = (FIXTURES / "social" / "2026-02-05.jsonl").read_text(encoding="utf-8").splitlines()
+    reply = send_batch(server.socket_path, "social_jsonl_v1", lines + ["not json"])
+
+    assert reply == {"ok": True, "emitted": 3, "errors": 1}
+    partition = tmp_path / "store" / "signals" / "2026-02-05.jsonl"
+    assert len(partition.read_text(encoding="utf-8").splitlines()) == 3
+    assert len((tmp_path / "errors.jsonl").read_text(encoding="utf-8").splitlines()) == 1
+
+
+def test_unknown_adapter_is_reported_to_client(server: IngestServer) -> None:
+    reply = send_batch(server.socket_path, "missing_v1", [_trade(1)])
+    assert reply["ok"] is False
+    assert "Unknown adapter" in reply["error"]
+
+
+def test_load_many_concurrent_clients_group_commit(server: IngestServer, tmp_path: Path) -> None:
+    clients, batches_per_client, batch_size = 8, 25, 40
+
+    def client(cid: int) -> int:
+        emitted = 0
+        for b in range(batches_per_client):
+            base = (cid * batches_per_client + b) * batch_size
+            reply = send_batch(server.socket_path, "solana_rpc_v1", [_trade(base + i) for i in range(batch_size)])
+            assert reply["ok"], reply
+            emitted += reply["emitted"]
+        return emitted
+
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        total = sum(pool.map(client, range(clients)))
+
+    expected = clients * batches_per_client * batch_size
+    partition = tmp_path / "store" / "signals" / "2026-02-06.jsonl"
+    lines = partition.read_text(encoding="utf-8").splitlines()
+    assert total == expected
+    assert len(lines) == expected
+    assert all(json.loads(line)["payload_type"] == "TokenTradeSeen" for line in lines)
+    assert server.writer.commits < clients * batches_per_client
+
+
+def test_failed_commit_marks_server_unhealthy(server: IngestServer, monkeypatch) -> None:
+    def broken(group) -> None:
+        raise RuntimeError("disk on fire")
+
+    monkeypatch.setattr(server.writer, "_commit", broken)
+    reply = send_batch(server.socket_path, "solana_rpc_v1", [_trade(1)])
+    assert reply == {"ok": False, "error": "store write failed: disk on fire"}
+    assert not server.healthy
+
+    reply = send_batch(server.socket_path, "solana_rpc_v1", [_trade(2)])
+    assert reply["ok"] is False
+    assert reply["error"].startswith("server unhealthy")
+
+
+def test_commit_wait_is_bounded(server: IngestServer, monkeypatch) -> None:
+    release = threading.Event()
+    commit = server.writer._commit
+
+    def slow(group) -> None:
+        release.wait()
+        commit(group)
+
+    monkeypatch.setattr(server.writer, "_commit", slow)
+    server.commit_timeout = 0.05
+    try:
+        reply = send_batch(server.socket_path, "solana_rpc_v1", [_trade(1)])
+    finally:
+        release.set()
+    assert reply["ok"] is False
+    assert "not committed within" in reply["error"]
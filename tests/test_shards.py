@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from metaspn_io.cli import main
+from metaspn_io.shards import shard_for, shard_key_value
+
+FIXTURES = Path(__file__).parent / "fixtures"
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+
+def _read(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_shard_for_is_stable_across_processes() -> None:
+    values = ["So11111111111111111111111111111111111111112", "wallet-a", ""]
+    local = [shard_for(value, 7) for value in values]
+    proc = subprocess.run(
+        [sys.executable, "-c", f"from metaspn_io.shards import shard_for; print([shard_for(v, 7) for v in {values!r}])"],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={"PYTHONPATH": str(SRC), "PYTHONHASHSEED": "12345"},
+    )
+    assert proc.stdout.strip() == str(local)
+
+
+def test_shard_key_values() -> None:
+    signal = {
+        "signal_id": "s_1",
+        "payload": {"token_mint": "mint", "wallet": "w1"},
+        "entity_refs": [{"kind": "platform_identifier", "platform": "solana", "identifier": "mint"}],
+    }
+    assert shard_key_value(signal, "entity") == "platform_identifier|solana|mint"
+    assert shard_key_value(signal, "token_mint") == "mint"
+    assert shard_key_value(signal, "wallet") == "w1"
+    assert shard_key_value({"payload": {}}, "wallet") == ""
+
+
+def test_cli_shards_partition_output_and_keep_order(tmp_path: Path) -> None:
+    full = tmp_path / "full.jsonl"
+    sharded = tmp_path / "sharded" / "signals.jsonl"
+    common = ["io", "ingest", "--adapter", "season1_onchain_jsonl_v1", "--source", str(FIXTURES / "season1")]
+    common += ["--error-log", str(tmp_path / "errors.jsonl")]
+    assert main([*common, "--out", str(full)]) == 0
+    assert main([*common, "--out", str(sharded), "--shards", "3", "--shard-key", "wallet"]) == 0
+
+    manifest = json.loads((sharded.parent / "signals.shards.json").read_text(encoding="utf-8"))
+    files = [sharded.parent / entry["path"] for entry in manifest["files"]]
+    assert [f.name for f in files] == [f"signals-{i:05d}-of-00003.jsonl" for i in range(3)]
+    assert manifest["shard_key"] == "wallet"
+
+    expected = _read(full)
+    shards = [_read(f) for f in files]
+    assert [len(rows) for rows in shards] == [entry["count"] for entry in manifest["files"]]
+    assert manifest["total"] == len(expected)
+    for idx, rows in enumerate(shards):
+        assert rows == [row for row in expected if shard_for(row["payload"].get("wallet") or "", 3) == idx]
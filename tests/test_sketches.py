@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from metaspn_io.cli import main
+from metaspn_io.sketches import SKETCH_FORMAT, CountMinSketch, HyperLogLog, SignalSketches, SpaceSaving
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def test_hyperloglog_estimates_and_merges_exactly() -> None:
+    whole, left, right = HyperLogLog(), HyperLogLog(), HyperLogLog()
+    for i in range(50_000):
+        value = f"wallet-{i}"
+        whole.add(value)
+        (left if i % 2 else right).add(value)
+        left.add(f"wallet-{i % 100}")
+    assert abs(whole.count() - 50_000) / 50_000 < 0.03
+    left.merge(right)
+    assert left.registers == whole.registers
+    assert HyperLogLog.from_dict(whole.to_dict()).count() == whole.count()
+    small = HyperLogLog()
+    for value in ("a", "b", "c", "a"):
+        small.add(value)
+    assert small.count() == 3
+    with pytest.raises(ValueError):
+        small.merge(HyperLogLog(precision=10))
+
+
+def test_count_min_never_undercounts() -> None:
+    sketch = CountMinSketch(width=64, depth=4)
+    truth = {f"mint-{i}": i + 1 for i in range(200)}
+    for value, count in truth.items():
+        sketch.add(value, count)
+    assert all(sketch.estimate(value) >= count for value, count in truth.items())
+    other = CountMinSketch.from_dict(sketch.to_dict())
+    sketch.merge(other)
+    assert sketch.estimate("mint-199") >= 400
+
+
+def test_space_saving_finds_heavy_hitters_across_merges() -> None:
+    left, right = SpaceSaving(capacity=20), SpaceSaving(capacity=20)
+    for i in range(5_000):
+        target = left if i % 2 else right
+        target.add("hot-a" if i % 3 == 0 else "hot-b" if i % 5 == 0 else f"cold-{i}")
+    left.merge(SpaceSaving.from_dict(right.to_dict()))
+    top = left.top(2)
+    assert [value for value, _, _ in top] == ["hot-a", "hot-b"]
+    assert all(count - error <= true <= count for (_, count, error), true in zip(top, (1667, 666)))
+
+
+def test_signal_sketches_merge_matches_single_run() -> None:
+    signals = [{"payload": {"wallet": f"w{i % 7}", "token_mint": f"m{i % 3}"}} for i in range(100)]
+    whole, left, right = SignalSketches(top_k=3), SignalSketches(top_k=3), SignalSketches(top_k=3)
+    for i, signal in enumerate(signals):
+        whole.update(signal)
+        (left if i < 40 else right).update(signal)
+    left.merge(SignalSketches.from_dict(right.to_dict()))
+    assert left.signals == 100
+    assert left.report_lines() == whole.report_lines()
+    assert "sketch.distinct_wallets=7" in whole.report_lines()
+    assert whole.top("token_mint")[0] == ("m0", 34)
+
+
+def test_cli_stats_report_sketches_and_merge(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    runs = [("solana_rpc_v1", "solana_rpc.jsonl", "a.json"), ("pumpfun_v1", "pumpfun.jsonl", "b.json")]
+    for adapter, source, sketch in runs:
+        args = ["io", "ingest", "--adapter", adapter, "--source", str(FIXTURES / "tokens" / source)]
+        assert main([*args, "--stats", "--top-k", "2", "--sketch-out", str(tmp_path / sketch)]) == 0
+        out = capsys.readouterr().out
+        assert "sketch.distinct_wallets=" in out
+        assert "sketch.top.token_mint.1=" in out
+
+    merged = tmp_path / "merged.json"
+    assert main(["io", "sketches", str(tmp_path / "a.json"), str(tmp_path / "b.json"), "--out", str(merged)]) == 0
+    out = capsys.readouterr().out
+    a, b = SignalSketches.load(tmp_path / "a.json"), SignalSketches.load(tmp_path / "b.json")
+    assert f"signals={a.signals + b.signals}" in out
+    assert SignalSketches.load(merged).signals == a.signals + b.signals
+
+
+def test_sketches_from_another_format_are_rejected() -> None:
+    data = SignalSketches().to_dict()
+    assert SignalSketches.from_dict(data).signals == 0
+    with pytest.raises(ValueError, match="unsupported sketch format"):
+        SignalSketches.from_dict({**data, "format": SKETCH_FORMAT - 1})
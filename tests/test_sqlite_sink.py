@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+from metaspn_io.adapters import default_registry
+from metaspn_io.cli import main
+from metaspn_io.sqlite_sink import SQLITE_INDEXES, write_sqlite
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _signals() -> list[dict]:
+    adapter = default_registry(discover=False).get("solana_rpc_v1")
+    return [signal.to_dict() for signal in adapter.iter_signals(FIXTURES / "tokens" / "solana_rpc.jsonl")]
+
+
+def test_bulk_load_builds_indexes_and_upserts(tmp_path: Path) -> None:
+    db = tmp_path / "signals.db"
+    signals = _signals()
+    assert write_sqlite(db, signals, batch_size=3) == len(signals)
+
+    changed = dict(signals[0], source="renamed")
+    write_sqlite(db, [changed, *signals[1:]])
+    with sqlite3.connect(db) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM signals").fetchone()[0] == len(signals)
+        assert conn.execute("SELECT source FROM signals WHERE signal_id = ?", (changed["signal_id"],)).fetchone() == (
+            "renamed",
+        )
+        indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert set(SQLITE_INDEXES) <= indexes
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        trades = conn.execute(
+            "SELECT entity_identifier, json_extract(payload, '$.wallet') FROM signals WHERE payload_type = ?",
+            ("TokenTradeSeen",),
+        ).fetchall()
+        assert trades == [("So11111111111111111111111111111111111111112", "w1")]
+
+
+def test_cli_sqlite_out(tmp_path: Path) -> None:
+    db = tmp_path / "out.db"
+    source = str(FIXTURES / "tokens" / "solana_rpc.jsonl")
+    for _ in range(2):
+        main(["io", "ingest", "--adapter", "solana_rpc_v1", "--source", source, "--sqlite-out", str(db)])
+    with sqlite3.connect(db) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM signals").fetchone()[0] == 8
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+# Cumulative `-X importtime` budget for `metaspn_io.cli`, in microseconds (best of
+# three runs). The eager registry used to cost ~90ms locally; ingest, the batch
+# API and tracemalloc load on use. Override on slow CI runners.
+IMPORT_BUDGET_US = int(os.environ.get("METASPN_IMPORT_BUDGET_US", "75000"))
+
+
+def _run(code: str, *flags: str) -> subprocess.CompletedProcess[str]:
+    env = dict(os.environ, PYTHONPATH=str(SRC))
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+
+
+def test_cli_import_does_not_load_adapters_or_models() -> None:
+    proc = _run(
+        "import sys, metaspn_io.cli\n"
+        "print('\\n'.join(sorted(m for m in sys.modules if m.startswith('metaspn'))))"
+    )
+    loaded = set(proc.stdout.split())
+    assert "metaspn_io.models" not in loaded
+    assert "metaspn_io.ingest" not in loaded
+    assert not any(name.endswith(("_jsonl", "_rpc_jsonl")) for name in loaded), loaded
+
+
+def test_single_adapter_run_loads_only_that_adapter() -> None:
+    proc = _run(
+        "import sys\n"
+        "from metaspn_io.adapters import default_registry\n"
+        "default_registry(discover=False).get('social_jsonl_v1')\n"
+        "print('\\n'.join(sorted(m for m in sys.modules if m.startswith('metaspn_io.adapters.'))))"
+    )
+    assert proc.stdout.split() == [
+        "metaspn_io.adapters.base",
+        "metaspn_io.adapters.registry",
+        "metaspn_io.adapters.social_jsonl",
+    ]
+
+
+def _cli_import_us() -> int:
+    proc = _run("import metaspn_io.cli", "-X", "importtime")
+    for line in proc.stderr.splitlines():
+        parts = [part.strip() for part in line.split("|")]
+        if len(parts) == 3 and parts[2] == "metaspn_io.cli":
+            return int(parts[1])
+    raise AssertionError(proc.stderr)
+
+
+def test_cli_import_time_within_budget() -> None:
+    cumulative = min(_cli_import_us() for _ in range(3))
+    assert cumulative <= IMPORT_BUDGET_US, f"metaspn_io.cli import took {cumulative}us (budget {IMPORT_BUDGET_US}us)"
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from metaspn_io.adapters import default_registry
+from metaspn_io.compact import compact_store
+from metaspn_io.ingest import SinkOptions, run_ingest
+from metaspn_io.store import LAYOUT_MANIFEST, StoreLayout, iter_partitions, load_layout, open_layout
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _ingest(store: Path, partition_by: tuple[str, ...] | None) -> None:
+    registry = default_registry(discover=False)
+    for adapter, source in (
+        ("solana_rpc_v1", FIXTURES / "tokens" / "solana_rpc.jsonl"),
+        ("pumpfun_v1", FIXTURES / "tokens" / "pumpfun.jsonl"),
+        ("season1_onchain_jsonl_v1", FIXTURES / "season1" / "onchain.jsonl"),
+    ):
+        run_ingest(
+            registry=registry,
+            adapter_name=adapter,
+            source=source,
+            store=store,
+            sinks=SinkOptions(partition_by=partition_by),
+            error_log_path=store.parent / "errors.jsonl",
+        )
+
+
+def test_default_layout_keeps_day_partitions(tmp_path: Path) -> None:
+    store = tmp_path / "store"
+    _ingest(store, None)
+
+    assert json.loads((store / LAYOUT_MANIFEST).read_text(encoding="utf-8"))["partition_by"] == ["date"]
+    assert [p.relative_to(store).as_posix() for p in iter_partitions(store)] == [
+        "signals/2026-02-06.jsonl",
+        "signals/2026-02-07.jsonl",
+    ]
+
+
+def test_multi_level_layout_and_pruning(tmp_path: Path) -> None:
+    store = tmp_path / "store"
+    fields = ("source", "payload_type", "date", "hour")
+    _ingest(store, fields)
+    signals = store / "signals"
+
+    assert load_layout(store) == StoreLayout(partition_by=fields)
+    trades = signals / "source=solana" / "payload_type=TokenTradeSeen" / "date=2026-02-06" / "10.jsonl"
+    assert json.loads(trades.read_text(encoding="utf-8"))["payload_type"] == "TokenTradeSeen"
+
+    selected = list(iter_partitions(store, source=["pumpfun"]))
+    assert [p.relative_to(signals).as_posix() for p in selected] == [
+        "source=pumpfun/payload_type=TokenMetadataUpdated/date=2026-02-06/11.jsonl",
+        "source=pumpfun/payload_type=TokenTradeSeen/date=2026-02-06/11.jsonl",
+    ]
+    assert list(iter_partitions(store, payload_type=["TokenTradeSeen"], since="2026-02-06T11:00:00Z")) == [
+        signals / "source=pumpfun" / "payload_type=TokenTradeSeen" / "date=2026-02-06" / "11.jsonl"
+    ]
+    assert list(iter_partitions(store, since="2026-02-08")) == []
+
+    total = sum(len(p.read_text(encoding="utf-8").splitlines()) for p in iter_partitions(store))
+    assert total == 8 + 2 + 6
+
+
+def test_date_only_bounds_cover_every_hour_of_the_day(tmp_path: Path) -> None:
+    store = tmp_path / "store"
+    _ingest(store, ("date", "hour"))
+    signals = store / "signals"
+    every = list(iter_partitions(store))
+    day = [p for p in every if p.parent.name == "date=2026-02-06"]
+    assert day and len(day) < len(every)
+
+    assert list(iter_partitions(store, until="2026-02-06")) == day
+    assert list(iter_partitions(store, since="2026-02-06", until="2026-02-06")) == day
+    assert list(iter_partitions(store, since="2026-02-07")) == [p for p in every if p not in day]
+    assert list(iter_partitions(store, until="2026-02-06T10:59:59Z")) == [signals / "date=2026-02-06" / "10.jsonl"]
+
+
+def test_layout_conflict_is_rejected(tmp_path: Path) -> None:
+    store = tmp_path / "store"
+    open_layout(store, ("source", "date"))
+    assert open_layout(store).partition_by == ("source", "date")
+    with pytest.raises(ValueError, match="partitioned by source,date"):
+        open_layout(store, ("date",))
+
+
+def test_invalid_partition_fields() -> None:
+    with pytest.raises(ValueError, match="partition fields"):
+        StoreLayout(partition_by=("date", "wallet"))
+
+
+def test_compaction_walks_nested_layout(tmp_path: Path) -> None:
+    store = tmp_path / "store"
+    _ingest(store, ("source", "date"))
+    _ingest(store, None)
+
+    results = compact_store(store)
+    assert [r.partition.relative_to(store / "signals").as_posix() for r in results] == [
+        "source=pumpfun/2026-02-06.jsonl",
+        "source=solana/2026-02-06.jsonl",
+        "source=solana/2026-02-07.jsonl",
+    ]
+    assert sum(r.duplicates for r in results) == 16
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import io
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from metaspn_io.adapters import default_registry
+from metaspn_io.adapters.base import IngestContext
+from metaspn_io.adapters.solana_rpc_jsonl import SolanaRpcAdapter
+from metaspn_io.ingest import STREAM, run_ingest
+
+FIXTURES = Path(__file__).parent / "fixtures"
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+
+def _trade(minute: int) -> str:
+    return json.dumps(
+        {
+            "type": "trade",
+            "chain": "solana",
+            "token_mint": "m1",
+            "wallet": f"w{minute}",
+            "side": "buy",
+            "amount": 1,
+            "timestamp": f"2026-02-06T10:{minute:02d}:00Z",
+        }
+    )
+
+
+class _Lines:
+    """Line source that records how many lines were consumed when each signal was seen."""
+
+    def __init__(self, lines: list[str]) -> None:
+        self.lines = lines
+        self.read = 0
+
+    def __iter__(self):
+        for line in self.lines:
+            self.read += 1
+            yield line + "\n"
+
+
+def test_window_restores_order_and_emits_incrementally() -> None:
+    lines = _Lines([_trade(m) for m in (1, 0, 3, 2, 5, 4, 7, 6)])
+    context = IngestContext()
+    consumed = []
+    minutes = []
+    for signal in SolanaRpcAdapter().iter_stream_signals(lines, context=context, window=2):
+        consumed.append(lines.read)
+        minutes.append(int(signal.timestamp[14:16]))
+    assert minutes == list(range(8))
+    assert consumed[0] == 3
+    assert "reorder_late" not in context.counters
+
+
+def test_rows_later_than_window_are_emitted_and_counted() -> None:
+    context = IngestContext()
+    lines = [_trade(m) for m in (1, 2, 3, 0)]
+    signals = list(SolanaRpcAdapter().iter_stream_signals(lines, context=context, window=1))
+    assert len(signals) == 4
+    assert context.counters["reorder_late"] == 1
+
+
+def test_stdin_to_stdout_matches_file_ingest(tmp_path: Path, capsys) -> None:
+    source = FIXTURES / "tokens" / "solana_rpc.jsonl"
+    registry = default_registry(discover=False)
+    expected = tmp_path / "expected.jsonl"
+    run_ingest(registry, "solana_rpc_v1", source, out=expected, error_log_path=tmp_path / "a.jsonl")
+
+    stdout = io.StringIO()
+    result = run_ingest(
+        registry,
+        "solana_rpc_v1",
+        STREAM,
+        out=STREAM,
+        stats=True,
+        error_log_path=tmp_path / "b.jsonl",
+        stdin=io.StringIO(source.read_text(encoding="utf-8")),
+        stdout=stdout,
+    )
+    def without_file(text: str) -> list[dict]:
+        rows = [json.loads(line) for line in text.splitlines()]
+        for row in rows:
+            row["trace"].pop("input_file")
+        return rows
+
+    assert without_file(stdout.getvalue()) == without_file(expected.read_text(encoding="utf-8"))
+    assert '"input_file":"<stdin>"' in stdout.getvalue()
+    assert result.emitted == 8
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert "sort_path=window" in captured.err
+
+
+def test_cli_pipe(tmp_path: Path) -> None:
+    source = FIXTURES / "tokens" / "solana_rpc.jsonl"
+    proc = subprocess.run(
+        [sys.executable, "-m", "metaspn_io.cli", "io", "ingest"]
+        + ["--adapter", "solana_rpc_v1", "--source", "-", "--out", "-"],
+        input=source.read_text(encoding="utf-8"),
+        capture_output=True,
+        text=True,
+        env=dict(os.environ, PYTHONPATH=str(SRC)),
+        cwd=tmp_path,
+        check=True,
+    )
+    assert len(proc.stdout.splitlines()) == 8
+    assert all(json.loads(line)["source"] == "solana" for line in proc.stdout.splitlines())
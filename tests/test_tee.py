@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from metaspn_io.cli import main
+from metaspn_io.tee import parse_tee, write_tee
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _read(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_parse_tee() -> None:
+    spec = parse_tee("payload_type=TokenTradeSeen,HolderChangeSeen:out/trades.jsonl")
+    assert spec.field == "payload_type"
+    assert spec.values == {"TokenTradeSeen", "HolderChangeSeen"}
+    assert spec.path == Path("out/trades.jsonl")
+    for bad in ("trades.jsonl", "payload_type=:x.jsonl", "payload_type=A:", "wallet=w1:x.jsonl"):
+        with pytest.raises(ValueError):
+            parse_tee(bad)
+
+
+def test_write_tee_rejects_shared_paths(tmp_path: Path) -> None:
+    spec = parse_tee(f"payload_type=A:{tmp_path / 'a.jsonl'}")
+    with pytest.raises(ValueError):
+        write_tee([], [spec], out=tmp_path / "a.jsonl")
+
+
+def test_cli_tee_routes_one_pass_to_matching_files(tmp_path: Path) -> None:
+    full = tmp_path / "full.jsonl"
+    trades = tmp_path / "trades.jsonl"
+    holders = tmp_path / "holders.jsonl"
+    common = ["io", "ingest", "--adapter", "solana_rpc_v1", "--source", str(FIXTURES / "tokens" / "solana_rpc.jsonl")]
+    assert main(
+        [
+            *common,
+            "--out",
+            str(full),
+            "--tee",
+            f"payload_type=TokenTradeSeen:{trades}",
+            "--tee",
+            f"payload_type=HolderChangeSeen,SupplyChangeSeen:{holders}",
+        ]
+    ) == 0
+
+    rows = _read(full)
+    assert _read(trades) == [row for row in rows if row["payload_type"] == "TokenTradeSeen"]
+    assert _read(holders) == [row for row in rows if row["payload_type"] in {"HolderChangeSeen", "SupplyChangeSeen"}]
+    assert _read(trades)
+    assert not list(tmp_path.glob(".*.tmp"))
+
+
+def test_cli_tee_alone_counts_lines(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    trades = tmp_path / "trades.jsonl"
+    source = FIXTURES / "tokens" / "solana_rpc.jsonl"
+    tee = f"payload_type=TokenTradeSeen:{trades}"
+    assert main(["io", "ingest", "--adapter", "solana_rpc_v1", "--source", str(source), "--tee", tee, "--stats"]) == 0
+    assert f"tee.{trades}={len(_read(trades))}" in capsys.readouterr().out
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from metaspn_io.writer import JsonlWriter, recover_tail, replace_jsonl
+
+
+def _write(writer: JsonlWriter, path: Path, count: int) -> None:
+    for idx in range(count):
+        writer.write(path, f'{{"n":{idx}}}\n')
+
+
+def test_recover_tail_truncates_torn_line(tmp_path: Path) -> None:
+    path = tmp_path / "p.jsonl"
+    path.write_bytes(b'{"a":1}\n{"b":2}\n{"c":')
+    assert recover_tail(path) == 5
+    assert path.read_bytes() == b'{"a":1}\n{"b":2}\n'
+    assert recover_tail(path) == 0
+
+    path.write_bytes(b'{"torn"')
+    assert recover_tail(path) == 7
+    assert path.read_bytes() == b""
+
+
+def test_writer_repairs_torn_tail_before_appending(tmp_path: Path) -> None:
+    path = tmp_path / "p.jsonl"
+    path.write_bytes(b'{"a":1}\n{"b":')
+    with JsonlWriter(durability="none") as writer:
+        writer.write(path, '{"c":3}\n')
+    assert path.read_bytes() == b'{"a":1}\n{"c":3}\n'
+
+
+@pytest.mark.parametrize(
+    ("durability", "expected_fsyncs"),
+    [("none", 0), ("batch", 4), ("run", 1)],
+)
+def test_group_commit_shares_fsyncs(tmp_path: Path, durability: str, expected_fsyncs: int) -> None:
+    path = tmp_path / "p.jsonl"
+    with JsonlWriter(durability=durability, commit_lines=25) as writer:
+        _write(writer, path, 100)
+    assert writer.commits == 4
+    assert writer.fsyncs == expected_fsyncs
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 100
+
+
+def test_interval_durability_syncs_at_most_once_per_interval(tmp_path: Path) -> None:
+    path = tmp_path / "p.jsonl"
+    with JsonlWriter(durability="interval", interval=3600, commit_lines=10) as writer:
+        _write(writer, path, 100)
+        assert writer.fsyncs == 0
+    assert writer.fsyncs == 1
+
+
+def test_writer_limits_open_files_and_syncs_evicted(tmp_path: Path) -> None:
+    paths = [tmp_path / f"p{idx}.jsonl" for idx in range(5)]
+    with JsonlWriter(durability="run", max_open=2, commit_lines=1) as writer:
+        for path in paths:
+            writer.write(path, "{}\n")
+        assert len(writer._handles) == 2
+    assert writer.fsyncs == 5
+    assert all(path.read_text(encoding="utf-8") == "{}\n" for path in paths)
+
+
+def test_commit_retry_after_failure_does_not_duplicate_lines(tmp_path: Path, monkeypatch) -> None:
+    writer = JsonlWriter(durability="none")
+    good, bad = tmp_path / "a.jsonl", tmp_path / "b.jsonl"
+    writer.write(good, "a\n")
+    writer.write(bad, "b\n")
+    open_handle = writer._handle
+
+    def failing(path: Path):
+        if path == bad:
+            raise OSError("disk full")
+        return open_handle(path)
+
+    monkeypatch.setattr(writer, "_handle", failing)
+    with pytest.raises(OSError):
+        writer.commit()
+    monkeypatch.undo()
+    writer.close()
+    assert good.read_text() == "a\n"
+    assert bad.read_text() == "b\n"
+
+
+def test_writer_rejects_unknown_durability() -> None:
+    with pytest.raises(ValueError, match="durability"):
+        JsonlWriter(durability="always")
+
+
+def test_replace_jsonl_is_atomic_on_failure(tmp_path: Path) -> None:
+    path = tmp_path / "out.jsonl"
+    path.write_text("old\n", encoding="utf-8")
+
+    def lines():
+        yield "new\n"
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        replace_jsonl(path, lines())
+    assert path.read_text(encoding="utf-8") == "old\n"
+    assert list(tmp_path.iterdir()) == [path]
+
+    replace_jsonl(path, ["a\n", "b\n"])
+    assert path.read_text(encoding="utf-8") == "a\nb\n"